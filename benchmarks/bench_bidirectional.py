@@ -0,0 +1,54 @@
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.mazes import corner_query, random_noise, recursive_backtracker
+from search import best_first_search, breath_first_search
+
+# Expanded nodes and time of unidirectional against bidirectional search,
+# corner to corner.
+#
+#   python -m benchmarks.bench_bidirectional --sizes 512 1024
+
+
+# function: run
+# inputs:
+#   search_func: breath_first_search or best_first_search
+#   mask, start, goal: the query
+#   bidirectional: search mode
+# output:
+#   (expanded, seconds, path length)
+def run(search_func, mask, start, goal, bidirectional):
+    stats = {}
+    began = time.perf_counter()
+    path, _ = search_func(mask, start, goal, mask=mask, bidirectional=bidirectional, stats=stats)
+    return stats["expanded"], time.perf_counter() - began, len(path) - 1
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[512, 1024])
+    args = parser.parse_args()
+
+    print("%-12s %5s %-6s %10s %10s %7s %8s %8s" % (
+        "maze", "size", "search", "uni nodes", "bi nodes", "ratio", "uni s", "bi s"))
+    for size in args.sizes:
+        mazes = [
+            ("open", np.ones((size, size), dtype=np.bool_)),
+            ("noise 0.2", random_noise(size, 0.2)),
+            ("backtracker", recursive_backtracker(size)),
+        ]
+        for name, mask in mazes:
+            start, goal = corner_query(mask)
+            for label, search_func in (("bfs", breath_first_search), ("astar", best_first_search)):
+                uni_nodes, uni_time, uni_length = run(search_func, mask, start, goal, False)
+                bi_nodes, bi_time, bi_length = run(search_func, mask, start, goal, True)
+                assert uni_length == bi_length
+                print("%-12s %5d %-6s %10d %10d %6.2fx %8.2f %8.2f" % (
+                    name, size, label, uni_nodes, bi_nodes, uni_nodes / max(bi_nodes, 1),
+                    uni_time, bi_time))
+
+
+if __name__ == "__main__":
+    main()
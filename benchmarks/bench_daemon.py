@@ -0,0 +1,163 @@
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+from PIL import Image
+
+from benchmarks.mazes import random_noise
+
+# Load test for solver_daemon. Writes a noise maze to a temporary BMP, starts
+# the daemon on a Unix socket, and has --clients concurrent connections each
+# send queries one after another between random open pixels. Reports latency
+# percentiles and throughput for each batch window, plus the cost of a
+# one-shot process (start Python, load the maze, answer one query) that the
+# daemon replaces. With --goals the queries share that many goals, which lets
+# batched breadth first queries follow one distance field per goal.
+#
+#   python -m benchmarks.bench_daemon --size 512 --clients 1 16 64 --windows 0 0.002
+#   python -m benchmarks.bench_daemon --algorithm bfs --engine default --goals 4
+
+
+# function: random_queries
+# inputs:
+#   mask: 2D boolean passability mask
+#   count: number of queries
+#   maze_path: maze filename the queries name
+#   goals: number of distinct goals, 0 for a random goal per query
+#   options: algorithm and options fields added to every query
+#   rng: numpy random generator
+# output:
+#   list of request dictionaries between random open pixels
+def random_queries(mask, count, maze_path, goals, options, rng):
+    cells = np.argwhere(mask)
+    pairs = cells[rng.integers(0, len(cells), size=(count, 2))].tolist()
+    if goals:
+        shared = cells[rng.integers(0, len(cells), size=goals)].tolist()
+        pairs = [(start, shared[i % goals]) for i, (start, _) in enumerate(pairs)]
+    return [dict(options, id=i, maze=maze_path, start=start, goal=goal)
+            for i, (start, goal) in enumerate(pairs)]
+
+
+# function: client
+# inputs:
+#   socket_path: daemon socket
+#   queries: request dictionaries to send, one at a time
+#   latencies: list the per-query seconds are appended to
+# output: none
+async def client(socket_path, queries, latencies):
+    reader, writer = await asyncio.open_unix_connection(socket_path, limit=1 << 26)
+    for query in queries:
+        began = time.perf_counter()
+        writer.write(json.dumps(query).encode() + b"\n")
+        await writer.drain()
+        response = json.loads(await reader.readline())
+        latencies.append(time.perf_counter() - began)
+        assert response["id"] == query["id"] and "error" not in response
+    writer.close()
+
+
+# function: load_test
+# inputs:
+#   socket_path: daemon socket
+#   queries: request dictionaries, split evenly between clients
+#   clients: number of concurrent connections
+# output:
+#   (latencies in seconds, wall time in seconds)
+async def load_test(socket_path, queries, clients):
+    latencies = []
+    began = time.perf_counter()
+    await asyncio.gather(*(client(socket_path, queries[i::clients], latencies)
+                           for i in range(clients)))
+    return latencies, time.perf_counter() - began
+
+
+async def daemon_stats(socket_path):
+    reader, writer = await asyncio.open_unix_connection(socket_path)
+    writer.write(b'{"id": 0, "command": "stats"}\n')
+    await writer.drain()
+    stats = json.loads(await reader.readline())
+    writer.close()
+    return stats
+
+
+# function: start_daemon
+# inputs:
+#   socket_path: Unix socket for the daemon to listen on
+#   maze_path: maze image to preload
+#   window: batch window in seconds
+# output:
+#   daemon subprocess, once its socket accepts connections
+def start_daemon(socket_path, maze_path, window):
+    daemon = subprocess.Popen([sys.executable, "-m", "solver_daemon", "--socket", socket_path,
+                               "--batch-window", str(window), "--preload", maze_path])
+    while not os.path.exists(socket_path):
+        if daemon.poll() is not None:
+            raise RuntimeError("solver_daemon exited with %d" % daemon.returncode)
+        time.sleep(0.05)
+    return daemon
+
+
+# function: one_shot
+# inputs:
+#   query: request dictionary
+# output:
+#   seconds for a fresh solver_daemon --stdin process to answer query and exit
+def one_shot(query):
+    began = time.perf_counter()
+    subprocess.run([sys.executable, "-m", "solver_daemon", "--stdin"],
+                   input=json.dumps(query).encode(), stdout=subprocess.DEVNULL, check=True)
+    return time.perf_counter() - began
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=512)
+    parser.add_argument("--density", type=float, default=0.2)
+    parser.add_argument("--queries", type=int, default=512)
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--windows", type=float, nargs="+", default=[0, 0.002])
+    parser.add_argument("--algorithm", default="astar")
+    parser.add_argument("--engine", default="flat")
+    parser.add_argument("--goals", type=int, default=0)
+    args = parser.parse_args()
+
+    mask = random_noise(args.size, args.density)
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as directory:
+        maze_path = os.path.join(directory, "noise.bmp")
+        Image.fromarray(np.where(mask, 255, 0).astype(np.uint8)).save(maze_path)
+        options = {"algorithm": args.algorithm}
+        if args.engine != "default":
+            options["options"] = {"engine": args.engine}
+        queries = random_queries(mask, args.queries, maze_path, args.goals, options, rng)
+
+        one_shot(queries[0])
+        print("one-shot process per query: %.1f ms (maze cached on disk)" %
+              (one_shot(queries[1]) * 1000))
+        print("%8s %8s %10s %10s %10s %8s %10s" % (
+            "window", "clients", "p50 ms", "p99 ms", "queries/s", "batches", "per batch"))
+        for window in args.windows:
+            for clients in args.clients:
+                socket_path = os.path.join(directory, "daemon.sock")
+                daemon = start_daemon(socket_path, maze_path, window)
+                try:
+                    latencies, wall = asyncio.run(load_test(socket_path, queries, clients))
+                    stats = asyncio.run(daemon_stats(socket_path))
+                finally:
+                    daemon.terminate()
+                    daemon.wait()
+                    os.remove(socket_path)
+                p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+                print("%8g %8d %10.2f %10.2f %10.0f %8d %10.1f" % (
+                    window, clients, p50, p99, len(latencies) / wall, stats["batches"],
+                    stats["queries"] / max(stats["batches"], 1)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.mazes import open_rooms, random_noise, recursive_backtracker, scaled_sample
+from dead_ends import prune_dead_ends
+from search import best_first_search, breath_first_search
+
+# Visited pixels and time of searches with dead ends filled (prune_dead_ends,
+# answered through DeadEnds.solve) against the same searches on the full
+# mask, over random queries, with the one-off pruning cost. Only one pixel
+# wide dead ends are filled, so "sample" is maze.bmp at its own scale;
+# scaled up its corridors are too wide to prune.
+#
+#   python -m benchmarks.bench_dead_ends --size 512 --queries 20 --engine flat
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=512)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--engine", default="dict")
+    args = parser.parse_args()
+
+    mazes = [
+        ("backtracker", recursive_backtracker(args.size)),
+        ("sample", scaled_sample(1)),
+        ("rooms", open_rooms(args.size)),
+        ("noise20", random_noise(args.size, 0.2, seed=1)),
+    ]
+    searches = [("bfs", breath_first_search), ("astar", best_first_search)]
+    print("%-12s %8s %7s %6s %12s %12s %8s %9s %9s %8s" % (
+        "maze", "prune s", "core", "search", "visited", "pruned", "saved", "ms/q",
+        "pruned ms", "speedup"))
+    rng = np.random.default_rng(0)
+    for name, mask in mazes:
+        began = time.perf_counter()
+        pruned = prune_dead_ends(mask, mask=mask)
+        prep = time.perf_counter() - began
+        cells = np.argwhere(mask)
+        pairs = cells[rng.integers(0, len(cells), size=(args.queries, 2))].tolist()
+        pairs = [(tuple(start), tuple(goal)) for start, goal in pairs]
+
+        for label, search in searches:
+            full_visited, full_seconds, pruned_visited, pruned_seconds = 0, 0, 0, 0
+            for start, goal in pairs:
+                began = time.perf_counter()
+                expected, visited = search(mask, start, goal, mask=mask, engine=args.engine)
+                full_seconds += time.perf_counter() - began
+                full_visited += len(visited)
+
+                began = time.perf_counter()
+                path, visited = pruned.solve(start, goal, search, engine=args.engine)
+                pruned_seconds += time.perf_counter() - began
+                pruned_visited += len(visited)
+                assert len(path) == len(expected)
+            saved = "%.1fx" % (full_visited / pruned_visited) if pruned_visited else "all"
+            print("%-12s %8.2f %6.1f%% %6s %12d %12d %8s %9.1f %9.1f %7.1fx" % (
+                name, prep, 100 * pruned.core.sum() / mask.sum(), label, full_visited,
+                pruned_visited, saved,
+                full_seconds * 1000 / len(pairs), pruned_seconds * 1000 / len(pairs),
+                full_seconds / pruned_seconds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.mazes import corner_query, random_noise, recursive_backtracker
+from search import breath_first_search
+
+# Time of breath_first_search with the default queue engine against the
+# frontier-at-a-time engine, corner to corner.
+#
+#   python -m benchmarks.bench_frontier_bfs --sizes 2048 4096
+
+
+# function: timed
+# inputs:
+#   engine: engine name passed to breath_first_search
+#   mask, start, goal: the query
+# output:
+#   (seconds, path length)
+def timed(engine, mask, start, goal):
+    began = time.perf_counter()
+    path, _ = breath_first_search(mask, start, goal, mask=mask, engine=engine)
+    return time.perf_counter() - began, len(path) - 1
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2048])
+    args = parser.parse_args()
+
+    print("%-12s %6s %10s %10s %8s %8s" % ("maze", "size", "queue s", "frontier s", "speedup", "length"))
+    for size in args.sizes:
+        mazes = [
+            ("open", np.ones((size, size), dtype=np.bool_)),
+            ("noise 0.2", random_noise(size, 0.2)),
+            ("backtracker", recursive_backtracker(size)),
+        ]
+        for name, mask in mazes:
+            start, goal = corner_query(mask)
+            queue_time, queue_length = timed("dict", mask, start, goal)
+            frontier_time, frontier_length = timed("frontier", mask, start, goal)
+            assert queue_length == frontier_length
+            print("%-12s %6d %10.2f %10.2f %7.1fx %8d" % (
+                name, size, queue_time, frontier_time, queue_time / frontier_time, frontier_length))
+
+
+if __name__ == "__main__":
+    main()
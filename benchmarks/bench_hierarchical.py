@@ -0,0 +1,72 @@
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.mazes import scaled_sample
+from hierarchical import HierarchicalMap
+from search import best_first_search
+
+# Preprocessing time, query latency and path length of HPA* against flat A*
+# (best_first_search) on maze.bmp scaled up, over random open-pixel queries.
+#
+#   python -m benchmarks.bench_hierarchical --factors 16 32 64 --cluster 32
+
+
+# function: random_queries
+# inputs:
+#   mask: 2D boolean passability mask
+#   count: number of queries
+#   seed: random seed
+# output:
+#   list of (start, goal) pairs of open pixels
+def random_queries(mask, count, seed=0):
+    rng = np.random.default_rng(seed)
+    cells = np.argwhere(mask)
+    picks = cells[rng.integers(len(cells), size=(count, 2))].tolist()
+    return [(tuple(start), tuple(goal)) for start, goal in picks]
+
+
+# function: timed_lengths
+# inputs:
+#   solve: function(start, goal) returning (path, visited)
+#   queries: list of (start, goal) pairs
+# output:
+#   (mean seconds per query, list of path lengths)
+def timed_lengths(solve, queries):
+    lengths = []
+    began = time.perf_counter()
+    for start, goal in queries:
+        path, _ = solve(start, goal)
+        lengths.append(len(path) - 1)
+    return (time.perf_counter() - began) / len(queries), lengths
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--factors", type=int, nargs="+", default=[16, 32, 64])
+    parser.add_argument("--cluster", type=int, default=32)
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+
+    print("%5s %8s %8s %10s %10s %8s %8s %8s" % (
+        "size", "build s", "nodes", "A* ms", "HPA* ms", "speedup", "mean gap", "max gap"))
+    for factor in args.factors:
+        mask = scaled_sample(factor)
+        queries = random_queries(mask, args.queries)
+
+        began = time.perf_counter()
+        hierarchy = HierarchicalMap(mask, args.cluster, mask=mask)
+        build_time = time.perf_counter() - began
+
+        astar_time, astar_lengths = timed_lengths(
+            lambda start, goal: best_first_search(mask, start, goal, mask=mask), queries)
+        hpa_time, hpa_lengths = timed_lengths(hierarchy.solve, queries)
+        gaps = [hpa / astar - 1 for hpa, astar in zip(hpa_lengths, astar_lengths) if astar > 0]
+        print("%5d %8.2f %8d %10.1f %10.1f %7.1fx %7.2f%% %7.2f%%" % (
+            mask.shape[0], build_time, len(hierarchy.edges), astar_time * 1000,
+            hpa_time * 1000, astar_time / hpa_time, 100 * np.mean(gaps), 100 * max(gaps)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.mazes import corner_query, random_noise
+from incremental import LifelongPlanner
+from search import best_first_search
+
+# Repair time of LifelongPlanner (LPA*) against re-running best_first_search
+# from scratch after each batch of pixel edits. Every batch flips random
+# pixels and blocks one pixel of the current path, so each one forces a repair.
+#
+#   python -m benchmarks.bench_incremental --size 512 --batches 1 100 10000
+
+
+# function: edit_batch
+# inputs:
+#   mask: current 2D boolean passability mask
+#   path: current path
+#   count: number of pixels to edit
+#   rng: numpy random generator
+# output:
+#   list of ((x, y), passable) changes
+def edit_batch(mask, path, count, rng):
+    height, width = mask.shape
+    cells = rng.integers(0, [height, width], size=(count, 2)).tolist()
+    changes = [((row, col), not mask[row, col]) for row, col in cells]
+    if len(path) > 2:
+        changes[0] = (path[len(path) // 2], False)
+    return changes
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=512)
+    parser.add_argument("--density", type=float, default=0.2)
+    parser.add_argument("--batches", type=int, nargs="+", default=[1, 100, 10000])
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    mask = random_noise(args.size, args.density)
+    start, goal = corner_query(mask)
+    began = time.perf_counter()
+    planner = LifelongPlanner(mask, start, goal, mask=mask)
+    path = planner.plan()
+    print("initial plan: %.2f s, length %d" % (time.perf_counter() - began, len(path) - 1))
+
+    print("%8s %10s %10s %8s %12s %12s" % (
+        "edits", "A* s", "LPA* s", "speedup", "A* nodes", "LPA* nodes"))
+    rng = np.random.default_rng(0)
+    for count in args.batches:
+        astar_times, repair_times, astar_nodes, repair_nodes = [], [], [], []
+        for _ in range(args.rounds):
+            changes = edit_batch(planner.mask, path, count, rng)
+
+            began = time.perf_counter()
+            planner.update(changes)
+            stats = {}
+            path = planner.plan(stats)
+            repair_times.append(time.perf_counter() - began)
+            repair_nodes.append(stats["expanded"])
+
+            stats = {}
+            began = time.perf_counter()
+            expected, _ = best_first_search(planner.mask, start, goal, mask=planner.mask,
+                                            stats=stats)
+            astar_times.append(time.perf_counter() - began)
+            astar_nodes.append(stats["expanded"])
+            assert len(path) == len(expected)
+
+        print("%8d %10.3f %10.3f %7.1fx %12d %12d" % (
+            count, np.median(astar_times), np.median(repair_times),
+            np.median(astar_times) / np.median(repair_times),
+            np.median(astar_nodes), np.median(repair_nodes)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.mazes import corner_query, open_rooms, recursive_backtracker
+from jump_point import jump_point_search
+from search import best_first_search
+
+# Expanded nodes and time of best_first_search against jump_point_search,
+# corner to corner.
+#
+#   python -m benchmarks.bench_jump_point --sizes 256 512 1024
+
+
+# function: run
+# inputs:
+#   search_func: best_first_search or jump_point_search
+#   mask, start, goal: the query
+# output:
+#   (expanded, seconds, path length)
+def run(search_func, mask, start, goal):
+    stats = {}
+    began = time.perf_counter()
+    path, _ = search_func(mask, start, goal, mask=mask, stats=stats)
+    return stats["expanded"], time.perf_counter() - began, len(path) - 1
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[256, 512, 1024])
+    args = parser.parse_args()
+
+    print("%-12s %5s %10s %10s %8s %8s %8s %8s" % (
+        "maze", "size", "A* nodes", "JPS nodes", "ratio", "A* s", "JPS s", "length"))
+    for size in args.sizes:
+        mazes = [
+            ("open", np.ones((size, size), dtype=np.bool_)),
+            ("rooms", open_rooms(size)),
+            ("backtracker", recursive_backtracker(size)),
+        ]
+        for name, mask in mazes:
+            start, goal = corner_query(mask)
+            astar_nodes, astar_time, astar_length = run(best_first_search, mask, start, goal)
+            jps_nodes, jps_time, jps_length = run(jump_point_search, mask, start, goal)
+            assert astar_length == jps_length
+            print("%-12s %5d %10d %10d %7.1fx %8.2f %8.2f %8d" % (
+                name, size, astar_nodes, jps_nodes, astar_nodes / max(jps_nodes, 1),
+                astar_time, jps_time, jps_length))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.mazes import open_rooms, random_noise, recursive_backtracker, scaled_sample
+from landmarks import select_landmarks
+from search import manhattan_distance, unified_search
+from search_queue import PriorityQueue
+
+# Expanded nodes and time of A* with the ALT landmark heuristic against
+# manhattan_distance, over random queries in each maze, with the
+# preprocessing time and memory of the landmark grids.
+#
+#   python -m benchmarks.bench_landmarks --size 512 --landmarks 1 2 4 8 16 --queries 20
+
+
+# function: random_pairs
+# inputs:
+#   mask: 2D boolean passability mask
+#   count: number of pairs
+#   rng: numpy random generator
+# output:
+#   list of (start, goal) pairs of open pixels
+def random_pairs(mask, count, rng):
+    cells = np.argwhere(mask)
+    pairs = cells[rng.integers(0, len(cells), size=(count, 2))].tolist()
+    return [(tuple(start), tuple(goal)) for start, goal in pairs]
+
+
+# function: run_queries
+# inputs:
+#   mask: 2D boolean passability mask
+#   pairs: (start, goal) pairs
+#   heuristic: heuristic for unified_search
+#   engine: search engine
+# output:
+#   (total expanded nodes, total seconds, list of path lengths)
+def run_queries(mask, pairs, heuristic, engine):
+    expanded, lengths = 0, []
+    began = time.perf_counter()
+    for start, goal in pairs:
+        stats = {}
+        path, _ = unified_search(mask, start, goal, PriorityQueue, heuristic, mask=mask,
+                                 engine=engine, stats=stats, close_on_pop=True)
+        expanded += stats["expanded"]
+        lengths.append(len(path))
+    return expanded, time.perf_counter() - began, lengths
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=512)
+    parser.add_argument("--landmarks", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--engine", default="flat")
+    args = parser.parse_args()
+
+    mazes = [
+        ("backtracker", recursive_backtracker(args.size)),
+        ("sample", scaled_sample(max(args.size // 19, 1))),
+        ("rooms", open_rooms(args.size)),
+        ("noise20", random_noise(args.size, 0.2, seed=1)),
+    ]
+    print("%-12s %5s %10s %9s %11s %12s %8s %9s %8s" % (
+        "maze", "K", "prep s", "MB/lmk", "expanded", "saved", "ms/q", "speedup", "lengths"))
+    rng = np.random.default_rng(0)
+    for name, mask in mazes:
+        pairs = random_pairs(mask, args.queries, rng)
+        base_nodes, base_seconds, base_lengths = run_queries(mask, pairs, manhattan_distance,
+                                                             args.engine)
+        print("%-12s %5s %10s %9s %11d %12s %8.1f %9s %8s" % (
+            name, "-", "-", "-", base_nodes, "1.0x", base_seconds * 1000 / len(pairs), "1.0x",
+            "-"))
+        for count in args.landmarks:
+            began = time.perf_counter()
+            alt = select_landmarks(mask, count, mask=mask)
+            prep = time.perf_counter() - began
+            nodes, seconds, lengths = run_queries(mask, pairs, alt, args.engine)
+            print("%-12s %5d %10.2f %9.2f %11d %11.1fx %8.1f %8.1fx %8s" % (
+                name, count, prep, alt.nbytes / len(alt.pixels) / 2 ** 20, nodes,
+                base_nodes / max(nodes, 1), seconds * 1000 / len(pairs),
+                base_seconds / seconds, "ok" if lengths == base_lengths else "DIFFER"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+
+from benchmarks.mazes import corner_query, recursive_backtracker
+from search import breath_first_search, passability_mask
+
+# Peak RSS of breath_first_search with dict and array search state.
+# Each engine runs in a fresh interpreter so the peaks do not mix.
+#
+#   python -m benchmarks.bench_memory --size 4096
+
+
+# function: peak_rss_mb
+# output:
+#   peak resident set size of this process in MB
+# pseudocode:
+#   read ru_maxrss (kilobytes on Linux) and convert
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+# function: run_engine
+# inputs:
+#   engine: search engine name passed to breath_first_search
+#   size: maze side length
+# output:
+#   dictionary of RSS before and after the search, visited count and time
+# pseudocode:
+#   build the maze and mask, record RSS
+#   run the search corner to corner, record RSS and time
+def run_engine(engine, size):
+    mask = passability_mask(recursive_backtracker(size))
+    start, goal = corner_query(mask)
+    before = peak_rss_mb()
+
+    began = time.perf_counter()
+    path, visited = breath_first_search(mask, start, goal, mask=mask, engine=engine)
+    elapsed = time.perf_counter() - began
+
+    return {
+        "engine": engine,
+        "size": size,
+        "rss_before_mb": round(before, 1),
+        "rss_peak_mb": round(peak_rss_mb(), 1),
+        "visited": len(visited),
+        "path_length": len(path) - 1,
+        "seconds": round(elapsed, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=4096)
+    parser.add_argument("--engines", nargs="+", default=["dict", "array"])
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_engine(args.child, args.size)))
+        return
+
+    print("%-6s %6s %12s %12s %10s %8s" % ("engine", "size", "rss before", "rss peak", "visited", "seconds"))
+    for engine in args.engines:
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_memory", "--size", str(args.size), "--child", engine],
+            check=True, capture_output=True, text=True).stdout
+        result = json.loads(output)
+        print("%-6s %6d %10.1fMB %10.1fMB %10d %8.2f" % (
+            engine, result["size"], result["rss_before_mb"], result["rss_peak_mb"],
+            result["visited"], result["seconds"]))
+
+
+if __name__ == "__main__":
+    main()
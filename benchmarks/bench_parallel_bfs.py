@@ -0,0 +1,51 @@
+import argparse
+import os
+import time
+
+import numpy as np
+
+from benchmarks.mazes import open_rooms, random_noise
+from distance_field import distance_field
+from parallel_bfs import parallel_distances
+
+# Strong scaling of parallel_distances: the same full-grid BFS from the
+# top left corner on a fixed grid, with 1, 2, 4, ... threads, against the
+# single threaded flood behind distance_field. Speedup is relative to
+# parallel_distances on one thread; efficiency is speedup / threads.
+#
+#   python -m benchmarks.bench_parallel_bfs --size 8192 --threads 1 2 4 8
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=8192)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--bands", type=int, default=None, help="bands (default 2 * threads)")
+    args = parser.parse_args()
+
+    print("%d x %d grid, %d cores" % (args.size, args.size, os.cpu_count()))
+    print("%-8s %8s %10s %9s %11s" % ("maze", "threads", "seconds", "speedup", "efficiency"))
+    mazes = [
+        ("open", np.ones((args.size, args.size), dtype=np.bool_)),
+        ("noise20", random_noise(args.size, 0.2, seed=1)),
+        ("rooms", open_rooms(args.size)),
+    ]
+    for name, mask in mazes:
+        began = time.perf_counter()
+        expected = distance_field(mask, (0, 0), mask=mask).distance
+        print("%-8s %8s %10.2f %9s %11s" % (name, "flood", time.perf_counter() - began, "-", "-"))
+        single = None
+        for threads in args.threads:
+            began = time.perf_counter()
+            distance = parallel_distances(mask, (0, 0), mask=mask, threads=threads,
+                                          bands=args.bands)
+            seconds = time.perf_counter() - began
+            assert np.array_equal(distance, expected)
+            single = single or seconds
+            print("%-8s %8d %10.2f %8.2fx %10.0f%%" % (
+                name, threads, seconds, single / seconds, 100 * single / seconds / threads))
+        del expected, distance
+
+
+if __name__ == "__main__":
+    main()
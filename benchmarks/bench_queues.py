@@ -0,0 +1,64 @@
+import argparse
+import random
+import time
+
+from search_queue import BucketQueue, PriorityQueue
+
+# Micro-benchmark of PriorityQueue against BucketQueue on an A*-like workload:
+# a steady queue of pending vertices, each pop followed by up to three pushes
+# at the popped priority plus 0 or 2 (how f changes on a 4-connected grid).
+#
+#   python -m benchmarks.bench_queues --ops 1000000 10000000
+
+
+# function: run
+# inputs:
+#   queue_type: queue class to time
+#   operations: total number of inserts plus pops
+#   seed: random seed, the same for every queue type
+# output:
+#   seconds taken
+# pseudocode:
+#   precompute the random choices so only queue work is timed
+#   fill the queue, then pop one and push up to three until operations are used
+def run(queue_type, operations, seed=0):
+    rng = random.Random(seed)
+    steps = [rng.choice((0, 0, 2)) for _ in range(1024)]
+    fanout = [rng.randint(1, 3) for _ in range(1024)]
+
+    queue = queue_type()
+    began = time.perf_counter()
+    vertex = 0
+    done = 0
+    for vertex in range(1000):
+        queue.insert(vertex, 0)
+    done += 1000
+    vertex += 1
+    while done < operations and not queue.is_empty():
+        priority = queue.min_priority()
+        queue.pop()
+        done += 1
+        for _ in range(fanout[vertex & 1023] if len(queue) < 4000 else 0):
+            queue.insert(vertex, priority + steps[vertex & 1023])
+            vertex += 1
+            done += 1
+    return time.perf_counter() - began
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ops", type=int, nargs="+", default=[1000000])
+    args = parser.parse_args()
+
+    print("%10s %14s %14s %9s %9s %8s" % ("ops", "PriorityQueue", "BucketQueue", "PQ ns/op",
+                                           "BQ ns/op", "speedup"))
+    for operations in args.ops:
+        heap_time = run(PriorityQueue, operations)
+        bucket_time = run(BucketQueue, operations)
+        print("%10d %13.2fs %13.2fs %9.0f %9.0f %7.2fx" % (
+            operations, heap_time, bucket_time, heap_time / operations * 1e9,
+            bucket_time / operations * 1e9, heap_time / bucket_time))
+
+
+if __name__ == "__main__":
+    main()
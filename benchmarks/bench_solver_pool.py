@@ -0,0 +1,61 @@
+import argparse
+import multiprocessing
+import time
+
+import numpy as np
+
+from benchmarks.mazes import recursive_backtracker
+from maze import Maze
+from solver_pool import SolverPool
+
+# Queries per second of SolverPool across process counts, with the plain
+# single process Maze.solve_many as the baseline.
+#
+#   python -m benchmarks.bench_solver_pool --size 1024 --queries 400
+
+
+# function: random_pairs
+# inputs:
+#   mask: 2D boolean passability mask
+#   count: number of pairs
+#   seed: random seed
+# output:
+#   list of (start, goal) tuples on open pixels
+def random_pairs(mask, count, seed=0):
+    rng = np.random.default_rng(seed)
+    open_pixels = np.flatnonzero(mask)
+    width = mask.shape[1]
+    chosen = rng.choice(open_pixels, size=(count, 2))
+    return [(divmod(int(a), width), divmod(int(b), width)) for a, b in chosen]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=1024)
+    parser.add_argument("--queries", type=int, default=400)
+    parser.add_argument("--algorithm", default="astar")
+    args = parser.parse_args()
+
+    maze = Maze(mask=recursive_backtracker(args.size))
+    pairs = random_pairs(maze.mask, args.queries)
+
+    began = time.perf_counter()
+    for _ in maze.solve_many(pairs, args.algorithm):
+        pass
+    baseline = args.queries / (time.perf_counter() - began)
+    print("cpus available: %d" % multiprocessing.cpu_count())
+    print("%-10s %10s %8s" % ("processes", "queries/s", "scaling"))
+    print("%-10s %10.1f %7.2fx" % ("inline", baseline, 1.0))
+
+    counts = sorted({1, 2, 4, 8, multiprocessing.cpu_count()})
+    for processes in counts:
+        with SolverPool(maze, processes) as pool:
+            began = time.perf_counter()
+            for _ in pool.solve_many(pairs, args.algorithm):
+                pass
+            rate = args.queries / (time.perf_counter() - began)
+        print("%-10d %10.1f %7.2fx" % (processes, rate, rate / baseline))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import functools
+import os
+
+import pytest
+
+from benchmarks.mazes import corner_query, open_rooms, random_noise, recursive_backtracker, walled_goal
+from jump_point import jump_point_search
+from search import best_first_search, breath_first_search, manhattan_distance, unified_search
+from search_queue import BucketQueue, PriorityQueue
+
+# pytest-benchmark suite over a generated maze corpus. Not collected by the
+# plain test run (file name is not test_*); run it directly, or through
+# benchmarks.run_suite to save and compare against a baseline:
+#
+#   python -m pytest benchmarks/bench_suite.py
+#   MAZE_BENCH_SIZES="256 1024 4096" python -m pytest benchmarks/bench_suite.py -k astar
+#
+# Each case is one corner to corner query; extra_info records the expanded
+# node count and path length (-1 if there is none; the corners of a noise
+# grid can be cut off), so node count regressions show up as well.
+
+pytest.importorskip("pytest_benchmark")
+
+SIZES = [int(size) for size in os.environ.get("MAZE_BENCH_SIZES", "256 1024").split()]
+
+# maze name -> generator taking the side length
+MAZES = {
+    "backtracker": recursive_backtracker,
+    "rooms": open_rooms,
+    "noise10": functools.partial(random_noise, density=0.1),
+    "noise20": functools.partial(random_noise, density=0.2),
+    "noise30": functools.partial(random_noise, density=0.3),
+    "no_path": walled_goal,
+}
+
+# search name -> function(mask, start, goal, stats) covering both search
+# entry points, their engines, jump point search, and every queue type for
+# both breadth first and A* order
+SEARCHES = {
+    "bfs_dict": lambda mask, start, goal, stats: breath_first_search(
+        mask, start, goal, mask=mask, stats=stats),
+    "bfs_array": lambda mask, start, goal, stats: breath_first_search(
+        mask, start, goal, mask=mask, engine="array", stats=stats),
+    "bfs_frontier": lambda mask, start, goal, stats: breath_first_search(
+        mask, start, goal, mask=mask, engine="frontier", stats=stats),
+    "bfs_flat": lambda mask, start, goal, stats: breath_first_search(
+        mask, start, goal, mask=mask, engine="flat", stats=stats),
+    "bfs_priority": lambda mask, start, goal, stats: unified_search(
+        mask, start, goal, PriorityQueue, mask=mask, stats=stats),
+    "bfs_bucket": lambda mask, start, goal, stats: unified_search(
+        mask, start, goal, BucketQueue, mask=mask, stats=stats),
+    "astar_dict": lambda mask, start, goal, stats: best_first_search(
+        mask, start, goal, mask=mask, stats=stats),
+    "astar_array": lambda mask, start, goal, stats: best_first_search(
+        mask, start, goal, mask=mask, engine="array", stats=stats),
+    "astar_flat": lambda mask, start, goal, stats: best_first_search(
+        mask, start, goal, mask=mask, engine="flat", stats=stats),
+    "astar_jps": lambda mask, start, goal, stats: jump_point_search(
+        mask, start, goal, mask=mask, stats=stats),
+    "astar_bucket": lambda mask, start, goal, stats: unified_search(
+        mask, start, goal, BucketQueue, manhattan_distance, mask=mask, stats=stats,
+        close_on_pop=True),
+}
+
+
+# function: maze_case
+# inputs:
+#   name: key of MAZES
+#   size: side length
+# output:
+#   (mask, start, goal), generated once per session
+@functools.lru_cache(maxsize=None)
+def maze_case(name, size):
+    mask = MAZES[name](size)
+    start, goal = corner_query(mask)
+    return mask, start, goal
+
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("maze", list(MAZES))
+@pytest.mark.parametrize("search", list(SEARCHES))
+def test_search_speed(benchmark, search, maze, size):
+    """Benchmark one search on one generated maze"""
+    mask, start, goal = maze_case(maze, size)
+    search_func = SEARCHES[search]
+    stats = {}
+
+    benchmark.group = "%s-%d" % (maze, size)
+    path, _ = benchmark.pedantic(search_func, args=(mask, start, goal, stats),
+                                 rounds=3 if size <= 1024 else 1, iterations=1)
+
+    benchmark.extra_info["expanded"] = stats.get("expanded")
+    benchmark.extra_info["length"] = len(path) - 1
+    if maze == "no_path":
+        assert path == []
+    elif path:
+        assert path[0] == start and path[-1] == goal
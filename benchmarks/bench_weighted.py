@@ -0,0 +1,50 @@
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.mazes import corner_query, open_rooms, random_noise, recursive_backtracker
+from search import best_first_search
+
+# Expanded nodes, time and path length of weighted A* (best_first_search with
+# weight w) against plain A* (w = 1), corner to corner, with the bound each
+# search reports.
+#
+#   python -m benchmarks.bench_weighted --sizes 512 1024 --weights 1.2 1.5 2 --engine flat
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[512, 1024])
+    parser.add_argument("--weights", type=float, nargs="+", default=[1.2, 1.5, 2.0])
+    parser.add_argument("--engine", default="dict")
+    args = parser.parse_args()
+
+    print("%-12s %5s %5s %10s %8s %8s %8s %8s %8s" % (
+        "maze", "size", "w", "nodes", "saved", "ms", "speedup", "length", "bound"))
+    for size in args.sizes:
+        mazes = [
+            ("open", np.ones((size, size), dtype=np.bool_)),
+            ("noise20", random_noise(size, 0.2, seed=1)),
+            ("rooms", open_rooms(size)),
+            ("backtracker", recursive_backtracker(size)),
+        ]
+        for name, mask in mazes:
+            start, goal = corner_query(mask)
+            baseline = None
+            for weight in [1.0] + args.weights:
+                stats = {}
+                began = time.perf_counter()
+                path, _ = best_first_search(mask, start, goal, mask=mask, engine=args.engine,
+                                            stats=stats, weight=weight)
+                seconds = time.perf_counter() - began
+                if baseline is None:
+                    baseline = (stats["expanded"], seconds, len(path) - 1)
+                print("%-12s %5d %5.1f %10d %7.1fx %8.1f %7.1fx %8d %8.3f" % (
+                    name, size, weight, stats["expanded"], baseline[0] / stats["expanded"],
+                    seconds * 1000, baseline[1] / seconds, len(path) - 1,
+                    stats.get("bound", 1.0)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+import random
+import numpy as np
+from PIL import Image
+from search import passability_mask
+
+# Deterministic maze generators for the benchmarks. Every generator returns a
+# 2D boolean passability mask (True = open) that can be passed straight to the
+# searches as image or mask, plus a corner-to-corner (start, goal) pair.
+
+
+# function: recursive_backtracker
+# inputs:
+#   size: side length of the square maze in pixels
+#   seed: random seed, same seed gives the same maze
+# output:
+#   mask: 2D boolean array with 1 pixel wide corridors and walls
+# relationships:
+#   perfect maze, exactly one path between any two open pixels
+# pseudocode:
+#   treat every odd (row, col) as a cell, all walls closed
+#   depth first walk from cell (1, 1) with an explicit stack:
+#       pick a random unvisited cell two steps away
+#       open it and the wall between, push it
+#       if none left, pop
+def recursive_backtracker(size, seed=0):
+    rng = random.Random(seed)
+    mask = np.zeros((size, size), dtype=np.bool_)
+    cells = (size - 1) // 2
+    seen = bytearray(cells * cells)
+    steps = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+    mask[1, 1] = True
+    seen[0] = 1
+    stack = [(0, 0)]
+    while stack:
+        row, col = stack[-1]
+        options = []
+        for dr, dc in steps:
+            r, c = row + dr, col + dc
+            if 0 <= r < cells and 0 <= c < cells and not seen[r * cells + c]:
+                options.append((r, c))
+        if not options:
+            stack.pop()
+            continue
+        r, c = options[rng.randrange(len(options))]
+        seen[r * cells + c] = 1
+        mask[2 * r + 1, 2 * c + 1] = True
+        mask[row + r + 1, col + c + 1] = True
+        stack.append((r, c))
+    return mask
+
+
+# function: random_noise
+# inputs:
+#   size: side length of the square grid in pixels
+#   density: fraction of pixels that are walls
+#   seed: random seed
+# output:
+#   mask: 2D boolean array of randomly scattered walls
+# pseudocode:
+#   draw uniform noise and keep pixels above density
+def random_noise(size, density, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.random((size, size)) >= density
+
+
+# function: open_rooms
+# inputs:
+#   size: side length of the square grid in pixels
+#   room: side length of each room in pixels
+#   seed: random seed
+# output:
+#   mask: 2D boolean array of large open rooms separated by 1 pixel walls,
+#         with one doorway in every wall between neighboring rooms
+# pseudocode:
+#   start fully open, draw a wall every room pixels in both directions
+#   for every wall segment between two rooms, open a random doorway
+def open_rooms(size, room=64, seed=0):
+    rng = random.Random(seed)
+    mask = np.ones((size, size), dtype=np.bool_)
+    door = max(1, room // 8)
+    for wall in range(room, size, room + 1):
+        mask[wall, :] = False
+        mask[:, wall] = False
+    for wall in range(room, size, room + 1):
+        for low in range(0, size, room + 1):
+            high = min(low + room, size)
+            if high - low <= door:
+                continue
+            offset = rng.randrange(low, high - door)
+            mask[wall, offset:offset + door] = True
+            offset = rng.randrange(low, high - door)
+            mask[offset:offset + door, wall] = True
+    return mask
+
+
+# function: walled_goal
+# inputs:
+#   size: side length of the square grid in pixels
+# output:
+#   mask: 2D boolean open grid whose bottom right pixel is cut off
+# relationships:
+#   worst case for the searches: with corner_query there is no path, so
+#   every pixel is visited before the search gives up
+# pseudocode:
+#   start fully open, wall the two neighbors of the last pixel
+def walled_goal(size):
+    mask = np.ones((size, size), dtype=np.bool_)
+    mask[size - 2, size - 1] = False
+    mask[size - 1, size - 2] = False
+    return mask
+
+
+# function: corner_query
+# inputs:
+#   mask: 2D boolean passability mask
+# output:
+#   (start, goal): first and last open pixels in row-major order
+# relationships:
+#   gives the long corner to corner queries the benchmarks care about
+# pseudocode:
+#   take flat indices of open pixels, return the first and last as (x, y)
+def corner_query(mask):
+    open_pixels = np.flatnonzero(mask)
+    width = mask.shape[1]
+    start = divmod(int(open_pixels[0]), width)
+    goal = divmod(int(open_pixels[-1]), width)
+    return start, goal
+
+
+# function: scaled_sample
+# inputs:
+#   factor: number of pixels each pixel of the sample maze becomes per side
+#   path: sample maze image (optional)
+# output:
+#   mask: 2D boolean array of the sample maze scaled up by factor
+# relationships:
+#   keeps maze.bmp's layout with factor pixel wide corridors, for
+#   benchmarks that want a real maze at a larger size
+def scaled_sample(factor, path="maze.bmp"):
+    with Image.open(path) as img:
+        mask = passability_mask(np.asarray(img.convert("RGB")))
+    return mask.repeat(factor, axis=0).repeat(factor, axis=1)
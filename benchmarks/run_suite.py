@@ -0,0 +1,74 @@
+import argparse
+import glob
+import importlib.util
+import os
+import sys
+
+import pytest
+
+# Runs benchmarks/bench_suite.py with pytest-benchmark, either saving the
+# results as the baseline or comparing against the saved baseline and
+# failing if any case got slower by more than the threshold.
+#
+#   python -m benchmarks.run_suite --save-baseline
+#   python -m benchmarks.run_suite --threshold 10
+#   python -m benchmarks.run_suite --sizes 256 1024 4096 -- -k astar
+
+SUITE = os.path.join(os.path.dirname(__file__), "bench_suite.py")
+STORAGE = ".benchmarks"
+
+
+# function: find_baseline
+# inputs:
+#   storage: pytest-benchmark storage directory
+#   machine_id: machine directory to look in (optional, defaults to this
+#       machine's id as pytest-benchmark names it)
+# output:
+#   run id ("0003") of the newest saved baseline, or None
+# pseudocode:
+#   saved runs are <machine>/<id>_<name>.json and --benchmark-compare only
+#   looks up ids in the current machine's directory, so pick the most
+#   recently written *_baseline there
+def find_baseline(storage=STORAGE, machine_id=None):
+    if machine_id is None:
+        from pytest_benchmark.utils import get_machine_id
+        machine_id = get_machine_id()
+    runs = glob.glob(os.path.join(glob.escape(storage), glob.escape(machine_id), "*_baseline.json"))
+    if not runs:
+        return None
+    return os.path.basename(max(runs, key=os.path.getmtime)).split("_")[0]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[256, 1024])
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="allowed mean slowdown in percent")
+    parser.add_argument("pytest_args", nargs="*")
+    args = parser.parse_args()
+    if importlib.util.find_spec("pytest_benchmark") is None:
+        print("the suite needs pytest-benchmark (pip install pytest-benchmark)")
+        return 1
+
+    os.environ["MAZE_BENCH_SIZES"] = " ".join(str(size) for size in args.sizes)
+    pytest_args = [SUITE, "--benchmark-storage=" + STORAGE]
+    if args.save_baseline:
+        pytest_args.append("--benchmark-save=baseline")
+    else:
+        baseline = find_baseline()
+        if baseline is None:
+            print("no baseline for this machine in %s, run with --save-baseline first" % STORAGE)
+            return 1
+        pytest_args += ["--benchmark-compare=" + baseline,
+                        "--benchmark-compare-fail=mean:%g%%" % args.threshold]
+    from pytest_benchmark.session import PerformanceRegression
+    try:
+        return pytest.main(pytest_args + args.pytest_args)
+    except PerformanceRegression:
+        # the failing cases are listed in the summary printed just before
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+import numpy as np
+from search import passability_mask
+
+# Connected component labeling of a passability grid, 4-connected.
+#
+# Each row is first split into horizontal runs of passable pixels (one NumPy
+# pass). Runs that touch vertically are then merged with a vectorized
+# hook-and-compress union-find: every root is hooked onto the smallest root
+# it shares an edge with, and parent pointers are jumped until each run
+# points straight at its root. Only runs and run adjacencies are processed,
+# never single pixels, so the work per round is far below the pixel count.
+
+
+# function: label_components
+# inputs:
+#   image: 2D array of pixels, or 2D boolean passability mask
+# output:
+#   labels: 2D int32 array, 0 on impassable pixels and 1..n for the n
+#           components of passable pixels
+# pseudocode:
+#   number the horizontal runs of passable pixels
+#   collect the (upper run, lower run) pairs that touch vertically
+#   parent = identity over runs
+#   repeat:
+#       roots of each pair; stop if every pair already shares a root
+#       hook the larger root of each pair onto the smaller one
+#       jump parent pointers until each points at a root
+#   renumber roots 1..n and paint each pixel with its run's label
+def label_components(image):
+    mask = np.ascontiguousarray(passability_mask(image), dtype=np.bool_)
+    height, width = mask.shape
+    flat = mask.reshape(-1)
+
+    # a run starts at a passable pixel whose left neighbor is a wall or the edge
+    run_start = flat.copy()
+    run_start[1:] &= ~flat[:-1]
+    run_start[::width] = flat[::width]
+    run_count = int(np.count_nonzero(run_start))
+    labels = np.zeros(flat.size, dtype=np.int32)
+    if run_count == 0:
+        return labels.reshape(height, width)
+    run_of_pixel = np.cumsum(run_start, dtype=np.int64) - 1
+
+    # two runs overlap in one unbroken stretch of columns, so keeping only the
+    # first column of each stretch lists every touching pair exactly once
+    touching = flat[:-width] & flat[width:]
+    first = touching.copy()
+    first[1:] &= ~touching[:-1]
+    first[::width] = touching[::width]
+    upper = run_of_pixel[:-width][first]
+    lower = run_of_pixel[width:][first]
+
+    parent = np.arange(run_count, dtype=np.int64)
+    while True:
+        upper_root, lower_root = parent[upper], parent[lower]
+        split = upper_root != lower_root
+        if not split.any():
+            break
+        upper_root, lower_root = upper_root[split], lower_root[split]
+        np.minimum.at(parent, np.maximum(upper_root, lower_root),
+                      np.minimum(upper_root, lower_root))
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+
+    # every run now points at its root; number the roots in order from 1
+    root_label = np.cumsum(parent == np.arange(run_count), dtype=np.int32)
+    labels[flat] = root_label[parent][run_of_pixel[flat]]
+    return labels.reshape(height, width)
@@ -0,0 +1,161 @@
+import numpy as np
+from frontier_search import DIRECTIONS, pad_mask
+from search import breath_first_search, passability_mask
+
+# Dead-end filling. Passable cells with at most one passable neighbor are
+# removed over and over until none are left; what remains (the core) is
+# every cell on a cycle or between cycles. Each removed cell keeps a pointer
+# to the one neighbor it still had when it was removed, so the removed cells
+# form trees hanging off the core (or standing alone when a component has no
+# cycle at all). A shortest path never enters a dead end it does not start
+# or end in, so a query walks its endpoints up their trees to the core and
+# searches only the core between them.
+
+
+# class: DeadEnds
+# the pruned core mask of a maze plus the parent forest of the removed cells
+class DeadEnds:
+
+    # function: __init__
+    # inputs:
+    #   mask: original 2D boolean passability mask
+    #   core: 2D boolean mask of the cells left after pruning
+    #   parent: flat int32 array over the padded grid, the cell each removed
+    #           cell was attached to when removed, -1 for core cells, walls
+    #           and the roots of trees without a core
+    #   depth: flat int32 array over the padded grid, steps from each removed
+    #          cell up to its core cell or root, 0 elsewhere
+    #   padded_width: width of the padded grid
+    # output: none
+    def __init__(self, mask, core, parent, depth, padded_width):
+        self.mask = mask
+        self.core = core
+        self.parent = parent
+        self.depth = depth
+        self.padded_width = padded_width
+        self.nbytes = core.nbytes + parent.nbytes + depth.nbytes
+
+    # function: solve
+    # inputs:
+    #   start: (x, y) tuple representing starting pixel
+    #   goal: (x, y) tuple representing goal pixel
+    #   search: search function with the (image, start, goal, mask=...,
+    #           **options) signature of breath_first_search (optional)
+    #   options: extra keyword arguments for the search
+    # output:
+    #   path: list of (x, y) tuples representing path from start to goal,
+    #         the same length as search on the full mask would give
+    #   visited: visited pixels of the core search ({} if none was needed)
+    # relationships:
+    #   a start on a wall is searched on the full mask, as the searches step
+    #   off walls in ways the forest does not record
+    # pseudocode:
+    #   if start is a wall, search the full mask; if goal is a wall, no path
+    #   walk the deeper endpoint up its tree until both are equally deep,
+    #   then walk both up until they meet or reach depth 0
+    #   if they met, the path goes through that cell and no search is needed
+    #   if either stopped at a tree root instead of a core cell, no path
+    #   otherwise search the core between the two cells they reached and
+    #   join: start's walk + core path + goal's walk reversed
+    def solve(self, start, goal, search=breath_first_search, **options):
+        if not self.mask[start]:
+            return search(self.mask, start, goal, mask=self.mask, **options)
+        if not self.mask[goal]:
+            return [], {}
+
+        width = self.padded_width
+        parent, depth = self.parent, self.depth
+        u = (start[0] + 1) * width + start[1] + 1
+        v = (goal[0] + 1) * width + goal[1] + 1
+        forward, backward = [u], [v]
+        while depth[u] > depth[v]:
+            u = parent[u]
+            forward.append(u)
+        while depth[v] > depth[u]:
+            v = parent[v]
+            backward.append(v)
+        while u != v and depth[u] > 0:
+            u, v = parent[u], parent[v]
+            forward.append(u)
+            backward.append(v)
+
+        visited = {}
+        if u == v:
+            middle = [u]
+        else:
+            core_start = (u // width - 1, u % width - 1)
+            core_goal = (v // width - 1, v % width - 1)
+            if not (self.core[core_start] and self.core[core_goal]):
+                return [], {}
+            core_path, visited = search(self.core, core_start, core_goal, mask=self.core,
+                                        **options)
+            if not core_path:
+                return [], visited
+            middle = [(row + 1) * width + col + 1 for row, col in core_path]
+
+        cells = forward[:-1] + middle + backward[-2::-1]
+        return [(int(index) // width - 1, int(index) % width - 1) for index in cells], visited
+
+
+# function: prune_dead_ends
+# inputs:
+#   image: 2D array of pixels
+#   mask: precomputed passability mask of image (optional)
+# output:
+#   DeadEnds for the maze
+# relationships:
+#   cached per maze by Maze.dead_ends; works a round of removals at a time
+#   on padded flat indices (see frontier_search.pad_mask)
+# pseudocode:
+#   count each open cell's open neighbors
+#   frontier = open cells with at most one open neighbor
+#   while frontier not empty:
+#       each frontier cell's parent is its one open neighbor (if any); two
+#       cells that are each other's only neighbor keep the lower one's parent
+#       remove the frontier, take one off each parent's neighbor count
+#       frontier = parents left with at most one open neighbor
+#   going back through the rounds, depth = parent's depth + 1
+def prune_dead_ends(image, mask=None):
+    if mask is None:
+        mask = passability_mask(image)
+    height, width = mask.shape
+    alive, padded_width = pad_mask(mask)
+    offsets = [dr * padded_width + dc for dr, dc in DIRECTIONS]
+
+    degree = np.zeros(alive.size, dtype=np.int8)
+    inner = slice(padded_width, alive.size - padded_width)
+    for offset in offsets:
+        degree[inner] += alive[padded_width + offset:alive.size - padded_width + offset]
+    parent = np.full(alive.size, -1, dtype=np.int32)
+    removing = np.zeros(alive.size, dtype=np.bool_)
+
+    rounds = []
+    frontier = np.flatnonzero(alive & (degree <= 1))
+    while frontier.size:
+        attached = np.full(frontier.size, -1, dtype=np.int32)
+        for offset in offsets:
+            neighbors = frontier + offset
+            attached[alive[neighbors]] = neighbors[alive[neighbors]]
+
+        removing[frontier] = True
+        pair = attached >= 0
+        pair[pair] = removing[attached[pair]]
+        attached[pair & (frontier > attached)] = -1
+        removing[frontier] = False
+
+        alive[frontier] = False
+        parent[frontier] = attached
+        rounds.append(frontier)
+
+        attached = attached[attached >= 0]
+        attached = attached[alive[attached]]
+        np.subtract.at(degree, attached, 1)
+        frontier = np.unique(attached[degree[attached] <= 1])
+
+    depth = np.zeros(alive.size, dtype=np.int32)
+    for frontier in reversed(rounds):
+        children = frontier[parent[frontier] >= 0]
+        depth[children] = depth[parent[children]] + 1
+
+    core = alive.reshape(height + 2, padded_width)[1:-1, 1:-1].copy()
+    return DeadEnds(mask, core, parent, depth, padded_width)
@@ -0,0 +1,175 @@
+from collections import OrderedDict
+import numpy as np
+from frontier_search import DIRECTIONS, flood, pad_mask
+from search import passability_mask
+
+# One-to-many routing to a fixed goal. A single breadth first flood from the
+# goal records, for every pixel, its distance to the goal and the step that
+# reached it; the path from any start is then read off by following those
+# steps back, in O(path length), with no further searching.
+
+
+# class: DistanceField
+# distances and directions from every pixel to one goal
+class DistanceField:
+
+    # function: __init__
+    # inputs:
+    #   goal: (x, y) tuple the field leads to
+    #   distance: 2D int32 array, steps from each pixel to goal, -1 if unreachable
+    #             (every pixel when goal is a wall)
+    #   direction: 2D int8 array, index into DIRECTIONS of the step that
+    #              reached each pixel from goal's side, -1 if unreachable
+    # output: none
+    def __init__(self, goal, distance, direction):
+        self.goal = goal
+        self.distance = distance
+        self.direction = direction
+        self.height, self.width = distance.shape
+        self.nbytes = distance.nbytes + direction.nbytes
+
+    # function: path
+    # inputs:
+    #   start: (x, y) tuple representing starting pixel
+    # output:
+    #   path: list of (x, y) tuples representing path from start to goal,
+    #         [] if goal cannot be reached
+    # relationships:
+    #   same path lengths as breath_first_search(image, start, goal); a start
+    #   on a wall leaves through its nearest passable neighbor, as in the
+    #   searches
+    # pseudocode:
+    #   if start == goal, return [start]
+    #   if start is unreachable, step to its neighbor closest to goal (if any)
+    #   from there, repeatedly step against the recorded direction until goal
+    def path(self, start):
+        if start == self.goal:
+            return [start]
+        path = [start]
+        current = start
+        if self.distance[start] < 0:
+            current = self.nearest_neighbor(start)
+            if current is None:
+                return []
+            path.append(current)
+
+        row, col = current
+        direction = self.direction
+        goal = self.goal
+        while (row, col) != goal:
+            dr, dc = DIRECTIONS[direction[row, col]]
+            row -= dr
+            col -= dc
+            path.append((row, col))
+        return path
+
+    # function: nearest_neighbor
+    # inputs:
+    #   start: (x, y) tuple of an unreachable pixel (e.g. a wall)
+    # output:
+    #   (x, y) tuple of the reachable neighbor closest to goal, or None
+    # pseudocode:
+    #   check up, down, left, right, keep the one with the smallest distance
+    def nearest_neighbor(self, start):
+        best = None
+        for dr, dc in DIRECTIONS:
+            row, col = start[0] + dr, start[1] + dc
+            if 0 <= row < self.height and 0 <= col < self.width and self.distance[row, col] >= 0:
+                if best is None or self.distance[row, col] < self.distance[best]:
+                    best = (row, col)
+        return best
+
+
+# function: distance_field
+# inputs:
+#   image: 2D array of pixels
+#   goal: (x, y) tuple every path should lead to
+#   mask: precomputed passability mask of image (optional)
+# output:
+#   field: DistanceField for goal
+# relationships:
+#   floods with frontier_search.flood, the same level-at-a-time BFS as
+#   breath_first_search(engine="frontier"), but over the whole component
+# pseudocode:
+#   if goal is a wall, nothing can reach it: field of -1
+#   flood the padded mask from goal, recording levels and directions
+#   crop the padding, mark unvisited pixels -1
+def distance_field(image, goal, mask=None):
+    if mask is None:
+        mask = passability_mask(image)
+    height, width = mask.shape
+    distance = np.full((height, width), -1, dtype=np.int32)
+    direction = np.full((height, width), -1, dtype=np.int8)
+    if not mask[goal]:
+        return DistanceField(goal, distance, direction)
+
+    open_cells, padded_width = pad_mask(mask)
+    offsets = [dr * padded_width + dc for dr, dc in DIRECTIONS]
+    goal_index = (goal[0] + 1) * padded_width + goal[1] + 1
+    levels = np.zeros(open_cells.size, dtype=np.int32)
+    visited, steps = flood(open_cells, offsets, goal_index, distance=levels)
+
+    reached = visited.reshape(height + 2, padded_width)[1:-1, 1:-1]
+    distance[reached] = levels.reshape(height + 2, padded_width)[1:-1, 1:-1][reached]
+    direction[reached] = steps.reshape(height + 2, padded_width)[1:-1, 1:-1][reached]
+    return DistanceField(goal, distance, direction)
+
+
+# class: FieldCache
+# least recently used cache of DistanceFields keyed by (maze, goal), holding
+# at most budget bytes of fields
+class FieldCache:
+
+    # function: __init__
+    # inputs:
+    #   budget: most bytes of distance and direction grids to keep
+    # output: none
+    def __init__(self, budget=256 * 2 ** 20):
+        self.budget = budget
+        self.nbytes = 0
+        self.fields = OrderedDict()
+
+    # function: field
+    # inputs:
+    #   maze: Maze (or any hashable object with a mask attribute)
+    #   goal: (x, y) tuple
+    # output:
+    #   field: DistanceField for goal on maze
+    # relationships:
+    #   the maze itself is part of the key, so fields of different mazes
+    #   never mix and a cached maze stays alive until its fields are evicted
+    # pseudocode:
+    #   if cached, mark most recently used and return it
+    #   otherwise build it, store it, evict least recently used fields
+    #   until within budget (a field larger than budget is not stored)
+    def field(self, maze, goal):
+        key = (maze, goal)
+        field = self.fields.get(key)
+        if field is not None:
+            self.fields.move_to_end(key)
+            return field
+
+        field = distance_field(maze.mask, goal, mask=maze.mask)
+        if field.nbytes <= self.budget:
+            self.fields[key] = field
+            self.nbytes += field.nbytes
+            while self.nbytes > self.budget:
+                _, evicted = self.fields.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+        return field
+
+    # function: path
+    # inputs:
+    #   maze: Maze (or any hashable object with a mask attribute)
+    #   start: (x, y) tuple representing starting pixel
+    #   goal: (x, y) tuple representing goal pixel
+    # output:
+    #   path: list of (x, y) tuples representing path from start to goal
+    def path(self, maze, start, goal):
+        return self.field(maze, goal).path(start)
+
+    def __len__(self):
+        return len(self.fields)
+
+    def __contains__(self, key):
+        return key in self.fields
@@ -0,0 +1,180 @@
+import numpy as np
+from search import FlatVisited, passability_mask, reject_tracing
+
+# Frontier-at-a-time breadth first search. Instead of popping one vertex at a
+# time from a FIFOQueue, a whole BFS level is expanded per step with NumPy.
+#
+# The grid is padded with a one pixel wall border so the four neighbor steps
+# are plain offsets (-width, +width, -1, +1) with no bounds checks. Cells are
+# flat indices into the padded grid.
+
+# step offsets are filled in per grid, in the same up, down, left, right order
+# as get_neighbors; direction[v] stores which step reached v
+DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+# levels smaller than this are expanded with a plain Python loop, where the
+# fixed cost of a NumPy call would outweigh the work (long thin corridors)
+VECTOR_FRONTIER = 64
+
+
+# function: pad_mask
+# inputs:
+#   mask: 2D boolean passability mask
+# output:
+#   padded: flat boolean array of shape (height + 2) * (width + 2), with a
+#           False border around a copy of mask
+#   padded_width: width + 2
+# relationships:
+#   shared by the frontier engines so neighbor offsets never leave the grid
+# pseudocode:
+#   allocate a zero grid two larger in each dimension, copy mask into the middle
+def pad_mask(mask):
+    height, width = mask.shape
+    padded_width = width + 2
+    padded = np.zeros((height + 2, padded_width), dtype=np.bool_)
+    padded[1:-1, 1:-1] = mask
+    return padded.reshape(-1), padded_width
+
+
+# function: frontier_bfs
+# inputs:
+#   image: 2D array of pixels
+#   start: (x, y) tuple representing starting pixel
+#   goal: (x, y) tuple representing goal pixel
+#   mask: precomputed passability mask of image (optional)
+#   stats: dictionary to record search counters in (optional)
+#       expanded: number of pixels reached by the flood
+#       (a SearchStats raises TypeError, see reject_tracing)
+# pre-conditions:
+#   image is a non-empty 2D array
+#   start and goal are valid pixel coordinates within image
+# output:
+#   path: list of (x, y) tuples representing path from start to goal
+#   visited: FlatVisited mapping over the visited pixels
+# relationships:
+#   used by breath_first_search(engine="frontier"), path lengths match the
+#   queue based BFS, though ties between equal length paths may differ
+# pseudocode:
+#   flood the padded mask from start until goal is visited
+#   walk directions back from goal to start to build the path
+def frontier_bfs(image, start, goal, mask=None, stats=None):
+    reject_tracing(stats, "the frontier engine")
+    if mask is None:
+        mask = passability_mask(image)
+    height, width = mask.shape
+    open_cells, padded_width = pad_mask(mask)
+    offsets = [dr * padded_width + dc for dr, dc in DIRECTIONS]
+
+    start_index = (start[0] + 1) * padded_width + start[1] + 1
+    goal_index = (goal[0] + 1) * padded_width + goal[1] + 1
+    visited, direction = flood(open_cells, offsets, start_index, goal_index)
+    if stats is not None:
+        stats["expanded"] = int(np.count_nonzero(visited))
+
+    grid = visited.reshape(height + 2, padded_width)[1:-1, 1:-1]
+    return trace_directions(memoryview(direction), offsets, padded_width, start_index, goal_index,
+                            visited[goal_index]), FlatVisited(grid)
+
+
+# function: flood
+# inputs:
+#   open_cells: flat padded passability mask from pad_mask (consumed: visited
+#               cells are cleared)
+#   offsets: flat offset for each step in DIRECTIONS
+#   start_index: padded flat index to flood from
+#   stop_index: padded flat index to stop at once visited; 0 (a border
+#               cell, never visited) floods everything reachable
+#   distance: flat int32 array to record BFS levels in (optional)
+# output:
+#   visited: flat boolean array of visited cells
+#   direction: flat int8 array, the step number that reached each cell
+# relationships:
+#   shared by frontier_bfs and distance_field
+# pseudocode:
+#   frontier = [start]
+#   while frontier not empty and stop not visited:
+#       for each direction d:
+#           candidates = frontier + offset[d]
+#           keep candidates that are open
+#           close them, mark visited, record d as their direction
+#       next frontier = all kept candidates, record their level
+def flood(open_cells, offsets, start_index, stop_index=0, distance=None):
+    visited = np.zeros(open_cells.size, dtype=np.bool_)
+    direction = np.zeros(open_cells.size, dtype=np.int8)
+    steps = list(enumerate(offsets))
+    open_cells[start_index] = False
+    visited[start_index] = True
+
+    # byte views for the scalar loop, NumPy arrays for the vector loop
+    open_view = memoryview(open_cells).cast('B')
+    visited_view = memoryview(visited).cast('B')
+    direction_view = memoryview(direction)
+    distance_view = memoryview(distance) if distance is not None else None
+
+    frontier = [start_index]
+    level = 0
+    while len(frontier) and not visited_view[stop_index]:
+        level += 1
+        if len(frontier) < VECTOR_FRONTIER:
+            if not isinstance(frontier, list):
+                frontier = frontier.tolist()
+            next_frontier = []
+            for u in frontier:
+                for d, offset in steps:
+                    v = u + offset
+                    if open_view[v]:
+                        open_view[v] = 0
+                        visited_view[v] = 1
+                        direction_view[v] = d
+                        next_frontier.append(v)
+            if distance_view is not None:
+                for v in next_frontier:
+                    distance_view[v] = level
+            frontier = next_frontier
+        else:
+            frontier = np.asarray(frontier, dtype=np.intp)
+            found = []
+            for d in range(4):
+                candidates = frontier + offsets[d]
+                candidates = candidates[open_cells[candidates]]
+                if candidates.size:
+                    open_cells[candidates] = False
+                    visited[candidates] = True
+                    direction[candidates] = d
+                    found.append(candidates)
+            frontier = np.concatenate(found) if found else []
+            if distance is not None and len(frontier):
+                distance[frontier] = level
+
+    return visited, direction
+
+
+# function: trace_directions
+# inputs:
+#   direction: flat sequence of step numbers that reached each padded cell
+#   offsets: flat offset for each step number
+#   padded_width: width of the padded grid
+#   start_index: padded flat index of start
+#   goal_index: padded flat index of goal
+#   reached: True if goal was visited
+# output:
+#   path: list of (x, y) tuples representing path from start to goal
+# relationships:
+#   direction grid version of reconstruct_path
+# pseudocode:
+#   if goal not reached, return []
+#   from goal, step back against the recorded direction until start
+#   convert padded indices to unpadded (x, y) tuples and reverse
+def trace_directions(direction, offsets, padded_width, start_index, goal_index, reached):
+    if not reached:
+        return []
+
+    path = []
+    current = goal_index
+    while current != start_index:
+        path.append(current)
+        current -= offsets[direction[current]]
+    path.append(start_index)
+    path.reverse()
+
+    return [(index // padded_width - 1, index % padded_width - 1) for index in path]
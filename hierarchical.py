@@ -0,0 +1,325 @@
+from collections import deque
+import numpy as np
+from search import best_first_search, flat_passable, manhattan_distance, passability_mask
+from search_queue import PriorityQueue
+
+# Hierarchical pathfinding (HPA*) for answering many long queries on one map.
+#
+# The grid is cut into square clusters. Wherever two neighboring clusters
+# share an open stretch of border, entrance pixels are placed on both sides
+# (one in the middle of a short opening, one at each end of a long one) and
+# joined by a step of cost 1. Inside each cluster the distance between every
+# pair of its entrances is found once. Queries then run A* on this small
+# abstract graph and only turn the chosen abstract edges back into pixels.
+#
+# Paths are shortest within the abstraction; they can be slightly longer than
+# a flat A* path because routes are forced through the placed entrances.
+
+# openings at least this long get an entrance at both ends instead of one
+# in the middle
+WIDE_ENTRANCE = 6
+
+
+# class: HierarchicalMap
+# abstract graph of cluster entrances over one passability mask, built once
+# and shared by every query on the map
+class HierarchicalMap:
+
+    # function: __init__
+    # inputs:
+    #   image: 2D array of pixels
+    #   cluster_size: side length of the square clusters in pixels
+    #   mask: precomputed passability mask of image (optional)
+    # output: none
+    # relationships:
+    #   find_entrances places the abstract nodes, link_clusters connects them
+    # pseudocode:
+    #   build mask, split it into clusters
+    #   place entrances on every shared cluster border
+    #   compute distances between entrances of the same cluster
+    def __init__(self, image, cluster_size=32, mask=None):
+        if mask is None:
+            mask = passability_mask(image)
+        self.mask = np.ascontiguousarray(mask, dtype=np.bool_)
+        self.height, self.width = self.mask.shape
+        self.cluster_size = cluster_size
+        self.passable = flat_passable(self.mask)
+
+        # cluster (row, col) -> list of its entrance pixels
+        self.entrances = {}
+        # entrance pixel -> {neighbor entrance pixel: cost}
+        self.edges = {}
+        self.find_entrances()
+        self.link_clusters()
+
+    # function: cluster_of
+    # inputs:
+    #   vertex: (x, y) tuple
+    # output:
+    #   (row, col) of the cluster holding vertex
+    def cluster_of(self, vertex):
+        return vertex[0] // self.cluster_size, vertex[1] // self.cluster_size
+
+    # function: cluster_bounds
+    # inputs:
+    #   cluster: (row, col) of a cluster
+    # output:
+    #   (top, left, bottom, right): pixel rows top..bottom-1 and columns
+    #   left..right-1 of the cluster, clipped to the image
+    def cluster_bounds(self, cluster):
+        size = self.cluster_size
+        top, left = cluster[0] * size, cluster[1] * size
+        return top, left, min(top + size, self.height), min(left + size, self.width)
+
+    # function: add_entrance
+    # inputs:
+    #   vertex: (x, y) tuple on a cluster border
+    # output: none
+    # pseudocode:
+    #   register vertex with its cluster once
+    def add_entrance(self, vertex):
+        if vertex not in self.edges:
+            self.edges[vertex] = {}
+            self.entrances.setdefault(self.cluster_of(vertex), []).append(vertex)
+
+    # function: add_edge
+    # inputs:
+    #   u, v: entrance pixels
+    #   cost: path length between them
+    # output: none
+    # pseudocode:
+    #   store cost in both directions, keeping the cheaper one
+    def add_edge(self, u, v, cost):
+        if cost < self.edges[u].get(v, cost + 1):
+            self.edges[u][v] = cost
+            self.edges[v][u] = cost
+
+    # function: find_entrances
+    # inputs: none
+    # output: none
+    # relationships:
+    #   border_openings finds the open stretches of each border
+    # pseudocode:
+    #   for each vertical border between cluster columns, per cluster row:
+    #       for each opening, place entrances on both sides and join them
+    #   same for each horizontal border between cluster rows
+    def find_entrances(self):
+        size = self.cluster_size
+        for col in range(size, self.width, size):
+            for top in range(0, self.height, size):
+                bottom = min(top + size, self.height)
+                for row in self.border_openings(self.mask[top:bottom, col - 1],
+                                                self.mask[top:bottom, col]):
+                    self.add_crossing((top + row, col - 1), (top + row, col))
+        for row in range(size, self.height, size):
+            for left in range(0, self.width, size):
+                right = min(left + size, self.width)
+                for col in self.border_openings(self.mask[row - 1, left:right],
+                                                self.mask[row, left:right]):
+                    self.add_crossing((row - 1, left + col), (row, left + col))
+
+    # function: add_crossing
+    # inputs:
+    #   u, v: neighboring pixels on opposite sides of a cluster border
+    # output: none
+    def add_crossing(self, u, v):
+        self.add_entrance(u)
+        self.add_entrance(v)
+        self.add_edge(u, v, 1)
+
+    # function: border_openings
+    # inputs:
+    #   side_a, side_b: 1D boolean masks of the pixels on each side of a border
+    # output:
+    #   list of offsets along the border where entrances go
+    # pseudocode:
+    #   find runs where both sides are open
+    #   short run: its middle; long run: both of its ends
+    @staticmethod
+    def border_openings(side_a, side_b):
+        both = np.concatenate(([False], side_a & side_b, [False]))
+        edges = np.flatnonzero(both[1:] != both[:-1])
+        offsets = []
+        for begin, end in zip(edges[0::2].tolist(), edges[1::2].tolist()):
+            if end - begin < WIDE_ENTRANCE:
+                offsets.append((begin + end - 1) // 2)
+            else:
+                offsets.extend((begin, end - 1))
+        return offsets
+
+    # function: link_clusters
+    # inputs: none
+    # output: none
+    # relationships:
+    #   cluster_distances runs the local searches
+    # pseudocode:
+    #   for each cluster, for each of its entrances:
+    #       find distances inside the cluster to the later entrances
+    #       add an edge for each one that is reachable
+    def link_clusters(self):
+        for cluster, nodes in self.entrances.items():
+            for i, source in enumerate(nodes[:-1]):
+                distances = self.cluster_distances(source, cluster, nodes[i + 1:])
+                for target, cost in distances.items():
+                    self.add_edge(source, target, cost)
+
+    # function: cluster_distances
+    # inputs:
+    #   source: passable (x, y) tuple inside cluster
+    #   cluster: (row, col) of the cluster to stay in
+    #   targets: list of (x, y) tuples inside cluster
+    # output:
+    #   dictionary mapping each reachable target to its distance from source
+    # relationships:
+    #   breadth first search on the flat mask, like unified_search with a
+    #   FIFOQueue, but confined to one cluster and stopping once every
+    #   target has been found
+    # pseudocode:
+    #   BFS from source over passable pixels within the cluster bounds
+    #   record the distance of each target as it is reached
+    def cluster_distances(self, source, cluster, targets):
+        top, left, bottom, right = self.cluster_bounds(cluster)
+        width = self.width
+        passable = self.passable
+        remaining = {row * width + col for row, col in targets}
+        found = {}
+
+        start = source[0] * width + source[1]
+        distance = {start: 0}
+        remaining.discard(start)
+        queue = deque([start])
+        while queue and remaining:
+            index = queue.popleft()
+            row, col = divmod(index, width)
+            step = distance[index] + 1
+            for neighbor, inside in ((index - width, row > top), (index + width, row < bottom - 1),
+                                     (index - 1, col > left), (index + 1, col < right - 1)):
+                if inside and neighbor not in distance and passable[neighbor]:
+                    distance[neighbor] = step
+                    queue.append(neighbor)
+                    if neighbor in remaining:
+                        remaining.discard(neighbor)
+                        found[divmod(neighbor, width)] = step
+        return found
+
+    # function: open_neighbors
+    # inputs:
+    #   pixel: (x, y) tuple
+    # output:
+    #   list of pixel's passable neighbors, in get_neighbors order
+    def open_neighbors(self, pixel):
+        row, col = pixel
+        return [(r, c) for r, c in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1))
+                if 0 <= r < self.height and 0 <= c < self.width
+                and self.passable[r * self.width + c]]
+
+    # function: solve
+    # inputs:
+    #   start: (x, y) tuple representing starting pixel
+    #   goal: (x, y) tuple representing goal pixel
+    #   stats: dictionary to record search counters in (optional)
+    #       expanded: abstract nodes popped from the queue
+    # output:
+    #   path: list of (x, y) tuples representing path from start to goal
+    #   visited: dictionary of the abstract nodes that were closed
+    # relationships:
+    #   same interface as best_first_search; refine turns the abstract path
+    #   back into pixels
+    # pseudocode:
+    #   if start == goal, return [start]
+    #   if goal is a wall, no path can end there, return no path unsearched
+    #   connect start to the entrances of its cluster, and goal likewise
+    #   (and start to goal directly if they share a cluster)
+    #   a start on a wall instead steps to each open neighbor at cost 1, and
+    #   each neighbor is connected within its own cluster, which may not be
+    #   start's when start is on a cluster border
+    #   A* over the abstract graph with manhattan_distance
+    #   refine the abstract path into pixels
+    def solve(self, start, goal, stats=None):
+        if start == goal:
+            return [start], {start: True}
+
+        if not self.passable[goal[0] * self.width + goal[1]]:
+            if stats is not None:
+                stats["expanded"] = 0
+            return [], {}
+
+        # temporary edges for this query only
+        extra = {start: {}}
+        goal_cluster = self.cluster_of(goal)
+        sources = [start]
+        if not self.passable[start[0] * self.width + start[1]]:
+            sources = self.open_neighbors(start)
+            extra[start] = {source: 1 for source in sources}
+        for source in sources:
+            cluster = self.cluster_of(source)
+            targets = list(self.entrances.get(cluster, []))
+            if cluster == goal_cluster:
+                targets.append(goal)
+            extra.setdefault(source, {}).update(self.cluster_distances(source, cluster, targets))
+        for node, cost in self.cluster_distances(goal, goal_cluster,
+                                                 self.entrances.get(goal_cluster, [])).items():
+            extra.setdefault(node, {})[goal] = cost
+
+        queue = PriorityQueue()
+        closed = {}
+        distance = {start: 0}
+        prev = {}
+        queue.insert(start, manhattan_distance(start, goal))
+        expanded = 0
+
+        while not queue.is_empty():
+            u = queue.pop()
+            if u in closed:
+                continue
+            closed[u] = True
+            expanded += 1
+            if u == goal:
+                break
+
+            for edges in (self.edges.get(u, {}), extra.get(u, {})):
+                for v, cost in edges.items():
+                    new_distance = distance[u] + cost
+                    if new_distance < distance.get(v, new_distance + 1):
+                        distance[v] = new_distance
+                        prev[v] = u
+                        queue.insert(v, new_distance + manhattan_distance(v, goal))
+
+        if stats is not None:
+            stats["expanded"] = expanded
+        if goal not in closed:
+            return [], closed
+        return self.refine(prev, start, goal), closed
+
+    # function: refine
+    # inputs:
+    #   prev: dictionary mapping abstract nodes to their predecessor
+    #   start: (x, y) tuple representing starting pixel
+    #   goal: (x, y) tuple representing goal pixel
+    # output:
+    #   path: list of (x, y) tuples representing path from start to goal
+    # relationships:
+    #   each abstract edge is a single border step or lies inside one
+    #   cluster, so only that cluster's pixels are searched
+    # pseudocode:
+    #   walk prev back from goal to get the abstract path
+    #   for each consecutive pair (u, v):
+    #       if they are neighbors, step to v
+    #       else run best_first_search on u's cluster and append its path
+    def refine(self, prev, start, goal):
+        nodes = [goal]
+        while nodes[-1] != start:
+            nodes.append(prev[nodes[-1]])
+        nodes.reverse()
+
+        path = [start]
+        for u, v in zip(nodes, nodes[1:]):
+            if manhattan_distance(u, v) == 1:
+                path.append(v)
+                continue
+            top, left, bottom, right = self.cluster_bounds(self.cluster_of(u))
+            window = self.mask[top:bottom, left:right]
+            segment, _ = best_first_search(window, (u[0] - top, u[1] - left),
+                                           (v[0] - top, v[1] - left), mask=window)
+            path.extend((row + top, col + left) for row, col in segment[1:])
+        return path
@@ -0,0 +1,159 @@
+import numpy as np
+from search import (flat_passable, get_step_neighbors, manhattan_distance, passability_mask,
+                    reconstruct_path)
+from search_queue import PriorityQueue
+
+# Incremental replanning with Lifelong Planning A* (LPA*).
+#
+# The planner keeps two distance estimates per pixel: g, the distance found
+# so far, and rhs, the one-step lookahead min(g(neighbor) + 1) over its
+# neighbors. A pixel is consistent when g == rhs. Only inconsistent pixels
+# sit in the queue, ordered by (min(g, rhs) + manhattan_distance, min(g, rhs)).
+# The first plan is an ordinary A*; after pixels change, only the pixels
+# whose distances actually change are made inconsistent and re-expanded.
+#
+# Moves follow the searches: stepping onto a pixel needs that pixel to be
+# passable, the start itself may be a wall.
+
+INFINITY = float("inf")
+
+
+# class: LifelongPlanner
+# LPA* search state for one (start, goal) query on an editable mask
+class LifelongPlanner:
+
+    # function: __init__
+    # inputs:
+    #   image: 2D array of pixels
+    #   start: (x, y) tuple representing starting pixel
+    #   goal: (x, y) tuple representing goal pixel
+    #   mask: precomputed passability mask of image (optional, copied)
+    # output: none
+    # relationships:
+    #   the planner edits its own copy of the mask in update
+    # pseudocode:
+    #   copy mask, every g and rhs is infinite except rhs(start) = 0
+    #   queue start
+    def __init__(self, image, start, goal, mask=None):
+        if mask is None:
+            mask = passability_mask(image)
+        self.mask = np.array(mask, dtype=np.bool_)
+        self.height, self.width = self.mask.shape
+        self.passable = flat_passable(self.mask)
+        self.start = start
+        self.goal = goal
+
+        self.g = {}
+        self.rhs = {start: 0}
+        self.queue = PriorityQueue()
+        self.queue.insert(start, self.key(start))
+        self.expanded = 0
+
+    # function: key
+    # inputs:
+    #   vertex: (x, y) tuple
+    # output:
+    #   (min(g, rhs) + manhattan_distance to goal, min(g, rhs))
+    def key(self, vertex):
+        best = min(self.g.get(vertex, INFINITY), self.rhs.get(vertex, INFINITY))
+        return best + manhattan_distance(vertex, self.goal), best
+
+    # function: update_vertex
+    # inputs:
+    #   vertex: (x, y) tuple whose neighbors' g or own passability changed
+    # output: none
+    # pseudocode:
+    #   if vertex is not start:
+    #       rhs = min(g(neighbor) + 1) if vertex is passable, else infinity
+    #   queue vertex if g != rhs, otherwise take it out of the queue
+    def update_vertex(self, vertex):
+        if vertex != self.start:
+            best = INFINITY
+            if self.passable[vertex[0] * self.width + vertex[1]]:
+                g = self.g
+                for neighbor in get_step_neighbors(vertex, self.height, self.width):
+                    best = min(best, g.get(neighbor, INFINITY) + 1)
+            self.rhs[vertex] = best
+        if self.g.get(vertex, INFINITY) != self.rhs.get(vertex, INFINITY):
+            self.queue.insert(vertex, self.key(vertex))
+        else:
+            self.queue.remove(vertex)
+
+    # function: compute_shortest_path
+    # inputs: none
+    # output: none
+    # pseudocode:
+    #   while the queue's smallest key is below goal's key, or goal is
+    #   inconsistent:
+    #       pop u
+    #       if g(u) > rhs(u): g(u) = rhs(u), update neighbors (overconsistent)
+    #       else: g(u) = infinity, update u and neighbors (underconsistent)
+    def compute_shortest_path(self):
+        queue = self.queue
+        g, rhs = self.g, self.rhs
+        goal = self.goal
+        while not queue.is_empty() and (queue.min_priority() < self.key(goal)
+                                        or g.get(goal, INFINITY) != rhs.get(goal, INFINITY)):
+            u = queue.pop()
+            self.expanded += 1
+            neighbors = get_step_neighbors(u, self.height, self.width)
+            if g.get(u, INFINITY) > rhs.get(u, INFINITY):
+                g[u] = rhs[u]
+            else:
+                g.pop(u, None)
+                self.update_vertex(u)
+            for v in neighbors:
+                self.update_vertex(v)
+
+    # function: plan
+    # inputs:
+    #   stats: dictionary to record search counters in (optional)
+    #       expanded: vertices popped since the last plan
+    # output:
+    #   path: list of (x, y) tuples representing path from start to goal
+    # relationships:
+    #   same output as reconstruct_path in the other searches
+    # pseudocode:
+    #   bring the search state up to date
+    #   from goal, step to any neighbor whose g is one less, recording prev,
+    #   until start; pass prev to reconstruct_path
+    def plan(self, stats=None):
+        self.expanded = 0
+        self.compute_shortest_path()
+        if stats is not None:
+            stats["expanded"] = self.expanded
+
+        prev = {}
+        g = self.g
+        current = self.goal
+        if g.get(current, INFINITY) == INFINITY:
+            return reconstruct_path(prev, self.start, self.goal)
+        while current != self.start:
+            for neighbor in get_step_neighbors(current, self.height, self.width):
+                if g.get(neighbor, INFINITY) == g[current] - 1:
+                    prev[current] = neighbor
+                    current = neighbor
+                    break
+        return reconstruct_path(prev, self.start, self.goal)
+
+    # function: update
+    # inputs:
+    #   changes: iterable of ((x, y), passable) pairs, the new state of each
+    #            edited pixel
+    # output: none
+    # relationships:
+    #   call plan afterwards for the repaired path
+    # pseudocode:
+    #   for each pixel whose passability actually changes:
+    #       store it in the mask
+    #       update the pixel (its own rhs) and its neighbors (they may route
+    #       through it)
+    def update(self, changes):
+        for vertex, passable in changes:
+            index = vertex[0] * self.width + vertex[1]
+            if bool(self.passable[index]) == bool(passable):
+                continue
+            self.passable[index] = bool(passable)
+            self.update_vertex(vertex)
+            for neighbor in get_step_neighbors(vertex, self.height, self.width):
+                self.update_vertex(neighbor)
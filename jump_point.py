@@ -0,0 +1,218 @@
+from frontier_search import pad_mask
+from search import passability_mask
+from search_queue import PriorityQueue
+
+# Jump Point Search for 4-connected, uniform cost grids.
+#
+# A* only ever expands "jump points": the start, the goal, and pixels where a
+# straight run has to branch (a wall next to the run ends, opening a side
+# passage). Runs through open space are scanned without being pushed on the
+# queue. With no diagonal moves the pruning rules are:
+#   moving horizontally: keep going, and branch up and down at jump points
+#   moving vertically: keep going, branch left and right at jump points, and
+#       stop wherever a horizontal scan from the current pixel finds a jump point
+#
+# The grid is padded with a wall border (see pad_mask), so every pixel is a flat
+# index and steps are offsets with no bounds checks.
+
+
+# function: jump_point_search
+# inputs:
+#   image: 2D array of pixels
+#   start: (x, y) tuple representing starting pixel
+#   goal: (x, y) tuple representing goal pixel
+#   mask: precomputed passability mask of image (optional)
+#   stats: dictionary to record search counters in (optional)
+#       expanded: jump points popped from the queue
+#       generated: jump points pushed on the queue
+# pre-conditions:
+#   image is a non-empty 2D array
+#   start and goal are valid pixel coordinates within image
+# output:
+#   path: list of (x, y) tuples representing path from start to goal
+#   visited: dictionary of the jump points that were reached
+# relationships:
+#   same interface as best_first_search, and same path lengths
+# pseudocode:
+#   if start == goal, return [start]
+#   if goal is not passable, return []
+#   A* over jump points with manhattan_distance:
+#       pop jump point u, stop if it is goal
+#       for each pruned direction d from u:
+#           jump from u in direction d to the next jump point v
+#           relax v with cost distance[u] + straight line length from u to v
+#   fill in the straight segments between consecutive jump points
+def jump_point_search(image, start, goal, mask=None, stats=None):
+    if mask is None:
+        mask = passability_mask(image)
+    padded, padded_width = pad_mask(mask)
+    walkable = memoryview(padded).cast('B')
+
+    start_index = (start[0] + 1) * padded_width + start[1] + 1
+    goal_index = (goal[0] + 1) * padded_width + goal[1] + 1
+    goal_row, goal_col = divmod(goal_index, padded_width)
+
+    distance = {start_index: 0}
+    prev = {}
+    incoming = {start_index: 0}
+    closed = set()
+    expanded = 0
+
+    found = start_index == goal_index
+    queue = PriorityQueue()
+    if walkable[goal_index]:
+        queue.insert(start_index, abs(start[0] - goal[0]) + abs(start[1] - goal[1]))
+
+    while not found and not queue.is_empty():
+        u = queue.pop()
+        if u in closed:
+            continue
+        closed.add(u)
+        expanded += 1
+        if u == goal_index:
+            found = True
+            break
+
+        for step in pruned_steps(incoming[u], padded_width):
+            v = jump(walkable, padded_width, u + step, step, goal_index)
+            if v is None:
+                continue
+            new_distance = distance[u] + abs(v - u) // (padded_width if abs(step) > 1 else 1)
+            if new_distance < distance.get(v, float("inf")):
+                distance[v] = new_distance
+                prev[v] = u
+                incoming[v] = step
+                row, col = divmod(v, padded_width)
+                queue.insert(v, new_distance + abs(row - goal_row) + abs(col - goal_col))
+
+    if stats is not None:
+        stats["expanded"] = expanded
+        stats["generated"] = len(distance)
+
+    visited = {unpad(index, padded_width): True for index in distance}
+    if not found:
+        return [], visited
+    return expand_jump_path(prev, incoming, padded_width, start_index, goal_index), visited
+
+
+# function: pruned_steps
+# inputs:
+#   incoming: step that reached the jump point (0 for start)
+#   padded_width: width of the padded grid
+# output:
+#   steps: flat offsets worth searching from the jump point
+# pseudocode:
+#   start: all four directions
+#   horizontal arrival: keep going, plus up and down
+#   vertical arrival: keep going, plus left and right
+def pruned_steps(incoming, padded_width):
+    if incoming == 0:
+        return (-padded_width, padded_width, -1, 1)
+    if abs(incoming) == 1:
+        return (incoming, -padded_width, padded_width)
+    return (incoming, -1, 1)
+
+
+# function: jump
+# inputs:
+#   walkable: flat byte view of the padded passability grid
+#   padded_width: width of the padded grid
+#   index: first pixel of the run
+#   step: flat offset of the run direction
+#   goal_index: padded flat index of goal
+# output:
+#   index of the next jump point along the run, None if the run hits a wall
+# relationships:
+#   vertical runs call scan_horizontal at every pixel
+# pseudocode:
+#   while index is walkable:
+#       if index is goal, return it
+#       if a side pixel is open but the side pixel one step back is a wall,
+#           return index (forced neighbor)
+#       if moving vertically and a horizontal scan either way finds a jump
+#           point, return index
+#       index += step
+#   return None
+def jump(walkable, padded_width, index, step, goal_index):
+    if abs(step) == 1:
+        return scan_horizontal(walkable, padded_width, index, step, goal_index)
+
+    while walkable[index]:
+        if index == goal_index:
+            return index
+        behind = index - step
+        if (walkable[index - 1] and not walkable[behind - 1]) or \
+                (walkable[index + 1] and not walkable[behind + 1]):
+            return index
+        if scan_horizontal(walkable, padded_width, index + 1, 1, goal_index) is not None or \
+                scan_horizontal(walkable, padded_width, index - 1, -1, goal_index) is not None:
+            return index
+        index += step
+    return None
+
+
+# function: scan_horizontal
+# inputs:
+#   walkable: flat byte view of the padded passability grid
+#   padded_width: width of the padded grid
+#   index: first pixel of the run
+#   step: -1 or 1
+#   goal_index: padded flat index of goal
+# output:
+#   index of the next jump point along the row, None if the row hits a wall
+# pseudocode:
+#   while index is walkable:
+#       if index is goal, return it
+#       if the pixel above or below is open but the one diagonally behind it
+#           is a wall, return index
+#       index += step
+#   return None
+def scan_horizontal(walkable, padded_width, index, step, goal_index):
+    while walkable[index]:
+        if index == goal_index:
+            return index
+        up = index - padded_width
+        down = index + padded_width
+        if (walkable[up] and not walkable[up - step]) or \
+                (walkable[down] and not walkable[down - step]):
+            return index
+        index += step
+    return None
+
+
+# function: expand_jump_path
+# inputs:
+#   prev: dictionary mapping each jump point to the jump point it came from
+#   incoming: dictionary mapping each jump point to the step that reached it
+#   padded_width: width of the padded grid
+#   start_index, goal_index: padded flat indices of start and goal
+# output:
+#   path: list of (x, y) tuples, every pixel from start to goal
+# relationships:
+#   jump point version of reconstruct_path
+# pseudocode:
+#   walk prev back from goal, and between each jump point and its
+#   predecessor add every pixel of the straight run
+#   reverse and convert to unpadded (x, y) tuples
+def expand_jump_path(prev, incoming, padded_width, start_index, goal_index):
+    indices = [goal_index]
+    current = goal_index
+    while current != start_index:
+        step = incoming[current]
+        parent = prev[current]
+        while current != parent:
+            current -= step
+            indices.append(current)
+    indices.reverse()
+    return [unpad(index, padded_width) for index in indices]
+
+
+# function: unpad
+# inputs:
+#   index: flat index into the padded grid
+#   padded_width: width of the padded grid
+# output:
+#   (x, y) tuple in the original image
+def unpad(index, padded_width):
+    row, col = divmod(index, padded_width)
+    return row - 1, col - 1
@@ -0,0 +1,135 @@
+import numpy as np
+from components import label_components
+from distance_field import distance_field
+from search import passability_mask
+
+# ALT (A*, landmarks, triangle inequality) heuristic. A few landmark pixels
+# get a full breadth first distance grid each. For any landmark L, the
+# triangle inequality gives |d(L, goal) - d(L, v)| <= d(v, goal), so the
+# largest such difference is an admissible (and consistent) estimate that
+# follows the maze's corridors instead of the straight line.
+#
+#   alt = select_landmarks(image, 8)
+#   unified_search(image, start, goal, PriorityQueue, alt, close_on_pop=True)
+
+
+# class: Landmarks
+# landmark pixels with their distance grids, callable as a search heuristic
+class Landmarks:
+
+    # function: __init__
+    # inputs:
+    #   pixels: list of (x, y) landmark tuples
+    #   grids: list of flat uint16 or uint32 arrays, steps from each pixel to
+    #          the landmark, the dtype's largest value where unreachable
+    #   width: maze width, pixel (row, col) is grid entry row * width + col
+    # output: none
+    def __init__(self, pixels, grids, width):
+        self.pixels = pixels
+        self.grids = grids
+        self.views = [memoryview(grid) for grid in grids]
+        self.width = width
+        self.nbytes = sum(grid.nbytes for grid in grids)
+        self.goal = None
+        self.goal_distances = []
+
+    # function: __call__
+    # inputs:
+    #   from_vertex: (x, y) tuple representing current pixel
+    #   goal: (x, y) tuple representing goal pixel
+    # output:
+    #   distance: lower bound on the steps from from_vertex to goal
+    # relationships:
+    #   same signature as manhattan_distance, so it can be passed as the
+    #   heuristic of unified_search, and never smaller than it
+    #   landmarks that cannot reach goal are skipped; a vertex a landmark
+    #   cannot reach is in another component than goal, where any estimate
+    #   is harmless
+    # pseudocode:
+    #   when goal changes, keep the (view, d(L, goal)) pairs of the
+    #   landmarks that reach goal
+    #   return the largest |d(L, goal) - d(L, v)|, or manhattan if larger
+    def __call__(self, from_vertex, goal):
+        if goal != self.goal:
+            self.set_goal(goal)
+        index = from_vertex[0] * self.width + from_vertex[1]
+        estimate = abs(from_vertex[0] - goal[0]) + abs(from_vertex[1] - goal[1])
+        for view, goal_distance in self.goal_distances:
+            difference = abs(goal_distance - view[index])
+            if difference > estimate:
+                estimate = difference
+        return estimate
+
+    def set_goal(self, goal):
+        index = goal[0] * self.width + goal[1]
+        self.goal = goal
+        self.goal_distances = [(view, int(grid[index])) for view, grid in
+                               zip(self.views, self.grids) if grid[index] != unreached(grid)]
+
+
+# function: unreached
+# inputs:
+#   grid: landmark distance grid
+# output:
+#   the value grid uses for unreachable pixels (the dtype's largest value)
+def unreached(grid):
+    return np.iinfo(grid.dtype).max
+
+
+# function: select_landmarks
+# inputs:
+#   image: 2D array of pixels
+#   count: number of landmarks
+#   mask: precomputed passability mask of image (optional)
+#   seed: (x, y) tuple to start the selection from (optional, defaults to
+#         a pixel of the largest component)
+# output:
+#   Landmarks in seed's component (fewer than count if it has fewer pixels)
+# relationships:
+#   each landmark costs one distance_field and width * height * 2 bytes
+#   (4 when a distance does not fit in uint16)
+#   queries outside seed's component fall back to manhattan_distance
+# pseudocode:
+#   flood from seed; the first landmark is the pixel farthest from it
+#   repeat count times:
+#       flood from the newest landmark, store its grid
+#       track every pixel's distance to its nearest landmark so far
+#       the next landmark is the pixel with the largest such distance
+def select_landmarks(image, count, mask=None, seed=None):
+    if mask is None:
+        mask = passability_mask(image)
+    height, width = mask.shape
+    if seed is None:
+        labels = label_components(mask)
+        sizes = np.bincount(labels.ravel())
+        if len(sizes) < 2:
+            return Landmarks([], [], width)
+        seed = np.unravel_index(np.argmax(labels == sizes[1:].argmax() + 1), labels.shape)
+        seed = (int(seed[0]), int(seed[1]))
+
+    distance = distance_field(mask, seed, mask=mask).distance
+    nearest = distance
+    pixels, grids = [], []
+    while len(pixels) < count:
+        farthest = np.unravel_index(np.argmax(nearest), nearest.shape)
+        if nearest[farthest] <= 0 and pixels:
+            break
+        landmark = (int(farthest[0]), int(farthest[1]))
+        distance = distance_field(mask, landmark, mask=mask).distance
+        pixels.append(landmark)
+        grids.append(compact_grid(distance))
+        nearest = distance if len(pixels) == 1 else np.minimum(nearest, distance)
+    return Landmarks(pixels, grids, width)
+
+
+# function: compact_grid
+# inputs:
+#   distance: 2D int32 distance grid, -1 where unreachable
+# output:
+#   flat uint16 grid (uint32 if the largest distance does not fit) with
+#   unreachable pixels set to the dtype's largest value
+def compact_grid(distance):
+    dtype = np.uint16 if distance.max() < np.iinfo(np.uint16).max else np.uint32
+    grid = distance.astype(dtype).ravel()
+    grid[distance.ravel() < 0] = np.iinfo(dtype).max
+    return grid
@@ -1,61 +1,78 @@
 # John Jezl and David Lund
 
+from itertools import chain
 from PIL import Image
 import numpy as np
 from search import *
+from maze import Maze
 
 # function: create_image
 # inputs:
 #   path: list of (x, y) tuples representing path from start to goal
-#   visited: dictionary mapping (x, y) tuples to boolean indicating if pixel was visited
+#   visited: dictionary mapping (x, y) tuples to boolean indicating if pixel was visited,
+#            or a FlatVisited / 2D boolean mask from an array-backed search
 #   image_array: original 2D array of pixels
 #   new_image: filename for the output image
+#   in_place: paint directly into image_array instead of a copy (optional)
 # output: none
 # relationships:
 #   creates and saves a new image highlighting visited pixels in green and path pixels in red
 # pseudocode:
-#   copy the original image array
-#   for each pixel in visited, set its color to green in the copied array
-#   for each pixel in path, set its color to red in the copied array
+#   copy the original image array, unless painting in place
+#   set all visited pixels to green in one indexed assignment
+#   set all path pixels to red in one indexed assignment
 #   create a new image from the modified array and save it
-def create_image(path, visited, image_array, new_image):
-    modified_array = image_array.copy()
-    for pixel in visited:
-        x, y = pixel
-        modified_array[x][y][0] = 0
-        modified_array[x][y][1] = 255
-        modified_array[x][y][2] = 0
-
-    for pixel in path:
-        x, y = pixel
-        modified_array[x][y][0] = 255
-        modified_array[x][y][1] = 0
-        modified_array[x][y][2] = 0
+def create_image(path, visited, image_array, new_image, in_place=False):
+    modified_array = image_array if in_place else image_array.copy()
+
+    visited_mask = getattr(visited, "mask", visited)
+    if isinstance(visited_mask, np.ndarray) and visited_mask.dtype == np.bool_:
+        modified_array[visited_mask] = (0, 255, 0)
+    elif len(visited):
+        modified_array[pixel_indices(visited)] = (0, 255, 0)
+
+    if len(path):
+        modified_array[pixel_indices(path)] = (255, 0, 0)
 
     new_img = Image.fromarray(modified_array)
     new_img.save(new_image)
 
 
-# get user inputs
-img_path = input("Enter the input image name: ")
-s_r = int(input("Enter the start pixel's row: "))
-s_c = int(input("Enter the start pixel's column: "))
-t_r = int(input("Enter the goal pixel's row: "))
-t_c = int(input("Enter the goal pixel's column: "))
-breadth_img_path = input("Enter the breadth first output image name: ")
-best_img_path = input("Enter the best first/A* output image name: ")
+# function: pixel_indices
+# inputs:
+#   pixels: iterable of (x, y) tuples (list, dictionary keys, ...)
+# output:
+#   (rows, cols): index arrays for NumPy fancy indexing
+# pseudocode:
+#   flatten the tuples straight into one integer array, split into rows and cols
+def pixel_indices(pixels):
+    flat = np.fromiter(chain.from_iterable(pixels), dtype=np.intp, count=2 * len(pixels))
+    return flat[0::2], flat[1::2]
+
+
+if __name__ == "__main__":
+    # get user inputs
+    img_path = input("Enter the input image name: ")
+    s_r = int(input("Enter the start pixel's row: "))
+    s_c = int(input("Enter the start pixel's column: "))
+    t_r = int(input("Enter the goal pixel's row: "))
+    t_c = int(input("Enter the goal pixel's column: "))
+    breadth_img_path = input("Enter the breadth first output image name: ")
+    best_img_path = input("Enter the best first/A* output image name: ")
 
-# convert image to usable format
-img = Image.open(img_path)
-img = img.convert('RGB')
-pixel_array = np.array(img)
+    # load the preprocessed mask (built on the first run for this image)
+    maze = Maze.from_cache(img_path)
 
-# call searches and create images
-path_breadth, visited_breadth = breath_first_search(pixel_array, (s_r,s_c),(t_r,t_c))
-create_image(path_breadth, visited_breadth, pixel_array, breadth_img_path)
+    # call searches
+    path_breadth, visited_breadth = maze.solve((s_r,s_c),(t_r,t_c), "bfs")
+    path_best, visited_best = maze.solve((s_r,s_c),(t_r,t_c), "astar")
 
-path_best, visited_best = best_first_search(pixel_array, (s_r,s_c),(t_r,t_c))
-create_image(path_best, visited_best, pixel_array, best_img_path)
+    # decode pixels only for drawing and create images
+    with Image.open(img_path) as img:
+        pixel_array = np.array(img.convert('RGB'))
+    create_image(path_breadth, visited_breadth, pixel_array, breadth_img_path)
+    # last image drawn, so the loaded pixels can be painted over
+    create_image(path_best, visited_best, pixel_array, best_img_path, in_place=True)
 
-# output results
-print("The shortest path from s to t has length", len(path_best) - 1)
\ No newline at end of file
+    # output results
+    print("The shortest path from s to t has length", len(path_best) - 1)
\ No newline at end of file
@@ -0,0 +1,186 @@
+import hashlib
+from PIL import Image
+import numpy as np
+from components import label_components
+from dead_ends import prune_dead_ends
+from jump_point import jump_point_search
+from maze_cache import load_maze_cache
+from search import best_first_search, breath_first_search, passability_mask
+
+# search functions a Maze can run by name; each takes (image, start, goal,
+# mask=..., **options) and returns (path, visited)
+ALGORITHMS = {
+    "bfs": breath_first_search,
+    "astar": best_first_search,
+    "jps": jump_point_search,
+}
+
+
+# class: Maze
+# one decoded maze image with its passability mask built once, so many
+# start/goal queries can be answered without re-reading or re-thresholding
+# the pixels
+class Maze:
+
+    # function: __init__
+    # inputs:
+    #   pixels: 3D array of RGB pixels (optional if mask is given)
+    #   mask: precomputed 2D boolean passability mask (optional)
+    # output: none
+    # relationships:
+    #   pixels are kept for drawing output images, searches only use mask
+    # pseudocode:
+    #   store pixels, build mask from pixels if it was not given
+    #   component labels are built on first use (see components)
+    def __init__(self, pixels=None, mask=None):
+        self.pixels = pixels
+        self.mask = passability_mask(pixels) if mask is None else mask
+        self.height, self.width = self.mask.shape
+        self.labels = None
+        self.content_digest = None
+        self.pruned = None
+
+    # function: components
+    # inputs: none
+    # output:
+    #   labels: 2D int32 component labels from label_components, 0 on walls
+    # relationships:
+    #   computed once per maze and cached
+    # pseudocode:
+    #   if labels are not cached, label the mask
+    #   return labels
+    def components(self):
+        if self.labels is None:
+            self.labels = label_components(self.mask)
+        return self.labels
+
+    # function: dead_ends
+    # inputs: none
+    # output:
+    #   DeadEnds: the mask with dead ends filled, from prune_dead_ends
+    # relationships:
+    #   computed once per maze and cached, so every pruned query shares it
+    def dead_ends(self):
+        if self.pruned is None:
+            self.pruned = prune_dead_ends(self.mask, mask=self.mask)
+        return self.pruned
+
+    # function: digest
+    # inputs: none
+    # output:
+    #   digest: SHA-256 hex digest of the mask's shape and passable pixels
+    # relationships:
+    #   computed once per maze and cached; mazes with the same passable
+    #   pixels share a digest whatever image they were decoded from
+    def digest(self):
+        if self.content_digest is None:
+            content = hashlib.sha256(np.array(self.mask.shape, dtype=np.int64).tobytes())
+            content.update(np.packbits(np.asarray(self.mask, dtype=bool)).tobytes())
+            self.content_digest = content.hexdigest()
+        return self.content_digest
+
+    # function: reachable
+    # inputs:
+    #   start: (x, y) tuple representing starting pixel
+    #   goal: (x, y) tuple representing goal pixel
+    # output:
+    #   boolean: True if a search from start can reach goal
+    # relationships:
+    #   matches the searches: every step must land on a passable pixel, but
+    #   start itself may be a wall, in which case one of its passable
+    #   neighbors has to share goal's component
+    # pseudocode:
+    #   if start == goal, return True
+    #   if goal is a wall, return False
+    #   if start is passable, compare the labels of start and goal
+    #   otherwise compare goal's label with those of start's neighbors
+    def reachable(self, start, goal):
+        if start == goal:
+            return True
+        labels = self.components()
+        goal_label = labels[goal]
+        if goal_label == 0:
+            return False
+        if labels[start]:
+            return labels[start] == goal_label
+        row, col = start
+        for r, c in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)):
+            if 0 <= r < self.height and 0 <= c < self.width and labels[r, c] == goal_label:
+                return True
+        return False
+
+    # function: from_file
+    # inputs:
+    #   path: filename of the maze image
+    # output:
+    #   maze: Maze built from the image
+    # pseudocode:
+    #   open image, convert to RGB, build Maze from its pixel array
+    @classmethod
+    def from_file(cls, path):
+        with Image.open(path) as img:
+            pixels = np.array(img.convert('RGB'))
+        return cls(pixels)
+
+    # function: from_cache
+    # inputs:
+    #   path: filename of the maze image
+    #   labels: also cache component labels (optional)
+    # output:
+    #   maze: Maze built from the image's cache, without pixels
+    # relationships:
+    #   load_maze_cache builds <path>.mazecache on first use and whenever the
+    #   image changes; later runs memory map it instead of decoding the image
+    # pseudocode:
+    #   load (or build) the cache, unpack the grid into the mask
+    #   reuse cached labels so reachable does not relabel the maze
+    @classmethod
+    def from_cache(cls, path, labels=True):
+        grid, component_labels = load_maze_cache(path, labels)
+        maze = cls(mask=grid.unpack())
+        maze.labels = component_labels
+        return maze
+
+    # function: solve
+    # inputs:
+    #   start: (x, y) tuple representing starting pixel
+    #   goal: (x, y) tuple representing goal pixel
+    #   algorithm: name of the search in ALGORITHMS
+    #   prune: search only the maze's core, with dead ends filled (optional)
+    #   options: extra keyword arguments for the search (engine, stats, ...)
+    # output:
+    #   path: list of (x, y) tuples representing path from start to goal
+    #   visited: visited pixels as returned by the search
+    # relationships:
+    #   queries that cannot succeed (goal on a wall, or in another component)
+    #   return ([], {}) straight away instead of flooding start's component
+    #   with prune, paths have the same length but visited only covers the
+    #   core search (see DeadEnds.solve)
+    # pseudocode:
+    #   if goal is not reachable from start, return no path
+    #   look up algorithm and run it on the shared mask, or on the core
+    def solve(self, start, goal, algorithm="bfs", prune=False, **options):
+        if not self.reachable(start, goal):
+            return [], {}
+        search = ALGORITHMS[algorithm]
+        if prune:
+            return self.dead_ends().solve(start, goal, search, **options)
+        return search(self.mask, start, goal, mask=self.mask, **options)
+
+    # function: solve_many
+    # inputs:
+    #   pairs: iterable of (start, goal) tuples
+    #   algorithm: name of the search in ALGORITHMS
+    #   options: extra keyword arguments for the search
+    # output:
+    #   generator of (start, goal, path, visited) tuples, one per pair, in order
+    # relationships:
+    #   results are produced one at a time as pairs are read, so a long or
+    #   endless stream of queries never holds more than one result
+    # pseudocode:
+    #   for each (start, goal) in pairs:
+    #       yield start, goal and the result of solve
+    def solve_many(self, pairs, algorithm="bfs", **options):
+        for start, goal in pairs:
+            path, visited = self.solve(start, goal, algorithm, **options)
+            yield start, goal, path, visited
@@ -0,0 +1,231 @@
+import hashlib
+import os
+import struct
+import tempfile
+import numpy as np
+from PIL import Image
+from components import label_components
+from packed_grid import PackedGrid
+from tiled_loader import pack_image_rows
+
+# Preprocessed maze cache stored next to the image as <image>.mazecache. It
+# holds the bit-packed passability grid, optionally the component labels,
+# and the size, modification time and SHA-256 digest of the image it was
+# built from. Loading memory maps the file, so nothing is decoded or copied.
+#
+# file layout:
+#   header    CACHE_HEADER, padded to CACHE_ALIGN bytes
+#   rows      height * ceil(width / 8) bytes of packed passability bits
+#   labels    height * width int32 component labels (if FLAG_LABELS),
+#             starting at the next multiple of CACHE_ALIGN
+
+CACHE_MAGIC = b"MAZECACH"
+CACHE_VERSION = 1
+CACHE_SUFFIX = ".mazecache"
+CACHE_ALIGN = 64
+CACHE_HEADER = struct.Struct("<8sIIQQQq32s")
+FLAG_LABELS = 1
+
+
+# function: cache_path
+# inputs:
+#   image_path: maze image filename
+# output:
+#   filename of the cache for that image
+def cache_path(image_path):
+    return os.fspath(image_path) + CACHE_SUFFIX
+
+
+# function: file_digest
+# inputs:
+#   path: filename
+# output:
+#   32 byte SHA-256 digest of the file contents
+# pseudocode:
+#   hash the file in 1 MB chunks so large images are not read into memory
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as source:
+        for chunk in iter(lambda: source.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+
+# function: align
+# inputs:
+#   offset: byte offset
+# output:
+#   offset rounded up to a multiple of CACHE_ALIGN
+def align(offset):
+    return -(-offset // CACHE_ALIGN) * CACHE_ALIGN
+
+
+# function: load_maze_cache
+# inputs:
+#   image_path: maze image filename
+#   labels: also cache component labels (optional)
+# output:
+#   grid: PackedGrid memory mapped from the cache
+#   component_labels: memory mapped 2D int32 labels, or None if not requested
+# relationships:
+#   used by Maze.from_cache
+#   the cache is rebuilt whenever the image contents change, or labels are
+#   requested and the cache was built without them
+# pseudocode:
+#   read the cache header if the file exists
+#   if size and modification time match the image, trust the cache
+#   otherwise hash the image and trust the cache only if the digest matches,
+#   recording the new modification time so the next load skips the hash
+#   if the cache is missing, truncated, stale or lacks labels, rebuild it
+#   memory map the rows (and labels) from the file
+def load_maze_cache(image_path, labels=False):
+    path = cache_path(image_path)
+    header = read_cache_header(path)
+    status = os.stat(image_path)
+    if header is None or not cache_matches(header, status, image_path) or \
+            (labels and not header["flags"] & FLAG_LABELS):
+        write_maze_cache(image_path, labels)
+        header = read_cache_header(path)
+    elif header["mtime"] != status.st_mtime_ns:
+        header["mtime"] = status.st_mtime_ns
+        write_cache_header(path, header)
+
+    height, width = header["height"], header["width"]
+    row_bytes = (width + 7) // 8
+    rows_offset = align(CACHE_HEADER.size)
+    bits = np.memmap(path, dtype=np.uint8, mode="r", offset=rows_offset, shape=(height, row_bytes))
+    component_labels = None
+    if labels:
+        component_labels = np.memmap(path, dtype=np.int32, mode="r",
+                                     offset=align(rows_offset + height * row_bytes),
+                                     shape=(height, width))
+    return PackedGrid(bits, width), component_labels
+
+
+# function: read_cache_header
+# inputs:
+#   path: cache filename
+# output:
+#   header: dictionary of header fields, or None if the file is missing,
+#           not a cache of this version or shorter than its header implies
+def read_cache_header(path):
+    try:
+        with open(path, "rb") as source:
+            data = source.read(CACHE_HEADER.size)
+            file_size = os.fstat(source.fileno()).st_size
+    except FileNotFoundError:
+        return None
+    if len(data) < CACHE_HEADER.size:
+        return None
+    magic, version, flags, height, width, size, mtime, digest = CACHE_HEADER.unpack(data)
+    if magic != CACHE_MAGIC or version != CACHE_VERSION:
+        return None
+    header = {"flags": flags, "height": height, "width": width,
+              "size": size, "mtime": mtime, "digest": digest}
+    if file_size < cache_size(header):
+        return None
+    return header
+
+
+# function: cache_size
+# inputs:
+#   header: dictionary of header fields
+# output:
+#   number of bytes a complete cache file with that header has
+def cache_size(header):
+    height, width = header["height"], header["width"]
+    labels_offset = align(align(CACHE_HEADER.size) + height * ((width + 7) // 8))
+    if header["flags"] & FLAG_LABELS:
+        return labels_offset + height * width * 4
+    return labels_offset
+
+
+# function: write_cache_header
+# inputs:
+#   path: cache filename
+#   header: dictionary of header fields, like read_cache_header returns
+# output: none
+# pseudocode:
+#   overwrite the header in place, leaving the rows and labels untouched
+def write_cache_header(path, header):
+    with open(path, "r+b") as out:
+        out.write(CACHE_HEADER.pack(CACHE_MAGIC, CACHE_VERSION, header["flags"], header["height"],
+                                    header["width"], header["size"], header["mtime"],
+                                    header["digest"]))
+
+
+# function: cache_matches
+# inputs:
+#   header: cache header from read_cache_header
+#   status: os.stat result of the image
+#   image_path: maze image filename
+# output:
+#   boolean: True if the cache was built from the current image contents
+# pseudocode:
+#   same size and modification time: unchanged, skip hashing
+#   different size: changed
+#   otherwise compare the content digest (image touched or copied)
+def cache_matches(header, status, image_path):
+    if status.st_size != header["size"]:
+        return False
+    if status.st_mtime_ns == header["mtime"]:
+        return True
+    return file_digest(image_path) == header["digest"]
+
+
+# function: write_maze_cache
+# inputs:
+#   image_path: maze image filename
+#   labels: also store component labels (optional)
+#   tile_rows: number of image rows packed at once
+# output: none
+# relationships:
+#   rows are packed with pack_image_rows, so uncompressed images are
+#   streamed from disk; labels need the unpacked mask in memory
+# pseudocode:
+#   write header and size a new temporary file next to the cache, unique so
+#   concurrent writers do not share it
+#   pack image rows into the mapped row area
+#   if labels requested, label the unpacked grid and store the labels
+#   rename over the old cache, so readers never see a partial file
+#   remove the temporary file if anything fails
+def write_maze_cache(image_path, labels=False, tile_rows=1024):
+    path = cache_path(image_path)
+    status = os.stat(image_path)
+    digest = file_digest(image_path)
+    handle, partial = tempfile.mkstemp(suffix=".partial", prefix=os.path.basename(path) + ".",
+                                       dir=os.path.dirname(path) or ".")
+    try:
+        # mkstemp creates the file readable by its owner only, give the
+        # cache the read permissions of the image instead
+        os.chmod(partial, status.st_mode & 0o666)
+        with Image.open(image_path) as image:
+            width, height = image.size
+            row_bytes = (width + 7) // 8
+            rows_offset = align(CACHE_HEADER.size)
+            labels_offset = align(rows_offset + height * row_bytes)
+            flags = FLAG_LABELS if labels else 0
+            with os.fdopen(handle, "wb") as out:
+                handle = None
+                out.write(CACHE_HEADER.pack(CACHE_MAGIC, CACHE_VERSION, flags, height, width,
+                                            status.st_size, status.st_mtime_ns, digest))
+                out.truncate(labels_offset + height * width * 4 if labels else labels_offset)
+
+            bits = np.memmap(partial, dtype=np.uint8, mode="r+", offset=rows_offset,
+                             shape=(height, row_bytes))
+            pack_image_rows(image, image_path, bits, tile_rows)
+            bits.flush()
+
+        if labels:
+            out_labels = np.memmap(partial, dtype=np.int32, mode="r+", offset=labels_offset,
+                                   shape=(height, width))
+            out_labels[:] = label_components(PackedGrid(bits, width).unpack())
+            out_labels.flush()
+            del out_labels
+        del bits
+        os.replace(partial, path)
+    except BaseException:
+        if handle is not None:
+            os.close(handle)
+        os.unlink(partial)
+        raise
@@ -0,0 +1,124 @@
+import struct
+import numpy as np
+
+# Bit-packed passability grids. One bit per pixel (1 = passable), rows padded
+# to whole bytes, most significant bit first (np.packbits order). On disk a
+# grid is a small header followed by the packed rows, so it can be opened
+# with np.memmap and searched without ever being unpacked.
+#
+# file layout:
+#   magic     8 bytes   b"MAZEBITS"
+#   version   uint32
+#   reserved  uint32
+#   height    uint64
+#   width     uint64
+#   rows      height * ceil(width / 8) bytes
+
+PACKED_MAGIC = b"MAZEBITS"
+PACKED_VERSION = 1
+PACKED_HEADER = struct.Struct("<8sIIQQ")
+
+
+# class: PackedGrid
+# passability grid stored as packed bits; supports the flat row * width + col
+# lookup that unified_search uses, so it can be passed anywhere a mask is
+class PackedGrid:
+
+    # function: __init__
+    # inputs:
+    #   bits: 2D uint8 array (height, ceil(width / 8)) of packed rows, may be
+    #         an np.memmap
+    #   width: number of columns in the grid
+    # output: none
+    # pseudocode:
+    #   store bits and dimensions, keep a flat byte view for fast lookups
+    def __init__(self, bits, width):
+        self.bits = bits
+        self.height = bits.shape[0]
+        self.width = width
+        self.shape = (self.height, width)
+        self.row_bytes = bits.shape[1]
+        self.view = memoryview(np.ascontiguousarray(bits)).cast('B')
+
+    # function: pack
+    # inputs:
+    #   mask: 2D boolean passability mask
+    # output:
+    #   grid: PackedGrid holding the same pixels in memory
+    @classmethod
+    def pack(cls, mask):
+        return cls(np.packbits(mask, axis=1), mask.shape[1])
+
+    # function: __getitem__
+    # inputs:
+    #   index: flat index row * width + col
+    # output:
+    #   1 if the pixel is passable, else 0
+    # pseudocode:
+    #   split index into row and col, read the byte holding col, shift out its bit
+    def __getitem__(self, index):
+        row, col = divmod(index, self.width)
+        return (self.view[row * self.row_bytes + (col >> 3)] >> (7 - (col & 7))) & 1
+
+    def __len__(self):
+        return self.height * self.width
+
+    # function: unpack
+    # inputs:
+    #   start_row, stop_row: rows to unpack (optional, default all)
+    # output:
+    #   2D boolean mask of those rows
+    # relationships:
+    #   lets vectorized code work on the grid a band of rows at a time
+    def unpack(self, start_row=0, stop_row=None):
+        rows = self.bits[start_row:stop_row]
+        return np.unpackbits(rows, axis=1, count=self.width).astype(np.bool_)
+
+
+# function: create_packed_file
+# inputs:
+#   path: filename to write
+#   height, width: grid dimensions
+# output:
+#   bits: writable np.memmap of the packed rows, initially all walls
+# relationships:
+#   lets loaders fill a grid on disk one strip at a time
+# pseudocode:
+#   write the header, then map the row area for writing
+def create_packed_file(path, height, width):
+    row_bytes = (width + 7) // 8
+    with open(path, "wb") as out:
+        out.write(PACKED_HEADER.pack(PACKED_MAGIC, PACKED_VERSION, 0, height, width))
+        out.truncate(PACKED_HEADER.size + height * row_bytes)
+    return np.memmap(path, dtype=np.uint8, mode="r+", offset=PACKED_HEADER.size,
+                     shape=(height, row_bytes))
+
+
+# function: open_packed_file
+# inputs:
+#   path: filename written by create_packed_file or save_packed_file
+# output:
+#   grid: PackedGrid over a read-only memory map of the file
+# pseudocode:
+#   read and check the header, map the rows without reading them
+def open_packed_file(path):
+    with open(path, "rb") as source:
+        header = source.read(PACKED_HEADER.size)
+    magic, version, _, height, width = PACKED_HEADER.unpack(header)
+    if magic != PACKED_MAGIC or version != PACKED_VERSION:
+        raise ValueError("%s is not a packed maze grid" % (path,))
+    bits = np.memmap(path, dtype=np.uint8, mode="r", offset=PACKED_HEADER.size,
+                     shape=(height, (width + 7) // 8))
+    return PackedGrid(bits, width)
+
+
+# function: save_packed_file
+# inputs:
+#   path: filename to write
+#   mask: 2D boolean passability mask
+# output: none
+def save_packed_file(path, mask):
+    height, width = mask.shape
+    bits = create_packed_file(path, height, width)
+    bits[:] = np.packbits(mask, axis=1)
+    bits.flush()
@@ -0,0 +1,131 @@
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from frontier_search import DIRECTIONS, pad_mask
+from search import passability_mask
+
+# Breadth first distances over row bands on a pool of threads. The padded
+# grid (see frontier_search) is split into horizontal bands and each band
+# keeps its own frontier. Every BFS level, each band with work expands its
+# frontier with vectorized NumPy steps, which release the GIL on large
+# arrays, so bands run on separate cores. A band only ever writes its own
+# rows; steps that cross into a neighboring band are handed over and
+# claimed by that band at the start of the next level.
+
+# levels with fewer frontier cells than this in total are expanded on the
+# calling thread, where handing bands to the pool would cost more than it saves
+PARALLEL_FRONTIER = 4096
+
+
+# function: parallel_distances
+# inputs:
+#   image: 2D array of pixels
+#   source: (x, y) tuple to measure distances from
+#   mask: precomputed passability mask of image (optional)
+#   threads: number of worker threads
+#   bands: number of row bands (optional, defaults to 2 * threads)
+# output:
+#   distance: 2D int32 array, BFS steps from source, -1 on walls and
+#             unreachable pixels (every pixel when source is a wall)
+# relationships:
+#   same distances as distance_field(image, source).distance and so the same
+#   path lengths as breath_first_search
+# pseudocode:
+#   pad the mask, split the padded rows into bands
+#   source's band starts with frontier [source]
+#   for each level until no band has a frontier or cells handed to it:
+#       run expand_band for every such band (on the pool if the level is big)
+#       collect each band's new frontier and the cells it hands up and down
+#   return the distances without the padding
+def parallel_distances(image, source, mask=None, threads=4, bands=None):
+    if mask is None:
+        mask = passability_mask(image)
+    height, width = mask.shape
+    open_cells, padded_width = pad_mask(mask)
+    offsets = [dr * padded_width + dc for dr, dc in DIRECTIONS]
+    distance = np.full(open_cells.size, -1, dtype=np.int32)
+
+    rows = height + 2
+    bands = min(bands or 2 * threads, rows)
+    limits = [rows * band // bands * padded_width for band in range(bands + 1)]
+    source_index = (source[0] + 1) * padded_width + source[1] + 1
+    frontiers = [np.empty(0, dtype=np.intp) for _ in range(bands)]
+    handed = [[] for _ in range(bands)]
+    if open_cells[source_index]:
+        open_cells[source_index] = False
+        distance[source_index] = 0
+        band = np.searchsorted(limits, source_index, side="right") - 1
+        frontiers[band] = np.array([source_index], dtype=np.intp)
+
+    def expand(band):
+        return expand_band(open_cells, distance, offsets, limits[band], limits[band + 1],
+                           frontiers[band], handed[band], level)
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        level = 1
+        while True:
+            active = [band for band in range(bands) if len(frontiers[band]) or handed[band]]
+            if not active:
+                break
+            work = sum(len(frontiers[band]) for band in active)
+            if threads > 1 and work >= PARALLEL_FRONTIER:
+                results = list(pool.map(expand, active))
+            else:
+                results = [expand(band) for band in active]
+
+            handed = [[] for _ in range(bands)]
+            for band, (frontier, up, down) in zip(active, results):
+                frontiers[band] = frontier
+                if len(up):
+                    handed[band - 1].append(up)
+                if len(down):
+                    handed[band + 1].append(down)
+            level += 1
+
+    return distance.reshape(rows, padded_width)[1:-1, 1:-1].copy()
+
+
+# function: expand_band
+# inputs:
+#   open_cells: flat padded passability mask, cleared as cells are claimed
+#   distance: flat int32 distance array
+#   offsets: flat offset for each step in DIRECTIONS
+#   lo, hi: the band's padded flat index range [lo, hi)
+#   frontier: the band's cells at distance level - 1
+#   handed: arrays of cells neighboring bands reached at distance level - 1
+#   level: distance of the cells this expansion reaches
+# output:
+#   (new frontier, cells handed to the band above, cells handed below)
+# relationships:
+#   reads and writes open_cells and distance only inside [lo, hi), so bands
+#   can run at the same time
+# pseudocode:
+#   claim the still open handed cells at level - 1, add them to frontier
+#   for each direction:
+#       candidates = frontier + offset
+#       set aside candidates outside the band for the neighbor
+#       keep open candidates, close them
+#   record level for every kept candidate
+def expand_band(open_cells, distance, offsets, lo, hi, frontier, handed, level):
+    for cells in handed:
+        cells = cells[open_cells[cells]]
+        open_cells[cells] = False
+        distance[cells] = level - 1
+        frontier = np.concatenate((frontier, cells))
+
+    found, up, down = [], [], []
+    for offset in offsets:
+        candidates = frontier + offset
+        if offset < 0:
+            outside = candidates < lo
+            up.append(candidates[outside])
+        else:
+            outside = candidates >= hi
+            down.append(candidates[outside])
+        candidates = candidates[~outside]
+        candidates = candidates[open_cells[candidates]]
+        open_cells[candidates] = False
+        found.append(candidates)
+
+    found = np.concatenate(found)
+    distance[found] = level
+    return found, np.concatenate(up), np.concatenate(down)
@@ -0,0 +1,166 @@
+from collections import OrderedDict
+
+# rough bytes held per cached path pixel: its tuple, its list slot and its
+# entry in the pixel index
+PIXEL_BYTES = 160
+
+
+# class: PathCache
+# least recently used cache of search results in front of Maze.solve, keyed
+# by (maze digest, algorithm, options, start, goal) and holding at most
+# budget bytes of paths
+#
+# A subpath of a shortest path is itself a shortest path, and on the 4-way
+# grid a reversed path is a path. So a query whose start and goal both lie
+# on a cached shortest path (in either order) is answered by slicing it,
+# without searching. Results of searches that are not guaranteed shortest
+# (weight above 1) are only reused for the exact same query.
+class PathCache:
+
+    # function: __init__
+    # inputs:
+    #   budget: most bytes of paths to keep, estimated with PIXEL_BYTES
+    # output: none
+    def __init__(self, budget=64 * 2 ** 20):
+        self.budget = budget
+        self.nbytes = 0
+        self.paths = OrderedDict()
+        self.index = {}
+        self.counters = {"hits": 0, "reversed": 0, "subpaths": 0, "misses": 0, "evictions": 0}
+
+    # function: path
+    # inputs:
+    #   maze: Maze
+    #   start: (x, y) tuple representing starting pixel
+    #   goal: (x, y) tuple representing goal pixel
+    #   algorithm: name of the search in ALGORITHMS
+    #   options: extra keyword arguments for the search (engine, weight, ...)
+    # output:
+    #   path: list of (x, y) tuples representing path from start to goal
+    # relationships:
+    #   a stats dictionary in options bypasses the cache, since a cached
+    #   answer would leave it empty
+    # pseudocode:
+    #   if the exact query is cached, mark it most recently used, return it
+    #   look for a cached shortest path through both start and goal
+    #       if found, return the slice between them (reversed if needed)
+    #   otherwise run Maze.solve and store its path
+    def path(self, maze, start, goal, algorithm="bfs", **options):
+        if "stats" in options:
+            path, _ = maze.solve(start, goal, algorithm, **options)
+            return path
+        group = (maze.digest(), algorithm, tuple(sorted(options.items())))
+        key = group + (start, goal)
+
+        found = self.paths.get(key)
+        if found is not None:
+            self.paths.move_to_end(key)
+            self.counters["hits"] += 1
+            return list(found)
+
+        found = self.slice(maze, group, start, goal)
+        if found is not None:
+            return found
+
+        self.counters["misses"] += 1
+        path, _ = maze.solve(start, goal, algorithm, **options)
+        self.store(key, path, options.get("weight", 1) == 1)
+        return path
+
+    # function: slice
+    # inputs:
+    #   maze: Maze the query is on
+    #   group: (digest, algorithm, options) part of the key
+    #   start, goal: query pixels
+    # output:
+    #   path from start to goal cut from a cached shortest path, or None
+    # relationships:
+    #   the first pixel of a cached path may be a wall (searches may start on
+    #   one), so it is never used as a goal: searches return no path to walls
+    # pseudocode:
+    #   look up the cached paths through start and through goal
+    #   for a path through both, at positions i and j:
+    #       i <= j: return path[i..j]
+    #       i > j: return path[j..i] reversed, unless j is a wall start
+    def slice(self, maze, group, start, goal):
+        pixels = self.index.get(group)
+        if pixels is None or start not in pixels or goal not in pixels:
+            return None
+        starts, goals = pixels[start], pixels[goal]
+        for key in (starts if len(starts) <= len(goals) else goals):
+            if key not in starts or key not in goals:
+                continue
+            i, j = starts[key], goals[key]
+            path = self.paths[key]
+            if i <= j:
+                self.counters["subpaths"] += 1
+            elif j > 0 or maze.mask[path[0]]:
+                self.counters["reversed"] += 1
+                i, j = j, i
+            else:
+                continue
+            self.paths.move_to_end(key)
+            found = list(path[i:j + 1])
+            if found[0] != start:
+                found.reverse()
+            return found
+        return None
+
+    # function: store
+    # inputs:
+    #   key: full cache key
+    #   path: search result
+    #   shortest: whether path is a shortest path (so slices can be reused)
+    # output: none
+    # pseudocode:
+    #   store path (a path larger than budget is not stored)
+    #   if shortest, index each of its pixels with its position
+    #   evict least recently used paths until within budget
+    def store(self, key, path, shortest):
+        size = max(len(path), 1) * PIXEL_BYTES
+        if size > self.budget:
+            return
+        self.paths[key] = tuple(path)
+        self.nbytes += size
+        if shortest and path:
+            pixels = self.index.setdefault(key[:3], {})
+            for position, pixel in enumerate(path):
+                pixels.setdefault(pixel, {})[key] = position
+        while self.nbytes > self.budget:
+            self.evict()
+
+    # function: evict
+    # inputs: none
+    # output: none
+    # pseudocode:
+    #   remove the least recently used path and its index entries
+    def evict(self):
+        key, path = self.paths.popitem(last=False)
+        self.nbytes -= max(len(path), 1) * PIXEL_BYTES
+        self.counters["evictions"] += 1
+        pixels = self.index.get(key[:3])
+        if pixels is None:
+            return
+        for pixel in path:
+            entries = pixels.get(pixel)
+            if entries is not None:
+                entries.pop(key, None)
+                if not entries:
+                    del pixels[pixel]
+        if not pixels:
+            del self.index[key[:3]]
+
+    # function: hit_rate
+    # inputs: none
+    # output:
+    #   fraction of queries answered without searching (0 before any query)
+    def hit_rate(self):
+        hits = self.counters["hits"] + self.counters["reversed"] + self.counters["subpaths"]
+        total = hits + self.counters["misses"]
+        return hits / total if total else 0.0
+
+    def __len__(self):
+        return len(self.paths)
+
+    def __contains__(self, key):
+        return key in self.paths
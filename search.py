@@ -1,10 +1,27 @@
+from array import array
+from collections import deque
+from collections.abc import Mapping
+from fractions import Fraction
+from heapq import heappop, heappush
+import numpy as np
+from packed_grid import PackedGrid
+from search_stats import SearchStats
 from search_queue import FIFOQueue, PriorityQueue
 
+# closed buffer value of a vertex that was closed and later reached by a
+# shorter route in a weighted search (see astar_search)
+INCONSISTENT = 2
+
 # function: breath_first_search
 # inputs:
 #   image: 2D array of pixels
 #   start: (x, y) tuple representing starting pixel
 #   goal: (x, y) tuple representing goal pixel
+#   mask: precomputed passability mask of image (optional)
+#   engine: "dict", "array" or "flat" search state (see unified_search), or
+#           "frontier" to expand whole BFS levels at once (see frontier_bfs)
+#   bidirectional: search from both ends at once (see bidirectional_search)
+#   stats: dictionary to record search counters in (optional)
 # pre-conditions:
 #   image is a non-empty 2D array
 #   start and goal are valid pixel coordinates within image
@@ -14,9 +31,17 @@ from search_queue import FIFOQueue, PriorityQueue
 # relationships:
 #   
 # pseudocode:
+#   if bidirectional, bidirectional_search(image, start, goal, FIFOQueue)
+#   if engine is "frontier", frontier_bfs(image, start, goal)
 #   unified_search(image, start, goal, FIFOQueue)
-def breath_first_search(image, start, goal):
-    return unified_search(image, start, goal, FIFOQueue)
+def breath_first_search(image, start, goal, mask=None, engine="dict", bidirectional=False,
+                        stats=None):
+    if bidirectional:
+        return bidirectional_search(image, start, goal, FIFOQueue, mask=mask, stats=stats)
+    if engine == "frontier":
+        from frontier_search import frontier_bfs
+        return frontier_bfs(image, start, goal, mask, stats)
+    return unified_search(image, start, goal, FIFOQueue, mask=mask, engine=engine, stats=stats)
 
 
 # function: best_first_search
@@ -24,18 +49,31 @@ def breath_first_search(image, start, goal):
 #   image: 2D array of pixels
 #   start: (x, y) tuple representing starting pixel
 #   goal: (x, y) tuple representing goal pixel
+#   mask: precomputed passability mask of image (optional)
+#   engine: "dict", "array" or "flat" search state (see unified_search)
+#   bidirectional: search from both ends at once (see bidirectional_search)
+#   stats: dictionary to record search counters in (optional)
+#   weight: heuristic weight w >= 1 for weighted A* (optional, see unified_search)
 # pre-conditions:
 #   image is a non-empty 2D array
 #   start and goal are valid pixel coordinates within image
 # output:
 #   path: list of (x, y) tuples representing path from start to goal
-#   visited: dictionary mapping (x, y) tuples to boolean indicating if pixel was visited
+#   visited: dictionary of the pixels that were expanded (the closed set)
 # relationships:
 #   
 # pseudocode:
-#   unified_search(image, start, goal, PriorityQueue, manhattan_distance)
-def best_first_search(image, start, goal):
-    return unified_search(image, start, goal, PriorityQueue, manhattan_distance)
+#   if bidirectional, bidirectional_search(image, start, goal, PriorityQueue, manhattan_distance)
+#   unified_search(image, start, goal, PriorityQueue, manhattan_distance, close_on_pop=True)
+def best_first_search(image, start, goal, mask=None, engine="dict", bidirectional=False,
+                      stats=None, weight=1):
+    if bidirectional:
+        if weight != 1:
+            raise ValueError("weighted search is not supported bidirectionally")
+        return bidirectional_search(image, start, goal, PriorityQueue, manhattan_distance,
+                                    mask=mask, stats=stats)
+    return unified_search(image, start, goal, PriorityQueue, manhattan_distance,
+                          mask=mask, engine=engine, stats=stats, close_on_pop=True, weight=weight)
 
 
 # function: unified_search
@@ -45,6 +83,23 @@ def best_first_search(image, start, goal):
 #   goal: (x, y) tuple representing goal pixel
 #   queue_type: class of search queue to use (FIFOQueue or PriorityQueue)
 #   heuristic: function to calculate heuristic distance (optional)
+#   mask: precomputed passability mask of image (optional)
+#   engine: how search state is stored
+#       "dict": dictionaries keyed by (x, y) tuples
+#       "array": flat preallocated buffers, see array_search
+#       "flat": padded flat indices with the loop inlined, see flat_search
+#               (FIFOQueue and PriorityQueue only)
+#   stats: dictionary to record search counters in (optional)
+#       expanded: number of vertices popped from the queue
+#       open, closed: queue and closed set sizes at the end (close_on_pop only)
+#       a SearchStats also traces queue, heuristic, neighbor and path work
+#       (dict engine only, see search_stats; the other engines raise TypeError)
+#   close_on_pop: run as A* with separate open and closed sets (see astar_search)
+#       instead of marking vertices visited when they are pushed
+#   weight: weighted A* (close_on_pop only), priority distance + weight * heuristic
+#       paths are at most weight times longer than the shortest path, and
+#       stats["bound"] records the bound proven for this search (<= the
+#       a / b that weight_ratio approximates weight by, see suboptimality_bound)
 # pre-conditions:
 #   image is a non-empty 2D array
 #   start and goal are valid pixel coordinates within image
@@ -54,20 +109,52 @@ def best_first_search(image, start, goal):
 # relationships:
 #   
 # pseudocode:
+#   if engine is "array" or "flat", hand off to array_search or flat_search
+#   build passability mask from image if one was not given
+#   flatten mask so pixel (row, col) is looked up at row * width + col
+#   if stats is a SearchStats, swap in its traced queue, heuristic,
+#   neighbor and path functions
+#   if close_on_pop, hand off to astar_search
 #   initialize queue of type queue_type
 #   initialize visited, distance, prev dictionaries
 #   mark start as visited, set its distance
 #   insert start into queue with priority
 #   while queue not empty and goal not visited:
 #    pop vertex u from queue
-#    for each neighbor v of u:
+#    for each passable neighbor v of u:
 #       if v not visited:
 #          mark v as visited
 #          set distance and prev for v
 #          calculate priority and insert v into queue
 #   reconstruct path from start to goal using prev
 #   return path and visited
-def unified_search(image, start, goal, queue_type, heuristic=None):
+def unified_search(image, start, goal, queue_type, heuristic=None, mask=None, engine="dict",
+                   stats=None, close_on_pop=False, weight=1):
+    if weight != 1 and not close_on_pop:
+        raise ValueError("weighted search needs close_on_pop=True")
+    if engine == "array":
+        return array_search(image, start, goal, queue_type, heuristic, mask, stats, close_on_pop,
+                            weight)
+    if engine == "flat":
+        return flat_search(image, start, goal, queue_type, heuristic, mask, stats, close_on_pop,
+                           weight)
+    if engine != "dict":
+        raise ValueError("unknown search engine: %r" % (engine,))
+
+    if mask is None:
+        mask = passability_mask(image)
+    height, width = mask.shape
+    passable = flat_passable(mask)
+    neighbors, reconstruct = get_mask_neighbors, reconstruct_path
+    if isinstance(stats, SearchStats):
+        queue_type = stats.wrap_queue(queue_type)
+        heuristic = stats.wrap_heuristic(heuristic)
+        neighbors = stats.wrap_neighbors(neighbors)
+        reconstruct = stats.wrap_reconstruct(reconstruct)
+    if close_on_pop:
+        return astar_search(passable, height, width, start, goal, queue_type, heuristic, stats,
+                            neighbors, reconstruct, weight)
+
     queue = queue_type()
     visited = {}
     distance = {}
@@ -77,11 +164,13 @@ def unified_search(image, start, goal, queue_type, heuristic=None):
     visited[start] = True
     distance[start] = heuristic(start, goal) if heuristic else 0
     queue.insert(start, distance[start])
+    expanded = 0
     
     while not queue.is_empty() and goal not in visited:
         u = queue.pop()
+        expanded += 1
         
-        for v in get_neighbors(u, image):
+        for v in neighbors(u, passable, height, width):
             if v not in visited:
                 visited[v] = True
                 distance[v] = distance[u] + 1
@@ -91,7 +180,762 @@ def unified_search(image, start, goal, queue_type, heuristic=None):
                 priority = distance[v] + (heuristic(v, goal) if heuristic else 0)
                 queue.insert(v, priority)
     
-    return reconstruct_path(prev, start, goal), visited
+    if stats is not None:
+        stats["expanded"] = expanded
+    return reconstruct(prev, start, goal), visited
+
+
+# function: astar_search
+# inputs:
+#   passable: flat passability lookup from flat_passable
+#   height, width: image dimensions
+#   start: (x, y) tuple representing starting pixel
+#   goal: (x, y) tuple representing goal pixel
+#   queue_type: class of search queue to use
+#   heuristic: function to calculate heuristic distance (optional)
+#   stats: dictionary to record search counters in (optional)
+#   neighbors: neighbor function (optional, traced by unified_search)
+#   reconstruct: path function (optional, traced by unified_search)
+#   weight: heuristic weight (optional, see unified_search)
+# output:
+#   path: list of (x, y) tuples representing path from start to goal
+#   visited: dictionary of the closed (expanded) pixels
+# relationships:
+#   used by unified_search(close_on_pop=True)
+#   a vertex is closed when it is popped, not when it is pushed, and a shorter
+#   route to a queued vertex re-inserts it (PriorityQueue skips the stale
+#   entry); closed vertices are reopened if a shorter route turns up, so
+#   inconsistent heuristics still give shortest paths
+#   with weight = a / b, priorities are b * distance + a * heuristic, the
+#   same order as distance + weight * heuristic but still integers
+#   weighted searches never reopen (reopening can expand a vertex many times
+#   over); a closed vertex that improves keeps its new distance and is noted
+#   as inconsistent for suboptimality_bound, which keeps the weight bound
+# pseudocode:
+#   distance[start] = 0, insert start with priority heuristic(start)
+#   while queue not empty:
+#    pop vertex u, skip it if already closed
+#    close u, stop if u is goal
+#    for each passable neighbor v of u:
+#       if distance[u] + 1 < distance[v]:
+#          set distance and prev for v, reopen v if closed
+#          insert v with priority distance[v] + heuristic(v)
+#   reconstruct path from start to goal using prev
+def astar_search(passable, height, width, start, goal, queue_type, heuristic=None, stats=None,
+                 neighbors=None, reconstruct=None, weight=1):
+    neighbors = neighbors or get_mask_neighbors
+    reconstruct = reconstruct or reconstruct_path
+    distance_scale, heuristic_scale = weight_ratio(weight)
+    reopen = weight == 1
+    inconsistent = set()
+    queue = queue_type()
+    closed = {}
+    distance = {start: 0}
+    prev = {}
+
+    queue.insert(start, heuristic_scale * heuristic(start, goal) if heuristic else 0)
+    expanded = 0
+
+    while not queue.is_empty():
+        u = queue.pop()
+        if u in closed:
+            continue
+        closed[u] = True
+        expanded += 1
+        if u == goal:
+            break
+
+        new_distance = distance[u] + 1
+        for v in neighbors(u, passable, height, width):
+            if new_distance < distance.get(v, new_distance + 1):
+                distance[v] = new_distance
+                prev[v] = u
+                if v in closed:
+                    if not reopen:
+                        inconsistent.add(v)
+                        continue
+                    del closed[v]
+
+                # Calculate priority
+                priority = distance_scale * new_distance + \
+                    (heuristic_scale * heuristic(v, goal) if heuristic else 0)
+                queue.insert(v, priority)
+
+    if stats is not None:
+        stats["expanded"] = expanded
+        stats["open"] = len(queue)
+        stats["closed"] = len(closed)
+        if weight != 1 and goal in closed:
+            open_costs = (g + heuristic(v, goal) for v, g in distance.items()
+                          if v not in closed or v in inconsistent) if heuristic else ()
+            stats["bound"] = suboptimality_bound(
+                distance[goal], Fraction(heuristic_scale, distance_scale), open_costs)
+    return reconstruct(prev, start, goal), closed
+
+
+# function: array_search
+# inputs:
+#   image: 2D array of pixels
+#   start: (x, y) tuple representing starting pixel
+#   goal: (x, y) tuple representing goal pixel
+#   queue_type: class of search queue to use (FIFOQueue or PriorityQueue)
+#   heuristic: function to calculate heuristic distance (optional)
+#   mask: precomputed passability mask of image (optional)
+#   stats: dictionary to record search counters in (optional)
+#   close_on_pop: run as A* with open and closed sets (see array_astar_search)
+#   weight: heuristic weight (optional, see unified_search)
+# pre-conditions:
+#   image is a non-empty 2D array
+#   start and goal are valid pixel coordinates within image
+# output:
+#   path: list of (x, y) tuples representing path from start to goal
+#   visited: FlatVisited mapping over the visited bitmap
+# relationships:
+#   same search as unified_search, but pixels are flat indices row * width + col
+#   and the state lives in preallocated buffers instead of dictionaries:
+#       visited: bytearray with one byte per pixel
+#       distance: int32 array, -1 where unset
+#       prev: int32 array of predecessor indices, -1 where unset
+#   tuples are only rebuilt at the end, for the path and lazily for visited
+# pseudocode:
+#   allocate visited, distance, prev buffers of size height * width
+#   mark start as visited, set its distance to 0
+#   insert start index into queue with priority
+#   while queue not empty and goal not visited:
+#    pop index u from queue
+#    for each passable neighbor index v of u:
+#       if v not visited:
+#          mark v as visited
+#          set distance and prev for v
+#          calculate priority and insert v into queue
+#   reconstruct path from prev
+#   return path and FlatVisited view of visited
+def array_search(image, start, goal, queue_type, heuristic=None, mask=None, stats=None,
+                 close_on_pop=False, weight=1):
+    reject_tracing(stats, "the array engine")
+    if mask is None:
+        mask = passability_mask(image)
+    height, width = mask.shape
+    passable = flat_passable(mask)
+    if close_on_pop:
+        return array_astar_search(passable, height, width, start, goal, queue_type, heuristic,
+                                  stats, weight)
+
+    size = height * width
+    visited = bytearray(size)
+    distance = array('i', [-1]) * size
+    prev = array('i', [-1]) * size
+
+    start_index = start[0] * width + start[1]
+    goal_index = goal[0] * width + goal[1]
+
+    queue = queue_type()
+    visited[start_index] = 1
+    distance[start_index] = 0
+    queue.insert(start_index, heuristic(start, goal) if heuristic else 0)
+    expanded = 0
+
+    while not queue.is_empty() and not visited[goal_index]:
+        u = queue.pop()
+        expanded += 1
+
+        for v in get_flat_neighbors(u, passable, height, width):
+            if not visited[v]:
+                visited[v] = 1
+                distance[v] = distance[u] + 1
+                prev[v] = u
+
+                # Calculate priority
+                priority = distance[v] + (heuristic(divmod(v, width), goal) if heuristic else 0)
+                queue.insert(v, priority)
+
+    if stats is not None:
+        stats["expanded"] = expanded
+    visited_mask = np.frombuffer(visited, dtype=np.bool_).reshape(height, width)
+    return reconstruct_flat_path(prev, width, start_index, goal_index), FlatVisited(visited_mask)
+
+
+# function: array_astar_search
+# inputs:
+#   passable: flat passability lookup from flat_passable
+#   height, width: image dimensions
+#   start: (x, y) tuple representing starting pixel
+#   goal: (x, y) tuple representing goal pixel
+#   queue_type: class of search queue to use
+#   heuristic: function to calculate heuristic distance (optional)
+#   stats: dictionary to record search counters in (optional)
+# output:
+#   path: list of (x, y) tuples representing path from start to goal
+#   visited: FlatVisited mapping over the closed bitmap
+# relationships:
+#   flat index version of astar_search, used by array_search(close_on_pop=True)
+#   weight: heuristic weight (optional, see unified_search)
+# pseudocode:
+#   same as astar_search with bytearray closed set and int32 distance and prev
+#   (closed indices that improve in a weighted search are marked INCONSISTENT)
+def array_astar_search(passable, height, width, start, goal, queue_type, heuristic=None,
+                       stats=None, weight=1):
+    distance_scale, heuristic_scale = weight_ratio(weight)
+    reopen = weight == 1
+    size = height * width
+    closed = bytearray(size)
+    distance = array('i', [-1]) * size
+    prev = array('i', [-1]) * size
+
+    start_index = start[0] * width + start[1]
+    goal_index = goal[0] * width + goal[1]
+
+    queue = queue_type()
+    distance[start_index] = 0
+    queue.insert(start_index, heuristic_scale * heuristic(start, goal) if heuristic else 0)
+    expanded = 0
+    closed_count = 0
+
+    while not queue.is_empty():
+        u = queue.pop()
+        if closed[u]:
+            continue
+        closed[u] = 1
+        closed_count += 1
+        expanded += 1
+        if u == goal_index:
+            break
+
+        new_distance = distance[u] + 1
+        for v in get_flat_neighbors(u, passable, height, width):
+            if distance[v] < 0 or new_distance < distance[v]:
+                distance[v] = new_distance
+                prev[v] = u
+                if closed[v]:
+                    if not reopen:
+                        closed[v] = INCONSISTENT
+                        continue
+                    closed[v] = 0
+                    closed_count -= 1
+
+                # Calculate priority
+                priority = distance_scale * new_distance + \
+                    (heuristic_scale * heuristic(divmod(v, width), goal) if heuristic else 0)
+                queue.insert(v, priority)
+
+    if stats is not None:
+        stats["expanded"] = expanded
+        stats["open"] = len(queue)
+        stats["closed"] = closed_count
+        if weight != 1 and closed[goal_index]:
+            open_costs = (distance[v] + heuristic(divmod(v, width), goal)
+                          for v in open_indices(distance, closed)) if heuristic else ()
+            stats["bound"] = suboptimality_bound(
+                distance[goal_index], Fraction(heuristic_scale, distance_scale), open_costs)
+    if not reopen:
+        closed = closed.replace(bytes([INCONSISTENT]), b"\x01")
+    closed_mask = np.frombuffer(closed, dtype=np.bool_).reshape(height, width)
+    return reconstruct_flat_path(prev, width, start_index, goal_index), FlatVisited(closed_mask)
+
+
+# function: flat_search
+# inputs:
+#   image: 2D array of pixels
+#   start: (x, y) tuple representing starting pixel
+#   goal: (x, y) tuple representing goal pixel
+#   queue_type: FIFOQueue or PriorityQueue, the queues the engine inlines;
+#       anything else (BucketQueue, a PriorityQueue subclass) raises ValueError
+#   heuristic: function to calculate heuristic distance (optional)
+#   mask: precomputed passability mask of image (optional)
+#   stats: dictionary to record search counters in (optional); a SearchStats
+#       raises TypeError, as there are no queue or neighbor calls to trace
+#   close_on_pop: run as A* with open and closed sets (see flat_astar_search)
+#   weight: heuristic weight (optional, see unified_search)
+# pre-conditions:
+#   image is a non-empty 2D array
+#   start and goal are valid pixel coordinates within image
+# output:
+#   path: list of (x, y) tuples representing path from start to goal
+#   visited: FlatVisited mapping over the visited pixels
+# relationships:
+#   same search as unified_search with the queue and neighbor code inlined:
+#       pixels are flat indices into the mask padded with a wall border
+#       (pad_mask), so the four steps are fixed offsets with no bounds checks
+#       open_cells is a bytearray copy of the padded mask, cleared as pixels
+#       are visited, so one lookup tests both passable and not yet visited
+#       FIFOQueue runs on a deque; PriorityQueue runs on a heap of plain
+#       ints priority * size + index (ties pop in row-major order, like
+#       PriorityQueue)
+#       manhattan_distance is inlined as arithmetic on index // padded_width
+#       and index % padded_width; other heuristics are called as usual
+# pseudocode:
+#   reject queue types and stats the engine cannot honour
+#   if close_on_pop, hand off to flat_astar_search
+#   pad mask, copy it into open_cells, close start
+#   push start
+#   while queue not empty and goal has no predecessor:
+#    pop index u
+#    for each offset d in [up, down, left, right]:
+#       if open_cells[u + d]:
+#          close it, set prev (and distance), push it with its priority
+#   rebuild path from prev, visited = padded passable pixels now closed
+def flat_search(image, start, goal, queue_type, heuristic=None, mask=None, stats=None,
+                close_on_pop=False, weight=1):
+    from frontier_search import pad_mask
+    if queue_type is not FIFOQueue and queue_type is not PriorityQueue:
+        raise ValueError("the flat engine runs FIFOQueue or PriorityQueue, not %s"
+                         % (queue_type.__name__,))
+    reject_tracing(stats, "the flat engine")
+    if mask is None:
+        mask = passability_mask(image)
+    if isinstance(mask, PackedGrid):
+        mask = mask.unpack()
+    height, width = mask.shape
+    padded, padded_width = pad_mask(mask)
+    if close_on_pop:
+        return flat_astar_search(padded, height, width, start, goal, heuristic, stats, weight)
+
+    size = padded.size
+    open_cells = bytearray(padded.tobytes())
+    prev = array('i', [-1]) * size
+    up, down = -padded_width, padded_width
+
+    start_index = (start[0] + 1) * padded_width + start[1] + 1
+    goal_index = (goal[0] + 1) * padded_width + goal[1] + 1
+    goal_row, goal_col = divmod(goal_index, padded_width)
+    open_cells[start_index] = 0
+    expanded = 0
+
+    if queue_type is FIFOQueue:
+        queue = deque([start_index])
+        pop, push = queue.popleft, queue.append
+        while queue and prev[goal_index] < 0 and start_index != goal_index:
+            u = pop()
+            expanded += 1
+            for v in (u + up, u + down, u - 1, u + 1):
+                if open_cells[v]:
+                    open_cells[v] = 0
+                    prev[v] = u
+                    push(v)
+    else:
+        inline = heuristic is manhattan_distance
+        distance = array('i', [0]) * size
+        queue = [start_index]
+        while queue and prev[goal_index] < 0 and start_index != goal_index:
+            u = heappop(queue) % size
+            expanded += 1
+            new_distance = distance[u] + 1
+            for v in (u + up, u + down, u - 1, u + 1):
+                if open_cells[v]:
+                    open_cells[v] = 0
+                    prev[v] = u
+                    distance[v] = new_distance
+                    if inline:
+                        priority = new_distance + abs(v // padded_width - goal_row) \
+                            + abs(v % padded_width - goal_col)
+                    elif heuristic:
+                        priority = new_distance + heuristic(unpad_index(v, padded_width), goal)
+                    else:
+                        priority = new_distance
+                    heappush(queue, priority * size + v)
+
+    if stats is not None:
+        stats["expanded"] = expanded
+    closed = np.frombuffer(open_cells, dtype=np.uint8) == 0
+    return flat_result(padded, closed, prev, padded_width, start_index, goal_index)
+
+
+# function: flat_astar_search
+# inputs:
+#   padded: flat padded passability mask from pad_mask
+#   height, width: image dimensions
+#   start: (x, y) tuple representing starting pixel
+#   goal: (x, y) tuple representing goal pixel
+#   heuristic: function to calculate heuristic distance (optional)
+#   stats: dictionary to record search counters in (optional)
+#   weight: heuristic weight (optional, see unified_search)
+# output:
+#   path: list of (x, y) tuples representing path from start to goal
+#   visited: FlatVisited mapping over the closed pixels
+# relationships:
+#   flat_search version of astar_search, used by flat_search(close_on_pop=True)
+#   a queued index whose distance improved is pushed again; the old entry
+#   has a larger key and is skipped as closed when it surfaces
+# pseudocode:
+#   same as astar_search on padded flat indices with the heap of int keys
+def flat_astar_search(padded, height, width, start, goal, heuristic=None, stats=None, weight=1):
+    distance_scale, heuristic_scale = weight_ratio(weight)
+    reopen = weight == 1
+    padded_width = width + 2
+    size = padded.size
+    passable = padded.tobytes()
+    closed = bytearray(size)
+    distance = array('i', [-1]) * size
+    prev = array('i', [-1]) * size
+    up, down = -padded_width, padded_width
+    inline = heuristic is manhattan_distance
+
+    start_index = (start[0] + 1) * padded_width + start[1] + 1
+    goal_index = (goal[0] + 1) * padded_width + goal[1] + 1
+    goal_row, goal_col = divmod(goal_index, padded_width)
+
+    distance[start_index] = 0
+    queue = [(heuristic_scale * heuristic(start, goal) if heuristic else 0) * size + start_index]
+    expanded = 0
+
+    while queue:
+        u = heappop(queue) % size
+        if closed[u]:
+            continue
+        closed[u] = 1
+        expanded += 1
+        if u == goal_index:
+            break
+
+        new_distance = distance[u] + 1
+        for v in (u + up, u + down, u - 1, u + 1):
+            if passable[v] and (distance[v] < 0 or new_distance < distance[v]):
+                distance[v] = new_distance
+                prev[v] = u
+                if closed[v]:
+                    if not reopen:
+                        closed[v] = INCONSISTENT
+                        continue
+                    closed[v] = 0
+                if inline:
+                    priority = distance_scale * new_distance + heuristic_scale * (
+                        abs(v // padded_width - goal_row) + abs(v % padded_width - goal_col))
+                elif heuristic:
+                    priority = distance_scale * new_distance + \
+                        heuristic_scale * heuristic(unpad_index(v, padded_width), goal)
+                else:
+                    priority = distance_scale * new_distance
+                heappush(queue, priority * size + v)
+
+    if not reopen:
+        closed = closed.replace(bytes([INCONSISTENT]), b"\x01")
+    closed_mask = np.frombuffer(closed, dtype=np.bool_)
+    if stats is not None:
+        stats["expanded"] = expanded
+        stats["open"] = len({key % size for key in queue} - set(np.flatnonzero(closed_mask).tolist()))
+        stats["closed"] = int(np.count_nonzero(closed_mask))
+        if weight != 1 and closed[goal_index]:
+            open_costs = (distance[v] + heuristic(unpad_index(v, padded_width), goal)
+                          for v in open_indices(distance, closed)) if heuristic else ()
+            stats["bound"] = suboptimality_bound(
+                distance[goal_index], Fraction(heuristic_scale, distance_scale), open_costs)
+    return flat_result(padded, closed_mask, prev, padded_width, start_index, goal_index)
+
+
+# function: weight_ratio
+# inputs:
+#   weight: heuristic weight, at least 1
+# output:
+#   (distance_scale, heuristic_scale): small integers b and a with a / b == weight
+#       (to within 1/64), so b * distance + a * heuristic orders vertices like
+#       distance + weight * heuristic while staying an integer for
+#       BucketQueue and the flat engine's int keys
+# pseudocode:
+#   reject weights below 1, approximate weight by a fraction a / b
+def weight_ratio(weight):
+    if weight < 1:
+        raise ValueError("heuristic weight must be at least 1, got %r" % (weight,))
+    ratio = Fraction(weight).limit_denominator(64)
+    return ratio.denominator, ratio.numerator
+
+
+# function: suboptimality_bound
+# inputs:
+#   cost: length of the path a weighted search found
+#   weight: heuristic weight it ran with, the a / b of weight_ratio rather
+#       than the requested weight it approximates
+#   open_costs: distance + heuristic of every vertex still open
+# output:
+#   bound: factor the path is proven to be within of the shortest path
+# relationships:
+#   some open vertex lies on a shortest path with its true distance, so with
+#   an admissible heuristic the smallest open distance + heuristic is a lower
+#   bound on the shortest path; weighted A* also guarantees weight itself
+# pseudocode:
+#   lower = min(cost, smallest open cost)
+#   return min(weight, cost / lower), or 1 for an empty path
+def suboptimality_bound(cost, weight, open_costs):
+    lower = min(open_costs, default=cost)
+    lower = min(lower, cost)
+    if lower <= 0:
+        return 1.0 if cost == 0 else float(weight)
+    return min(float(weight), cost / lower)
+
+
+# function: open_indices
+# inputs:
+#   distance: int32 array, -1 where unset
+#   closed: bytearray, 1 for closed indices, INCONSISTENT for closed indices
+#           whose distance improved after they were closed
+# output:
+#   list of indices that have a distance and are open or inconsistent
+def open_indices(distance, closed):
+    reached = np.frombuffer(distance, dtype=np.int32) >= 0
+    return np.flatnonzero(reached & (np.frombuffer(closed, dtype=np.uint8) != 1)).tolist()
+
+
+# function: unpad_index
+# inputs:
+#   index: flat index into the padded grid
+#   padded_width: width + 2
+# output:
+#   (x, y) tuple of the pixel in the unpadded image
+def unpad_index(index, padded_width):
+    row, col = divmod(index, padded_width)
+    return row - 1, col - 1
+
+
+# function: flat_result
+# inputs:
+#   padded: flat padded passability mask
+#   closed: flat boolean array, True for padded cells the search closed
+#   prev: int32 array of predecessor indices, -1 where unset
+#   padded_width: width + 2
+#   start_index, goal_index: padded flat indices of start and goal
+# output:
+#   path: list of (x, y) tuples representing path from start to goal
+#   visited: FlatVisited mapping over the closed pixels
+# relationships:
+#   shared by flat_search and flat_astar_search
+# pseudocode:
+#   visited = closed cells that are passable, plus start
+#   crop the border, walk prev back from goal and unpad the indices
+def flat_result(padded, closed, prev, padded_width, start_index, goal_index):
+    visited = closed & padded
+    visited[start_index] = True
+    grid = visited.reshape(-1, padded_width)[1:-1, 1:-1]
+
+    if prev[goal_index] < 0 and goal_index != start_index:
+        return [], FlatVisited(grid)
+    indices = []
+    current = goal_index
+    while current != start_index:
+        indices.append(current)
+        current = prev[current]
+    indices.append(start_index)
+    indices.reverse()
+    return [unpad_index(index, padded_width) for index in indices], FlatVisited(grid)
+
+
+# function: bidirectional_search
+# inputs:
+#   image: 2D array of pixels
+#   start: (x, y) tuple representing starting pixel
+#   goal: (x, y) tuple representing goal pixel
+#   queue_type: class of search queue to use (FIFOQueue or PriorityQueue)
+#   heuristic: function to calculate heuristic distance (optional)
+#   mask: precomputed passability mask of image (optional)
+#   stats: dictionary to record search counters in (optional)
+#       expanded: vertices expanded by both searches together
+#       forward_expanded, backward_expanded: the split between them
+# pre-conditions:
+#   image is a non-empty 2D array
+#   start and goal are valid pixel coordinates within image
+# output:
+#   path: list of (x, y) tuples representing a shortest path from start to goal
+#   visited: dictionary of pixels visited by either search
+# relationships:
+#   same result shape as unified_search, searching from start and goal at once
+#   moves only ever enter passable pixels, so the backward search may step
+#   onto start even when start itself is not passable
+# pseudocode:
+#   if start == goal, return [start]
+#   if goal is not passable, nothing can reach it, return []
+#   without a heuristic run bidirectional_bfs, with one run bidirectional_astar
+#   stitch forward prev (start to meeting pixel) with backward prev
+#   (meeting pixel to goal) into one path
+def bidirectional_search(image, start, goal, queue_type, heuristic=None, mask=None, stats=None):
+    reject_tracing(stats, "bidirectional search")
+    if mask is None:
+        mask = passability_mask(image)
+    height, width = mask.shape
+    passable = flat_passable(mask)
+
+    forward = {"prev": {}, "distance": {start: 0}, "expanded": 0}
+    backward = {"prev": {}, "distance": {goal: 0}, "expanded": 0}
+
+    # the backward search may step onto start even when start is a wall
+    start_neighbors = set()
+    if not passable[start[0] * width + start[1]]:
+        start_neighbors.update(get_step_neighbors(start, height, width))
+
+    meet = None
+    if start == goal:
+        meet = start
+    elif passable[goal[0] * width + goal[1]]:
+        if heuristic is None:
+            meet = bidirectional_bfs(passable, height, width, start, start_neighbors,
+                                     forward, backward)
+        else:
+            meet = bidirectional_astar(passable, height, width, start, goal, start_neighbors,
+                                       queue_type, heuristic, forward, backward)
+
+    if stats is not None:
+        stats["forward_expanded"] = forward["expanded"]
+        stats["backward_expanded"] = backward["expanded"]
+        stats["expanded"] = forward["expanded"] + backward["expanded"]
+
+    visited = dict.fromkeys(forward["distance"], True)
+    visited.update(dict.fromkeys(backward["distance"], True))
+    if meet is None:
+        return [], visited
+
+    path = reconstruct_path(forward["prev"], start, meet)
+    back_path = reconstruct_path(backward["prev"], goal, meet)
+    back_path.reverse()
+    return path + back_path[1:], visited
+
+
+# function: bidirectional_bfs
+# inputs:
+#   passable: flat passability lookup from flat_passable
+#   height, width: image dimensions
+#   start: (x, y) tuple representing starting pixel
+#   start_neighbors: pixels next to start, if start is not passable
+#   forward, backward: search state dictionaries (prev, distance, expanded)
+# output:
+#   meet: pixel where the searches met, None if there is no path
+# relationships:
+#   used in bidirectional_search when there is no heuristic
+# pseudocode:
+#   keep one FIFO level per side
+#   while both levels are non-empty:
+#       expand the full level of the side with the smaller level
+#       when a new pixel is already known to the other side, return it
+#   return None
+# notes:
+#   every pixel at distance <= d on one side and <= e on the other was checked
+#   before the current level, so the first meeting found while expanding a
+#   whole level has length d + 1 + e, which is the shortest possible
+def bidirectional_bfs(passable, height, width, start, start_neighbors, forward, backward):
+    forward["level"] = [start]
+    backward["level"] = [next(iter(backward["distance"]))]
+
+    while forward["level"] and backward["level"]:
+        if len(forward["level"]) <= len(backward["level"]):
+            side, other = forward, backward
+        else:
+            side, other = backward, forward
+        distance, prev = side["distance"], side["prev"]
+        other_distance = other["distance"]
+
+        next_level = []
+        for u in side["level"]:
+            side["expanded"] += 1
+            for v in get_mask_neighbors(u, passable, height, width):
+                if v not in distance:
+                    distance[v] = distance[u] + 1
+                    prev[v] = u
+                    if v in other_distance:
+                        return v
+                    next_level.append(v)
+            if side is backward and u in start_neighbors:
+                distance[start] = distance[u] + 1
+                prev[start] = u
+                return start
+        side["level"] = next_level
+
+    return None
+
+
+# function: bidirectional_astar
+# inputs:
+#   passable: flat passability lookup from flat_passable
+#   height, width: image dimensions
+#   start: (x, y) tuple representing starting pixel
+#   goal: (x, y) tuple representing goal pixel
+#   start_neighbors: pixels next to start, if start is not passable
+#   queue_type: priority queue class providing min_priority
+#   heuristic: consistent heuristic function
+#   forward, backward: search state dictionaries (prev, distance, expanded)
+# output:
+#   meet: pixel on the best path found, None if there is no path
+# relationships:
+#   used in bidirectional_search when there is a heuristic; the forward search
+#   aims at goal and the backward search aims at start
+# pseudocode:
+#   best = infinity
+#   while both queues are non-empty:
+#       if the smallest priority on either side >= best, stop
+#       pop from the side with the smaller queue, skip it if already closed
+#       close it, relax its neighbors, and for each neighbor also reached by
+#       the other side update best and meet
+#   return meet
+# notes:
+#   any path shorter than best must still have a vertex open on each side with
+#   priority <= its length, so once either side's minimum reaches best no
+#   shorter path is left
+def bidirectional_astar(passable, height, width, start, goal, start_neighbors, queue_type,
+                        heuristic, forward, backward):
+    forward["queue"], forward["target"] = queue_type(), goal
+    backward["queue"], backward["target"] = queue_type(), start
+    forward["queue"].insert(start, heuristic(start, goal))
+    backward["queue"].insert(goal, heuristic(goal, start))
+    for side in (forward, backward):
+        side["closed"] = set()
+        side["size"] = 1
+
+    best = float("inf")
+    meet = None
+    while not forward["queue"].is_empty() and not backward["queue"].is_empty():
+        if max(forward["queue"].min_priority(), backward["queue"].min_priority()) >= best:
+            break
+
+        if forward["size"] <= backward["size"]:
+            side, other = forward, backward
+        else:
+            side, other = backward, forward
+        u = side["queue"].pop()
+        side["size"] -= 1
+        # start is already known forward, and the backward search cannot leave it
+        if u in side["closed"] or (side is backward and u == start):
+            continue
+        side["closed"].add(u)
+        side["expanded"] += 1
+        distance, prev = side["distance"], side["prev"]
+
+        neighbors = get_mask_neighbors(u, passable, height, width)
+        if side is backward and u in start_neighbors:
+            neighbors.append(start)
+        for v in neighbors:
+            new_distance = distance[u] + 1
+            if new_distance < distance.get(v, float("inf")):
+                distance[v] = new_distance
+                prev[v] = u
+                side["queue"].insert(v, new_distance + heuristic(v, side["target"]))
+                side["size"] += 1
+                if v in other["distance"] and new_distance + other["distance"][v] < best:
+                    best = new_distance + other["distance"][v]
+                    meet = v
+
+    return meet
+
+
+# function: get_step_neighbors
+# inputs:
+#   origin_vertex: (x, y) tuple representing current pixel
+#   height, width: image dimensions
+# output:
+#   neighbors: in bounds (x, y) tuples one step away, passable or not
+# pseudocode:
+#   for each direction in [up, down, left, right], keep the in bounds steps
+def get_step_neighbors(origin_vertex, height, width):
+    row, col = origin_vertex
+    return [(r, c) for r, c in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1))
+            if 0 <= r < height and 0 <= c < width]
+
+
+# function: reject_tracing
+# inputs:
+#   stats: stats argument a search was given
+#   where: name of the search, for the error message
+# output: none, raises TypeError if stats is a SearchStats
+# relationships:
+#   called by the searches that cannot trace, so a SearchStats never comes
+#   back with its trace counters silently left at zero
+def reject_tracing(stats, where):
+    if isinstance(stats, SearchStats):
+        raise TypeError("SearchStats tracing needs the dict engine, not %s" % (where,))
 
 
 # function: manhattan_distance
@@ -108,6 +952,105 @@ def manhattan_distance(from_vertex, goal):
     return abs(from_vertex[0] - goal[0]) + abs(from_vertex[1] - goal[1])
 
 
+# function: passability_mask
+# inputs:
+#   image: 2D array of pixels, or an existing 2D boolean passability mask
+#          or PackedGrid
+# output:
+#   mask: 2D boolean numpy array, True where the pixel can be walked on
+# relationships:
+#   built once per image and shared by every search on it
+#   applies the same R > 100 or G > 100 or B > 100 test as get_neighbors
+# pseudocode:
+#   if image is already a 2D boolean array or a PackedGrid, return it
+#   compare every channel against 100 at once and OR the channels together
+def passability_mask(image):
+    if isinstance(image, PackedGrid):
+        return image
+    pixels = np.asarray(image)
+    if pixels.ndim == 2 and pixels.dtype == np.bool_:
+        return pixels
+    return (pixels > 100).any(axis=2)
+
+
+# function: flat_passable
+# inputs:
+#   mask: 2D boolean passability mask or PackedGrid
+# output:
+#   passable: flat byte view of mask, pixel (row, col) is at row * width + col
+# relationships:
+#   used in unified_search so neighbor checks are a single index lookup
+#   a PackedGrid already supports flat lookups and is returned as is
+# pseudocode:
+#   make mask contiguous and view its bytes as a flat sequence (no copy)
+def flat_passable(mask):
+    if isinstance(mask, PackedGrid):
+        return mask
+    mask = np.ascontiguousarray(mask, dtype=np.bool_)
+    return memoryview(mask).cast('B')
+
+
+# function: get_mask_neighbors
+# inputs:
+#   origin_vertex: (x, y) tuple representing current pixel
+#   passable: flat passability lookup from flat_passable
+#   height: number of rows in the image
+#   width: number of columns in the image
+# output:
+#   neighbors: list of (x, y) tuples representing valid neighboring pixels
+# relationships:
+#   used in unified_search in place of get_neighbors, same neighbor order
+# pseudocode:
+#   compute flat index of origin_vertex
+#   for each direction in [up, down, left, right]:
+#       if step stays in bounds and passable[flat index of step]:
+#           add to neighbors
+#   return neighbors
+def get_mask_neighbors(origin_vertex, passable, height, width):
+    row, col = origin_vertex
+    index = row * width + col
+
+    neighbors = []
+    if row > 0 and passable[index - width]:
+        neighbors.append((row - 1, col))
+    if row < height - 1 and passable[index + width]:
+        neighbors.append((row + 1, col))
+    if col > 0 and passable[index - 1]:
+        neighbors.append((row, col - 1))
+    if col < width - 1 and passable[index + 1]:
+        neighbors.append((row, col + 1))
+
+    return neighbors
+
+
+# function: get_flat_neighbors
+# inputs:
+#   index: flat index row * width + col of current pixel
+#   passable: flat passability lookup from flat_passable
+#   height: number of rows in the image
+#   width: number of columns in the image
+# output:
+#   neighbors: list of flat indices of valid neighboring pixels
+# relationships:
+#   flat index version of get_mask_neighbors, used in array_search
+# pseudocode:
+#   same as get_mask_neighbors, stepping by -width, +width, -1, +1
+def get_flat_neighbors(index, passable, height, width):
+    col = index % width
+
+    neighbors = []
+    if index >= width and passable[index - width]:
+        neighbors.append(index - width)
+    if index < (height - 1) * width and passable[index + width]:
+        neighbors.append(index + width)
+    if col > 0 and passable[index - 1]:
+        neighbors.append(index - 1)
+    if col < width - 1 and passable[index + 1]:
+        neighbors.append(index + 1)
+
+    return neighbors
+
+
 # function: get_neighbors
 # inputs:
 #   origin_vertex: (x, y) tuple representing current pixel
@@ -184,3 +1127,100 @@ def reconstruct_path(prev, start, goal):
     path.reverse()
     
     return path
+
+
+# function: reconstruct_flat_path
+# inputs:
+#   prev: int32 array mapping flat indices to their predecessor (-1 if none)
+#   width: number of columns in the image
+#   start_index: flat index of starting pixel
+#   goal_index: flat index of goal pixel
+# output:
+#   path: list of (x, y) tuples representing path from start to goal
+# relationships:
+#   flat index version of reconstruct_path, used in array_search
+# pseudocode:
+#   if goal has no predecessor and goal != start:
+#       return []
+#   walk prev from goal back to start collecting indices
+#   reverse and convert each index to an (x, y) tuple
+def reconstruct_flat_path(prev, width, start_index, goal_index):
+    # Check if goal was reached
+    if prev[goal_index] < 0 and goal_index != start_index:
+        return []
+
+    indices = []
+    current = goal_index
+
+    while current != start_index:
+        indices.append(current)
+        current = prev[current]
+
+    indices.append(start_index)
+    indices.reverse()
+
+    return [divmod(index, width) for index in indices]
+
+
+# class: FlatVisited
+# read-only dictionary view over a 2D boolean visited mask, so flat search
+# engines can return the same (path, visited) shape as unified_search without
+# building a dictionary of every visited pixel
+class FlatVisited(Mapping):
+
+    # function: __init__
+    # inputs:
+    #   mask: 2D boolean numpy array, True where a pixel was visited
+    # output: none
+    # relationships:
+    #   mask is kept as is (no copy) and exposed for vectorized callers
+    # pseudocode:
+    #   store mask
+    def __init__(self, mask):
+        self.mask = mask
+
+    # function: __getitem__
+    # inputs:
+    #   vertex: (x, y) tuple
+    # output:
+    #   True if vertex was visited, otherwise raises KeyError like a dictionary
+    # pseudocode:
+    #   if vertex in self, return True, else raise KeyError
+    def __getitem__(self, vertex):
+        if vertex in self:
+            return True
+        raise KeyError(vertex)
+
+    # function: __contains__
+    # inputs:
+    #   vertex: (x, y) tuple
+    # output:
+    #   boolean: True if vertex is in bounds and marked in mask
+    # pseudocode:
+    #   return bounds check and mask[row, col]
+    def __contains__(self, vertex):
+        try:
+            row, col = vertex
+        except (TypeError, ValueError):
+            return False
+        height, width = self.mask.shape
+        return 0 <= row < height and 0 <= col < width and bool(self.mask[row, col])
+
+    # function: __iter__
+    # inputs: none
+    # output:
+    #   iterator over visited (x, y) tuples in row-major order
+    # pseudocode:
+    #   find nonzero rows and columns of mask and zip them
+    def __iter__(self):
+        rows, cols = np.nonzero(self.mask)
+        return zip(rows.tolist(), cols.tolist())
+
+    # function: __len__
+    # inputs: none
+    # output:
+    #   number of visited pixels
+    # pseudocode:
+    #   count nonzero entries of mask
+    def __len__(self):
+        return int(np.count_nonzero(self.mask))
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from collections import deque
+from numbers import Integral
 import heapq
 
 # Abstract base class for search queues
@@ -62,28 +63,45 @@ class FIFOQueue(SearchQueue):
     def is_empty(self):
         return len(self.queue) == 0
     
+    # function: __len__
+    # inputs: none
+    # output:
+    #   integer: number of vertices in the queue
+    # pseudocode:
+    #   return length of the deque
+    def __len__(self):
+        return len(self.queue)
+    
 class PriorityQueue(SearchQueue):
     # function: __init__
     # inputs: none
     # output: none
     # relationships:
     #  initializes an empty priority queue using a heap
+    #  heapq has no decrease-key, so re-inserting a vertex leaves its old heap
+    #  entry behind; entry_priority remembers the live priority of each vertex
+    #  so stale entries can be skipped
     # pseudocode:
     #   initialize an empty list for the heap
+    #   initialize an empty dictionary of live priorities
     def __init__(self):
         self.queue_heap = []
+        self.entry_priority = {}
     
     # function: insert
     # inputs:
     #   vertex: (x, y) tuple representing pixel to insert
-    #   priority: not used in FIFOQueue
+    #   priority: priority value, lower is popped first
     # output: none
     # relationships:
     #   adds vertex to the priority queue with given priority
+    #   inserting a vertex that is already queued replaces its priority
     # pseudocode:
     #   push (priority, vertex) onto the heap
+    #   record priority as the live priority of vertex
     def insert(self, vertex, priority):
         heapq.heappush(self.queue_heap, (priority, vertex))
+        self.entry_priority[vertex] = priority
     
     # function: pop
     # inputs: none
@@ -92,9 +110,55 @@ class PriorityQueue(SearchQueue):
     # relationships:
     #   removes and returns the vertex with the highest priority (lowest priority value)
     # pseudocode:
-    #   remove and return vertex with lowest priority from the heap
+    #   discard stale entries from the top of the heap
+    #   remove vertex with lowest priority from the heap and forget its priority
     def pop(self):
-        return heapq.heappop(self.queue_heap)[1]
+        self.discard_stale()
+        vertex = heapq.heappop(self.queue_heap)[1]
+        del self.entry_priority[vertex]
+        return vertex
+    
+    # function: remove
+    # inputs:
+    #   vertex: (x, y) tuple representing pixel to take out of the queue
+    # output: none
+    # relationships:
+    #   used by LifelongPlanner when a vertex becomes consistent
+    #   its heap entry is left behind as stale, like a replaced priority
+    # pseudocode:
+    #   forget the live priority of vertex, if it is queued
+    def remove(self, vertex):
+        self.entry_priority.pop(vertex, None)
+    
+    # function: min_priority
+    # inputs: none
+    # output:
+    #   priority: lowest priority value in the queue, without removing it
+    # relationships:
+    #   used by bidirectional_astar to decide when to stop
+    # pseudocode:
+    #   discard stale entries, return priority at the top of the heap
+    def min_priority(self):
+        self.discard_stale()
+        return self.queue_heap[0][0]
+    
+    # function: discard_stale
+    # inputs: none
+    # output: none
+    # relationships:
+    #   an entry is stale if its vertex was popped already or was re-inserted
+    #   with a different priority
+    # pseudocode:
+    #   while the top entry's priority is not the live priority of its vertex:
+    #       pop it
+    def discard_stale(self):
+        heap = self.queue_heap
+        live = self.entry_priority
+        while heap:
+            priority, vertex = heap[0]
+            if vertex in live and live[vertex] == priority:
+                break
+            heapq.heappop(heap)
     
     # function: is_empty
     # inputs: none
@@ -103,6 +167,133 @@ class PriorityQueue(SearchQueue):
     # relationships:
     #   checks if the queue is empty
     # pseudocode:
-    #   return True if queue_heap is empty, else False
+    #   return True if no vertex has a live priority, else False
+    def is_empty(self):
+        return len(self.entry_priority) == 0
+    
+    # function: __len__
+    # inputs: none
+    # output:
+    #   integer: number of vertices in the queue, not counting stale entries
+    # pseudocode:
+    #   return number of live priorities
+    def __len__(self):
+        return len(self.entry_priority)
+
+class BucketQueue(SearchQueue):
+    # function: __init__
+    # inputs: none
+    # output: none
+    # relationships:
+    #  initializes an empty bucket (Dial) queue for small non-negative integer
+    #  priorities, such as distance + manhattan_distance on a grid
+    #  buckets[p] holds the vertices with priority p in insertion order, so
+    #  equal priorities pop first in, first out
+    #  stale entries are skipped the same way as in PriorityQueue
+    # pseudocode:
+    #   initialize an empty list of buckets and a cursor at bucket 0
+    #   initialize an empty dictionary of live priorities
+    def __init__(self):
+        self.buckets = []
+        self.current = 0
+        self.entry_priority = {}
+    
+    # function: insert
+    # inputs:
+    #   vertex: (x, y) tuple representing pixel to insert
+    #   priority: non-negative integer priority, lower is popped first
+    # output: none
+    # relationships:
+    #   adds vertex to the bucket for its priority in O(1) amortized
+    #   inserting a vertex that is already queued replaces its priority
+    # pseudocode:
+    #   reject priorities that are not non-negative integers with ValueError
+    #   grow the bucket list up to priority if needed
+    #   append vertex to buckets[priority]
+    #   move the cursor back if priority is below it
+    #   record priority as the live priority of vertex
+    def insert(self, vertex, priority=0):
+        if not isinstance(priority, Integral) or priority < 0:
+            raise ValueError("BucketQueue priorities must be non-negative integers, got %r"
+                             % (priority,))
+        buckets = self.buckets
+        while len(buckets) <= priority:
+            buckets.append(deque())
+        buckets[priority].append(vertex)
+        if priority < self.current:
+            self.current = priority
+        self.entry_priority[vertex] = priority
+    
+    # function: pop
+    # inputs: none
+    # output:
+    #   vertex: (x, y) tuple representing pixel removed from front of queue
+    # relationships:
+    #   removes and returns the oldest vertex with the lowest priority
+    #   the cursor only moves forward between inserts, so a run of pops costs
+    #   O(1) amortized per pop plus the range of priorities
+    # pseudocode:
+    #   raise IndexError if the queue is empty
+    #   discard stale entries up to the first live one
+    #   remove it from its bucket and forget its priority
+    def pop(self):
+        if not self.entry_priority:
+            raise IndexError("pop from an empty BucketQueue")
+        self.discard_stale()
+        vertex = self.buckets[self.current].popleft()
+        del self.entry_priority[vertex]
+        return vertex
+    
+    # function: min_priority
+    # inputs: none
+    # output:
+    #   priority: lowest priority value in the queue, without removing it
+    # pseudocode:
+    #   raise IndexError if the queue is empty
+    #   discard stale entries, return the cursor
+    def min_priority(self):
+        if not self.entry_priority:
+            raise IndexError("min_priority of an empty BucketQueue")
+        self.discard_stale()
+        return self.current
+    
+    # function: discard_stale
+    # inputs: none
+    # output: none
+    # relationships:
+    #   leaves the cursor on the bucket holding the lowest live entry at its front
+    # pseudocode:
+    #   while the cursor bucket is empty or its front entry is stale:
+    #       drop the stale entry, or move the cursor to the next bucket
+    def discard_stale(self):
+        buckets = self.buckets
+        live = self.entry_priority
+        current = self.current
+        while current < len(buckets):
+            bucket = buckets[current]
+            if not bucket:
+                current += 1
+                continue
+            vertex = bucket[0]
+            if live.get(vertex) == current:
+                break
+            bucket.popleft()
+        self.current = current
+    
+    # function: is_empty
+    # inputs: none
+    # output:
+    #   boolean: True if queue is empty, False otherwise
+    # pseudocode:
+    #   return True if no vertex has a live priority, else False
     def is_empty(self):
-        return len(self.queue_heap) == 0
+        return len(self.entry_priority) == 0
+    
+    # function: __len__
+    # inputs: none
+    # output:
+    #   integer: number of vertices in the queue, not counting stale entries
+    # pseudocode:
+    #   return number of live priorities
+    def __len__(self):
+        return len(self.entry_priority)
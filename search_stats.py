@@ -0,0 +1,185 @@
+import json
+from time import perf_counter
+
+# Opt-in instrumentation for unified_search. Passing a SearchStats as stats
+# makes unified_search swap its queue, heuristic, neighbor and path functions
+# for counting (and optionally timing) wrappers. A plain dictionary, or no
+# stats at all, runs the usual functions, so tracing costs nothing when off.
+#
+# counters:
+#   pushed, popped: queue inserts and pops
+#   peak_queue: largest number of queued vertices (seen at sampled inserts)
+#   heuristic_calls: calls of the heuristic
+#   neighbor_checks: in bounds neighbor pixels looked up
+#   neighbor_time, queue_time, reconstruct_time: seconds spent generating
+#       neighbors, in queue operations and rebuilding the path (timing=True;
+#       neighbor_time and queue_time are scaled up from the sampled calls)
+# plus whatever the search itself records (expanded, open, closed, ...)
+
+
+# class: SearchStats
+# dictionary of search counters that also switches tracing on
+class SearchStats(dict):
+
+    # function: __init__
+    # inputs:
+    #   timing: also time neighbor, queue and path work (optional)
+    #   on_pop: function(vertex) called for sampled popped vertices (optional)
+    #   sample_every: only time, peak check and pass to on_pop one in this
+    #       many operations; the counters themselves stay exact
+    # output: none
+    # pseudocode:
+    #   zero every counter, remember the options
+    def __init__(self, timing=True, on_pop=None, sample_every=1):
+        super().__init__(pushed=0, popped=0, peak_queue=0, heuristic_calls=0,
+                         neighbor_checks=0)
+        if timing:
+            self.update(neighbor_time=0.0, queue_time=0.0, reconstruct_time=0.0)
+        self.timing = timing
+        self.on_pop = on_pop
+        self.sample_every = sample_every
+
+    # function: wrap_queue
+    # inputs:
+    #   queue_type: class of search queue the search would use
+    # output:
+    #   function that creates a TracedQueue around a new queue_type()
+    def wrap_queue(self, queue_type):
+        return lambda: TracedQueue(queue_type(), self)
+
+    # function: wrap_heuristic
+    # inputs:
+    #   heuristic: heuristic function, or None
+    # output:
+    #   heuristic that counts its calls, or None
+    def wrap_heuristic(self, heuristic):
+        if heuristic is None:
+            return None
+
+        def traced_heuristic(vertex, goal):
+            self["heuristic_calls"] += 1
+            return heuristic(vertex, goal)
+
+        return traced_heuristic
+
+    # function: wrap_neighbors
+    # inputs:
+    #   neighbors: function(vertex, passable, height, width) like get_mask_neighbors
+    # output:
+    #   same function, counting the in bounds pixels it checks and timing
+    #   one in sample_every calls (scaled up)
+    def wrap_neighbors(self, neighbors):
+        timing = self.timing
+        sample_every = self.sample_every
+        calls = [0]
+
+        def traced_neighbors(vertex, passable, height, width):
+            row, col = vertex
+            self["neighbor_checks"] += (row > 0) + (row < height - 1) + (col > 0) + (col < width - 1)
+            calls[0] += 1
+            if not timing or calls[0] % sample_every:
+                return neighbors(vertex, passable, height, width)
+            began = perf_counter()
+            found = neighbors(vertex, passable, height, width)
+            self["neighbor_time"] += (perf_counter() - began) * sample_every
+            return found
+
+        return traced_neighbors
+
+    # function: wrap_reconstruct
+    # inputs:
+    #   reconstruct: function(prev, start, goal) like reconstruct_path
+    # output:
+    #   same function, timed
+    def wrap_reconstruct(self, reconstruct):
+        if not self.timing:
+            return reconstruct
+
+        def traced_reconstruct(prev, start, goal):
+            began = perf_counter()
+            path = reconstruct(prev, start, goal)
+            self["reconstruct_time"] += perf_counter() - began
+            return path
+
+        return traced_reconstruct
+
+    # function: to_json
+    # inputs:
+    #   options: extra keyword arguments for json.dumps (indent, ...)
+    # output:
+    #   JSON object string of every counter, keys sorted so runs diff cleanly
+    def to_json(self, **options):
+        return json.dumps(self, sort_keys=True, **options)
+
+
+# class: TracedQueue
+# search queue wrapper that counts the operations of the queue it wraps.
+# Only every sample_every-th insert and pop is timed, checked for the peak
+# size and passed to on_pop; the others are counted and forwarded directly
+class TracedQueue:
+
+    # function: __init__
+    # inputs:
+    #   queue: search queue to wrap
+    #   stats: SearchStats to record in
+    # output: none
+    def __init__(self, queue, stats):
+        self.queue = queue
+        self.stats = stats
+        self.timing = stats.timing
+        self.on_pop = stats.on_pop
+        self.sample_every = stats.sample_every
+
+    # function: insert
+    # inputs:
+    #   vertex: (x, y) tuple representing pixel to insert
+    #   priority: priority value (optional)
+    # output: none
+    # pseudocode:
+    #   count the insert
+    #   if it is not a sampled one, insert into the wrapped queue and stop
+    #   otherwise time the insert (scaled by sample_every), update the peak size
+    def insert(self, vertex, priority=None):
+        stats = self.stats
+        stats["pushed"] += 1
+        if stats["pushed"] % self.sample_every:
+            self.queue.insert(vertex, priority)
+            return
+        if self.timing:
+            began = perf_counter()
+            self.queue.insert(vertex, priority)
+            stats["queue_time"] += (perf_counter() - began) * self.sample_every
+        else:
+            self.queue.insert(vertex, priority)
+        size = len(self.queue)
+        if size > stats["peak_queue"]:
+            stats["peak_queue"] = size
+
+    # function: pop
+    # inputs: none
+    # output:
+    #   vertex popped from the wrapped queue
+    # pseudocode:
+    #   count the pop
+    #   if it is not a sampled one, pop from the wrapped queue and return
+    #   otherwise time the pop (scaled by sample_every), call on_pop
+    def pop(self):
+        stats = self.stats
+        stats["popped"] += 1
+        if stats["popped"] % self.sample_every:
+            return self.queue.pop()
+        if self.timing:
+            began = perf_counter()
+            vertex = self.queue.pop()
+            stats["queue_time"] += (perf_counter() - began) * self.sample_every
+        else:
+            vertex = self.queue.pop()
+        if self.on_pop is not None:
+            self.on_pop(vertex)
+        return vertex
+
+    def is_empty(self):
+        return self.queue.is_empty()
+
+    def __len__(self):
+        return len(self.queue)
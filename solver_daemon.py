@@ -0,0 +1,356 @@
+import argparse
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+import sys
+from distance_field import distance_field
+from maze import ALGORITHMS, Maze
+
+# Long running solver process. Mazes stay loaded between queries, and
+# queries arrive as newline delimited JSON over stdin or a Unix socket:
+#
+#   request:  {"id": 7, "maze": "maze.bmp", "start": [0, 9], "goal": [18, 9],
+#              "algorithm": "astar", "options": {"engine": "flat"}}
+#   response: {"id": 7, "path": [[0, 9], ...], "length": 36}
+#             {"id": 7, "error": "..."}
+#   {"id": 8, "command": "stats"} answers with the daemon's counters
+#
+# "algorithm" (default "bfs") and "options" are passed to Maze.solve. Queries
+# for the same maze that arrive within batch_window seconds of each other are
+# answered as one batch on a worker thread, so the event loop keeps reading
+# while searches run. Responses can come back out of order; match them by id.
+#
+#   python -m solver_daemon --socket /tmp/maze.sock
+#   python -m solver_daemon --stdin < queries.jsonl
+
+# breadth first queries in one batch that share a goal are answered from one
+# distance_field once there are at least this many of them
+FIELD_BATCH = 4
+
+
+# class: SolverDaemon
+# least recently used loaded mazes plus the per-maze batches of queries
+# waiting to be solved
+class SolverDaemon:
+
+    # function: __init__
+    # inputs:
+    #   batch_window: seconds to wait for more queries before solving a batch
+    #   max_batch: solve a batch straight away once it has this many queries
+    #   max_mazes: most mazes to keep loaded
+    # output: none
+    def __init__(self, batch_window=0.002, max_batch=64, max_mazes=16):
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.max_mazes = max_mazes
+        self.mazes = OrderedDict()
+        self.pending = {}
+        self.timers = {}
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.counters = {"queries": 0, "batches": 0, "fields": 0, "reloads": 0}
+
+    # function: load
+    # inputs:
+    #   path: maze image filename
+    # output:
+    #   maze: Maze for path, loaded through its on-disk cache
+    # relationships:
+    #   the image's size and modification time are the ones the cache header
+    #   records, so a change to either means the loaded maze may be stale
+    # pseudocode:
+    #   stat the image
+    #   if it is loaded with the same size and modification time, mark it
+    #   most recently used and return it
+    #   otherwise load it with Maze.from_cache (which rebuilds a stale cache)
+    #   and drop the least recently used mazes beyond max_mazes
+    def load(self, path):
+        status = os.stat(path)
+        stamp = (status.st_size, status.st_mtime_ns)
+        loaded = self.mazes.get(path)
+        if loaded is not None and loaded[1] == stamp:
+            self.mazes.move_to_end(path)
+            return loaded[0]
+        if loaded is not None:
+            self.counters["reloads"] += 1
+        maze = Maze.from_cache(path)
+        self.mazes[path] = (maze, stamp)
+        self.mazes.move_to_end(path)
+        while len(self.mazes) > self.max_mazes:
+            self.mazes.popitem(last=False)
+        return maze
+
+    # function: submit
+    # inputs:
+    #   query: decoded request dictionary
+    # output:
+    #   response dictionary (without id)
+    # relationships:
+    #   called once per request by serve_stream
+    # pseudocode:
+    #   add query and a future to its maze's pending batch
+    #   the first query of a batch schedules flush after batch_window, keeping
+    #   the timer so an earlier flush can cancel it
+    #   a full batch is flushed straight away
+    #   wait for the future
+    async def submit(self, query):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        path = query["maze"]
+        batch = self.pending.setdefault(path, [])
+        batch.append((query, future))
+        if len(batch) == 1:
+            self.timers[path] = loop.call_later(self.batch_window, self.flush, path)
+        if len(batch) >= self.max_batch:
+            self.flush(path)
+        return await future
+
+    # function: flush
+    # inputs:
+    #   path: maze whose pending batch should be solved
+    # output: none
+    # pseudocode:
+    #   cancel the batch's timer, so it cannot fire early on the next batch
+    #   take the pending batch and solve it on the worker thread, then
+    #   resolve each query's future
+    def flush(self, path):
+        timer = self.timers.pop(path, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self.pending.pop(path, None)
+        if batch:
+            asyncio.ensure_future(self.run_batch(path, batch))
+
+    # function: run_batch
+    # inputs:
+    #   path: maze image filename
+    #   batch: list of (query, future) pairs
+    # output: none
+    # relationships:
+    #   every future is resolved, even if solve_batch fails, so no client
+    #   waits forever on another client's bad query
+    async def run_batch(self, path, batch):
+        loop = asyncio.get_running_loop()
+        try:
+            responses = await loop.run_in_executor(self.executor, self.solve_batch, path,
+                                                   [query for query, _ in batch])
+        except Exception as error:
+            responses = [{"error": "batch failed: %s" % (error,)}] * len(batch)
+        for (_, future), response in zip(batch, responses):
+            if not future.done():
+                future.set_result(response)
+
+    # function: solve_batch
+    # inputs:
+    #   path: maze image filename
+    #   queries: request dictionaries for that maze
+    # output:
+    #   list of response dictionaries, one per query, in order
+    # relationships:
+    #   runs on the worker thread
+    # pseudocode:
+    #   load the maze (a failure answers every query with the error)
+    #   build each query's key, a malformed query is answered with the error
+    #   answer each distinct (start, goal, algorithm, options) once:
+    #       bfs queries sharing a goal with FIELD_BATCH or more others
+    #       follow one distance_field, everything else goes to Maze.solve
+    def solve_batch(self, path, queries):
+        self.counters["batches"] += 1
+        self.counters["queries"] += len(queries)
+        try:
+            maze = self.load(path)
+        except (OSError, ValueError) as error:
+            return [{"error": "cannot load %s: %s" % (path, error)}] * len(queries)
+
+        entries = []
+        for query in queries:
+            try:
+                entries.append(query_key(query))
+            except ValueError as error:
+                entries.append({"error": str(error)})
+        keys = [entry for entry in entries if isinstance(entry, tuple)]
+        goals = {}
+        for key in set(keys):
+            if key[2] == "bfs" and key[3] == "{}":
+                goals[key[1]] = goals.get(key[1], 0) + 1
+
+        answers = {}
+        fields = {}
+        for key in keys:
+            if key in answers:
+                continue
+            try:
+                start, goal, algorithm, options = key
+                check_pixel(maze, start)
+                check_pixel(maze, goal)
+                if goals.get(goal, 0) >= FIELD_BATCH and algorithm == "bfs" and options == "{}":
+                    if goal not in fields:
+                        fields[goal] = distance_field(maze.mask, goal, mask=maze.mask)
+                        self.counters["fields"] += 1
+                    found = fields[goal].path(start)
+                else:
+                    found, _ = maze.solve(start, goal, algorithm, **json.loads(options))
+                answers[key] = {"path": [list(pixel) for pixel in found],
+                                "length": len(found) - 1}
+            except (TypeError, ValueError, OverflowError) as error:
+                answers[key] = {"error": str(error)}
+        return [answers[entry] if isinstance(entry, tuple) else entry for entry in entries]
+
+    # function: serve_stream
+    # inputs:
+    #   reader, writer: asyncio stream pair of one client (socket or stdio)
+    # output: none
+    # pseudocode:
+    #   for each line read:
+    #       answer it in its own task, so later lines can join the same batch
+    #   at end of input, wait for the outstanding answers, then close
+    async def serve_stream(self, reader, writer):
+        tasks = set()
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            if line.strip():
+                task = asyncio.ensure_future(self.answer(line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.gather(*tasks)
+        writer.close()
+
+    # function: answer
+    # inputs:
+    #   line: one request line
+    #   writer: stream to write the response line to
+    # output: none
+    async def answer(self, line, writer):
+        query = {}
+        try:
+            decoded = json.loads(line)
+            if not isinstance(decoded, dict):
+                raise ValueError("query must be a JSON object")
+            query = decoded
+            if query.get("command") == "stats":
+                response = dict(self.counters, mazes=len(self.mazes))
+            elif not isinstance(query.get("maze"), str):
+                raise ValueError("query needs a maze filename")
+            else:
+                response = await self.submit(query)
+        except ValueError as error:
+            response = {"error": str(error)}
+        response = dict(response, id=query.get("id"))
+        writer.write(json.dumps(response).encode() + b"\n")
+        await writer.drain()
+
+
+# function: query_key
+# inputs:
+#   query: request dictionary
+# output:
+#   (start, goal, algorithm, options as sorted JSON) tuple
+# relationships:
+#   equal keys in one batch are solved once
+#   raises ValueError for a malformed start, goal, algorithm or options,
+#   so every key is hashable
+def query_key(query):
+    try:
+        start = tuple(int(value) for value in query["start"])
+        goal = tuple(int(value) for value in query["goal"])
+    except (KeyError, TypeError, ValueError, OverflowError):
+        start = goal = ()
+    if len(start) != 2 or len(goal) != 2:
+        raise ValueError("query needs start and goal as [row, col]")
+    algorithm = query.get("algorithm", "bfs")
+    if not isinstance(algorithm, str) or algorithm not in ALGORITHMS:
+        raise ValueError("unknown algorithm: %r" % (algorithm,))
+    options = query.get("options") or {}
+    if not isinstance(options, dict):
+        raise ValueError("options must be a JSON object")
+    return start, goal, algorithm, json.dumps(options, sort_keys=True)
+
+
+# function: check_pixel
+# inputs:
+#   maze: Maze
+#   pixel: (row, col) tuple
+# output: none, raises ValueError if pixel is outside maze
+def check_pixel(maze, pixel):
+    if not (0 <= pixel[0] < maze.height and 0 <= pixel[1] < maze.width):
+        raise ValueError("pixel %r is outside the %dx%d maze" % (list(pixel), maze.height,
+                                                                  maze.width))
+
+
+# function: serve_socket
+# inputs:
+#   daemon: SolverDaemon
+#   path: Unix socket filename
+# output: none, serves until cancelled
+async def serve_socket(daemon, path):
+    server = await asyncio.start_unix_server(daemon.serve_stream, path=path)
+    async with server:
+        await server.serve_forever()
+
+
+# class: StdoutWriter
+# the writer half of serve_stream for stdout, which can be a regular file and
+# so cannot always get an asyncio pipe transport
+class StdoutWriter:
+
+    def write(self, data):
+        sys.stdout.buffer.write(data)
+        sys.stdout.buffer.flush()
+
+    async def drain(self):
+        pass
+
+    def close(self):
+        pass
+
+
+# function: serve_stdio
+# inputs:
+#   daemon: SolverDaemon
+# output: none, returns at end of stdin once every answer is written
+# pseudocode:
+#   read stdin lines on a thread (it may be a file, pipe or terminal) and
+#   feed them to a StreamReader on the loop
+#   serve that reader like any socket client
+async def serve_stdio(daemon):
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+
+    def pump():
+        for line in sys.stdin.buffer:
+            loop.call_soon_threadsafe(reader.feed_data, line)
+        loop.call_soon_threadsafe(reader.feed_eof)
+
+    loop.run_in_executor(None, pump)
+    await daemon.serve_stream(reader, StdoutWriter())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--socket", help="Unix socket to listen on")
+    source.add_argument("--stdin", action="store_true", help="read queries from stdin")
+    parser.add_argument("--batch-window", type=float, default=0.002)
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--max-mazes", type=int, default=16, help="most mazes to keep loaded")
+    parser.add_argument("--preload", nargs="*", default=[], help="maze images to load at start")
+    args = parser.parse_args()
+
+    daemon = SolverDaemon(args.batch_window, args.max_batch, args.max_mazes)
+    for path in args.preload:
+        daemon.load(path)
+    try:
+        if args.stdin:
+            asyncio.run(serve_stdio(daemon))
+        else:
+            asyncio.run(serve_socket(daemon, args.socket))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
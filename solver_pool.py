@@ -0,0 +1,106 @@
+import multiprocessing
+from multiprocessing import shared_memory
+import numpy as np
+from maze import Maze
+from search import passability_mask
+
+# Process pool for batch queries. The passability mask is copied into one
+# shared memory block when the pool starts; every worker maps that block as
+# its own Maze, so tasks only carry (start, goal) pairs and paths.
+
+# per worker process: the attached shared memory block and the Maze over it
+worker_state = {}
+
+
+# function: attach_worker
+# inputs:
+#   name: name of the shared memory block holding the mask
+#   shape: (height, width) of the mask
+# output: none
+# relationships:
+#   pool initializer, runs once in each worker process
+#   workers share the parent's resource tracker, so the block stays registered
+#   once and is unlinked only by SolverPool.close
+# pseudocode:
+#   attach to the block, view it as a boolean array, wrap it in a Maze
+def attach_worker(name, shape):
+    block = shared_memory.SharedMemory(name=name)
+    mask = np.ndarray(shape, dtype=np.bool_, buffer=block.buf)
+    worker_state["block"] = block
+    worker_state["maze"] = Maze(mask=mask)
+
+
+# function: solve_task
+# inputs:
+#   task: (start, goal, algorithm, options) tuple
+# output:
+#   (start, goal, path) tuple
+# relationships:
+#   runs in a worker; visited is left out so large visited sets are not
+#   pickled back to the parent
+# pseudocode:
+#   solve the pair on the worker's Maze and return the path
+def solve_task(task):
+    start, goal, algorithm, options = task
+    path, _ = worker_state["maze"].solve(start, goal, algorithm, **options)
+    return start, goal, path
+
+
+# class: SolverPool
+# pool of worker processes that answer start/goal queries against one maze
+# held in shared memory
+class SolverPool:
+
+    # function: __init__
+    # inputs:
+    #   maze: Maze, 2D array of pixels, or 2D boolean passability mask
+    #   processes: number of worker processes (default: number of CPUs)
+    # output: none
+    # pseudocode:
+    #   build the mask, copy it into a new shared memory block
+    #   start the workers, each attaching to the block once
+    #   if the workers cannot be started, release and remove the block
+    def __init__(self, maze, processes=None):
+        mask = maze.mask if isinstance(maze, Maze) else passability_mask(maze)
+        self.shape = mask.shape
+        self.block = shared_memory.SharedMemory(create=True, size=max(mask.size, 1))
+        try:
+            np.ndarray(self.shape, dtype=np.bool_, buffer=self.block.buf)[:] = mask
+            self.processes = processes or multiprocessing.cpu_count()
+            self.pool = multiprocessing.Pool(self.processes, initializer=attach_worker,
+                                             initargs=(self.block.name, self.shape))
+        except BaseException:
+            self.block.close()
+            self.block.unlink()
+            raise
+
+    # function: solve_many
+    # inputs:
+    #   pairs: iterable of (start, goal) tuples
+    #   algorithm: name of the search in maze.ALGORITHMS
+    #   chunksize: number of pairs sent to a worker at a time
+    #   options: extra keyword arguments for the search (must be picklable)
+    # output:
+    #   generator of (start, goal, path) tuples in the order of pairs
+    # pseudocode:
+    #   hand the pairs to the pool in chunks and yield results as they return
+    def solve_many(self, pairs, algorithm="bfs", chunksize=8, **options):
+        tasks = ((start, goal, algorithm, options) for start, goal in pairs)
+        yield from self.pool.imap(solve_task, tasks, chunksize)
+
+    # function: close
+    # inputs: none
+    # output: none
+    # pseudocode:
+    #   stop the workers, then release and remove the shared memory block
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+        self.block.close()
+        self.block.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,76 @@
+import numpy as np
+from components import *
+from maze import Maze
+from search import breath_first_search
+
+OPEN = (255, 255, 255)
+WALL = (100, 100, 100)
+
+
+def test_label_components_separate_regions():
+    """Test that regions split by walls get different labels and walls get 0"""
+    image = [
+        [OPEN, WALL, OPEN],
+        [OPEN, WALL, OPEN],
+        [WALL, WALL, OPEN]
+    ]
+    labels = label_components(image)
+
+    assert labels[0, 0] == labels[1, 0] != 0
+    assert labels[0, 2] == labels[2, 2] != 0
+    assert labels[0, 0] != labels[0, 2]
+    assert labels[0, 1] == 0
+    assert labels.max() == 2
+
+
+def test_label_components_u_shape():
+    """Test that runs joined only through a lower row share one label"""
+    image = [
+        [OPEN, WALL, OPEN, WALL, OPEN],
+        [OPEN, WALL, OPEN, WALL, OPEN],
+        [OPEN, OPEN, OPEN, OPEN, OPEN]
+    ]
+    labels = label_components(image)
+
+    assert labels.max() == 1
+    assert (labels[passability_mask(image)] == 1).all()
+
+
+def test_label_components_matches_search():
+    """Test that two pixels share a label exactly when BFS connects them"""
+    rng = np.random.default_rng(2)
+    for _ in range(20):
+        mask = rng.random((12, 12)) > 0.45
+        labels = label_components(mask)
+        open_pixels = [tuple(p) for p in np.argwhere(mask)]
+        for _ in range(10):
+            start = open_pixels[rng.integers(len(open_pixels))]
+            goal = open_pixels[rng.integers(len(open_pixels))]
+            path, _ = breath_first_search(mask, start, goal)
+            assert bool(path) == (labels[start] == labels[goal])
+
+
+def test_maze_rejects_unreachable_without_search():
+    """Test that Maze.solve answers across components with no visited pixels"""
+    image = np.array([
+        [OPEN, WALL, OPEN],
+        [OPEN, WALL, OPEN]
+    ], dtype=np.uint8)
+    maze = Maze(image)
+
+    assert maze.solve((0, 0), (1, 2)) == ([], {})
+    assert maze.solve((0, 0), (0, 1)) == ([], {})
+    assert maze.solve((0, 1), (0, 1))[0] == [(0, 1)]
+
+
+def test_maze_wall_start_next_to_goal_component():
+    """Test that a start on a wall still reaches goal through a passable neighbor"""
+    image = np.array([
+        [WALL, OPEN, OPEN],
+        [WALL, WALL, OPEN]
+    ], dtype=np.uint8)
+    maze = Maze(image)
+
+    assert maze.reachable((0, 0), (1, 2))
+    assert maze.solve((0, 0), (1, 2))[0] == breath_first_search(image, (0, 0), (1, 2))[0]
+    assert not maze.reachable((1, 0), (1, 2))
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+from benchmarks.mazes import open_rooms, random_noise, recursive_backtracker
+from dead_ends import *
+from maze import Maze
+from search import best_first_search, breath_first_search
+
+OPEN = (255, 255, 255)
+WALL = (100, 100, 100)
+
+MAZES = {
+    "noise": random_noise(40, 0.35, seed=6),
+    "backtracker": recursive_backtracker(21, seed=2),
+    "rooms": open_rooms(64, room=16),
+}
+
+
+def test_prune_keeps_only_cycles():
+    """Test that corridors off a loop are filled and the loop is kept"""
+    image = np.array([
+        [OPEN, OPEN, OPEN, WALL, OPEN],
+        [OPEN, WALL, OPEN, OPEN, OPEN],
+        [OPEN, OPEN, OPEN, WALL, WALL],
+        [WALL, OPEN, WALL, WALL, OPEN]
+    ], dtype=np.uint8)
+    pruned = prune_dead_ends(image)
+
+    assert pruned.core.astype(int).tolist() == [
+        [1, 1, 1, 0, 0],
+        [1, 0, 1, 0, 0],
+        [1, 1, 1, 0, 0],
+        [0, 0, 0, 0, 0]
+    ]
+    width = pruned.padded_width
+    assert pruned.depth[1 * width + 5] == 3
+    assert pruned.parent[4 * width + 2] == 3 * width + 2
+    assert pruned.parent[4 * width + 5] == -1
+
+
+@pytest.mark.parametrize("name", sorted(MAZES))
+def test_core_cells_have_two_core_neighbors(name):
+    """Test that pruning runs until no core cell is a dead end"""
+    core = np.pad(prune_dead_ends(MAZES[name], mask=MAZES[name]).core, 1)
+    degree = (core[:-2, 1:-1].astype(int) + core[2:, 1:-1] + core[1:-1, :-2] + core[1:-1, 2:])
+    assert (degree[core[1:-1, 1:-1]] >= 2).all()
+
+
+@pytest.mark.parametrize("name", sorted(MAZES))
+@pytest.mark.parametrize("search", [breath_first_search, best_first_search])
+def test_pruned_paths_are_shortest(name, search):
+    """Test pruned solves against the full search on random pairs, walls included"""
+    mask = MAZES[name]
+    pruned = prune_dead_ends(mask, mask=mask)
+    rng = np.random.default_rng(1)
+    pixels = rng.integers(0, mask.shape, size=(60, 2, 2)).tolist()
+
+    for start, goal in pixels:
+        start, goal = tuple(start), tuple(goal)
+        path, _ = pruned.solve(start, goal, search)
+        expected, _ = search(mask, start, goal, mask=mask)
+        assert len(path) == len(expected)
+        if path:
+            assert path[0] == start and path[-1] == goal
+            for (r1, c1), (r2, c2) in zip(path, path[1:]):
+                assert abs(r1 - r2) + abs(c1 - c2) == 1 and mask[r2, c2]
+
+
+def test_isolated_pair_and_single_cell():
+    """Test components without a cycle, including two cells removed together"""
+    mask = np.array([[True, True, False, True]])
+    pruned = prune_dead_ends(mask, mask=mask)
+
+    assert not pruned.core.any()
+    assert pruned.solve((0, 0), (0, 1))[0] == [(0, 0), (0, 1)]
+    assert pruned.solve((0, 1), (0, 0))[0] == [(0, 1), (0, 0)]
+    assert pruned.solve((0, 0), (0, 3))[0] == []
+    assert pruned.solve((0, 3), (0, 3))[0] == [(0, 3)]
+
+
+def test_maze_solve_with_prune():
+    """Test that Maze caches its pruning and visits fewer pixels on maze.bmp"""
+    maze = Maze.from_file("maze.bmp")
+    path, visited = maze.solve((0, 9), (18, 9), "astar", prune=True)
+    expected, full_visited = maze.solve((0, 9), (18, 9), "astar")
+
+    assert len(path) == len(expected)
+    assert len(visited) < len(full_visited)
+    assert maze.dead_ends() is maze.dead_ends()
@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+from benchmarks.mazes import random_noise
+from distance_field import FieldCache, distance_field
+from maze import Maze
+from search import breath_first_search
+
+OPEN = (255, 255, 255)
+WALL = (100, 100, 100)
+
+IMAGE = [
+    [OPEN, OPEN, OPEN, OPEN],
+    [WALL, WALL, OPEN, WALL],
+    [OPEN, OPEN, OPEN, WALL],
+    [WALL, WALL, WALL, OPEN]
+]
+
+
+def test_distance_field_grids():
+    """Test the distance grid, with -1 on walls and unreachable pixels"""
+    field = distance_field(IMAGE, (2, 0))
+
+    assert field.distance.dtype == np.int32
+    assert field.distance.tolist() == [[6, 5, 4, 5], [-1, -1, 3, -1], [0, 1, 2, -1],
+                                       [-1, -1, -1, -1]]
+    assert field.direction[1, 1] == -1 and field.direction[2, 0] == 0
+
+
+@pytest.mark.parametrize("start", [(0, 0), (0, 3), (2, 0), (1, 0), (3, 3), (1, 3)])
+def test_distance_field_paths_match_bfs(start):
+    """Test that following directions gives BFS-length paths, including wall starts"""
+    field = distance_field(IMAGE, (2, 0))
+    path = field.path(start)
+    expected, _ = breath_first_search(IMAGE, start, (2, 0))
+
+    assert len(path) == len(expected)
+    if path:
+        assert path[0] == start and path[-1] == (2, 0)
+
+
+def test_distance_field_goal_on_wall():
+    """Test that a field to a wall pixel has no paths except from the goal itself"""
+    field = distance_field(IMAGE, (1, 0))
+
+    assert field.path((0, 0)) == []
+    assert field.path((1, 0)) == [(1, 0)]
+
+
+def test_distance_field_random_starts():
+    """Test many starts against breath_first_search on a noisy grid"""
+    mask = random_noise(40, 0.3, seed=2)
+    goal = tuple(np.argwhere(mask)[0].tolist())
+    field = distance_field(mask, goal)
+
+    rng = np.random.default_rng(0)
+    for start in rng.integers(0, 40, size=(50, 2)).tolist():
+        start = tuple(start)
+        assert len(field.path(start)) == len(breath_first_search(mask, start, goal)[0])
+
+
+def test_field_cache_reuses_fields():
+    """Test that a repeated (maze, goal) is answered from the cache"""
+    cache = FieldCache()
+    maze = Maze(np.array(IMAGE, dtype=np.uint8))
+
+    first = cache.field(maze, (2, 0))
+    assert cache.field(maze, (2, 0)) is first
+    assert cache.path(maze, (0, 0), (2, 0)) == first.path((0, 0))
+    assert len(cache) == 1
+
+
+def test_field_cache_evicts_least_recently_used():
+    """Test that the cache stays within its byte budget, dropping the oldest field"""
+    maze = Maze(np.array(IMAGE, dtype=np.uint8))
+    field_bytes = distance_field(IMAGE, (0, 0)).nbytes
+    cache = FieldCache(budget=2 * field_bytes)
+
+    cache.field(maze, (0, 0))
+    cache.field(maze, (0, 1))
+    cache.field(maze, (0, 0))
+    cache.field(maze, (0, 2))
+
+    assert (maze, (0, 1)) not in cache
+    assert (maze, (0, 0)) in cache and (maze, (0, 2)) in cache
+    assert cache.nbytes == 2 * field_bytes
+
+
+def test_field_cache_skips_fields_over_budget():
+    """Test that a field larger than the whole budget is returned but not kept"""
+    cache = FieldCache(budget=1)
+    maze = Maze(np.array(IMAGE, dtype=np.uint8))
+
+    assert cache.path(maze, (0, 0), (2, 0))
+    assert len(cache) == 0 and cache.nbytes == 0
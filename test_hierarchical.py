@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+from benchmarks.mazes import random_noise, recursive_backtracker
+from hierarchical import HierarchicalMap
+from search import best_first_search
+
+
+def assert_valid_path(mask, path, start, goal):
+    assert path[0] == start and path[-1] == goal
+    for (r1, c1), (r2, c2) in zip(path, path[1:]):
+        assert abs(r1 - r2) + abs(c1 - c2) == 1
+        assert mask[r2, c2]
+
+
+def random_pairs(mask, count, seed=0):
+    rng = np.random.default_rng(seed)
+    cells = np.argwhere(mask)
+    picks = cells[rng.integers(len(cells), size=(count, 2))].tolist()
+    return [(tuple(start), tuple(goal)) for start, goal in picks]
+
+
+def test_border_openings():
+    """Test that short openings get one middle entrance and long ones two end entrances"""
+    side = np.array([1, 1, 1, 0, 1, 1, 1, 1, 1, 1, 0], dtype=np.bool_)
+    assert HierarchicalMap.border_openings(side, side) == [1, 4, 9]
+
+
+def test_perfect_maze_paths_are_shortest():
+    """Test that in a maze with one route between any two pixels HPA* finds it"""
+    mask = recursive_backtracker(41, seed=3)
+    hierarchy = HierarchicalMap(mask, 8, mask=mask)
+
+    for start, goal in random_pairs(mask, 30):
+        path, _ = hierarchy.solve(start, goal)
+        expected, _ = best_first_search(mask, start, goal, mask=mask)
+        assert path == expected
+
+
+def test_noise_paths_valid_and_near_optimal():
+    """Test that paths on an open noisy grid are valid and close to A* length"""
+    mask = random_noise(60, 0.2, seed=1)
+    hierarchy = HierarchicalMap(mask, 10, mask=mask)
+
+    for start, goal in random_pairs(mask, 30):
+        path, _ = hierarchy.solve(start, goal)
+        expected, _ = best_first_search(mask, start, goal, mask=mask)
+        assert bool(path) == bool(expected)
+        if path:
+            assert_valid_path(mask, path, start, goal)
+            assert len(expected) <= len(path) <= 1.5 * len(expected)
+
+
+def test_same_cluster_detour():
+    """Test a query inside one cluster whose only route leaves the cluster"""
+    mask = np.ones((8, 8), dtype=np.bool_)
+    mask[0:4, 2] = False
+    hierarchy = HierarchicalMap(mask, 4, mask=mask)
+
+    path, _ = hierarchy.solve((0, 0), (0, 3))
+    expected, _ = best_first_search(mask, (0, 0), (0, 3), mask=mask)
+    assert_valid_path(mask, path, (0, 0), (0, 3))
+    assert len(path) == len(expected)
+
+
+@pytest.mark.parametrize("start, goal, expected", [
+    ((1, 1), (1, 1), [(1, 1)]),
+    ((0, 0), (3, 3), []),
+])
+def test_trivial_and_unreachable(start, goal, expected):
+    """Test start == goal and a walled-off goal"""
+    mask = np.ones((6, 6), dtype=np.bool_)
+    mask[2, 2:5] = False
+    mask[4, 2:5] = False
+    mask[3, 2] = False
+    mask[3, 4] = False
+    hierarchy = HierarchicalMap(mask, 3, mask=mask)
+
+    assert hierarchy.solve(start, goal)[0] == expected
+
+
+def test_goal_on_wall():
+    """Test that a wall goal returns no path without searching the abstract graph"""
+    mask = np.ones((6, 6), dtype=np.bool_)
+    mask[4, 4] = False
+    hierarchy = HierarchicalMap(mask, 3, mask=mask)
+    stats = {}
+
+    assert hierarchy.solve((0, 0), (4, 4), stats) == ([], {})
+    assert stats["expanded"] == 0
+
+
+def test_start_on_wall():
+    """Test that a start on a wall leaves through a passable neighbor like the searches"""
+    mask = np.ones((6, 6), dtype=np.bool_)
+    mask[0, 0] = False
+    hierarchy = HierarchicalMap(mask, 3, mask=mask)
+
+    path, _ = hierarchy.solve((0, 0), (5, 5))
+    assert path[0] == (0, 0) and path[-1] == (5, 5)
+    assert len(path) == len(best_first_search(mask, (0, 0), (5, 5), mask=mask)[0])
+
+
+def test_start_on_wall_at_cluster_border():
+    """Test a wall start whose only open neighbor is in the next cluster"""
+    mask = np.ones((6, 6), dtype=np.bool_)
+    mask[0:3, 0:3] = False
+    mask[2, 3] = False
+    hierarchy = HierarchicalMap(mask, 3, mask=mask)
+
+    path, _ = hierarchy.solve((1, 2), (5, 0))
+    assert path[:2] == [(1, 2), (1, 3)] and path[-1] == (5, 0)
+    assert len(path) == len(best_first_search(mask, (1, 2), (5, 0), mask=mask)[0])
+    assert hierarchy.solve((0, 0), (5, 5))[0] == []
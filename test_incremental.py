@@ -0,0 +1,90 @@
+import numpy as np
+from benchmarks.mazes import random_noise
+from incremental import LifelongPlanner
+from search import best_first_search
+
+
+def assert_valid_path(mask, path, start, goal):
+    assert path[0] == start and path[-1] == goal
+    for (r1, c1), (r2, c2) in zip(path, path[1:]):
+        assert abs(r1 - r2) + abs(c1 - c2) == 1
+        assert mask[r2, c2]
+
+
+def test_initial_plan_matches_astar():
+    """Test that the first plan has the same length as best_first_search"""
+    mask = random_noise(30, 0.25, seed=5)
+    planner = LifelongPlanner(mask, (0, 0), (29, 29), mask=mask)
+
+    path = planner.plan()
+    expected, _ = best_first_search(mask, (0, 0), (29, 29))
+    assert len(path) == len(expected)
+    assert_valid_path(mask, path, (0, 0), (29, 29))
+
+
+def test_update_does_not_touch_callers_mask():
+    """Test that edits go to the planner's own copy of the mask"""
+    mask = np.ones((4, 4), dtype=np.bool_)
+    planner = LifelongPlanner(mask, (0, 0), (3, 3), mask=mask)
+    planner.update([((1, 1), False)])
+
+    assert mask.all() and not planner.mask[1, 1]
+
+
+def test_blocking_and_reopening_a_corridor():
+    """Test repairs when the only route is cut and then restored"""
+    mask = np.zeros((3, 5), dtype=np.bool_)
+    mask[1, :] = True
+    planner = LifelongPlanner(mask, (1, 0), (1, 4), mask=mask)
+    assert len(planner.plan()) == 5
+
+    planner.update([((1, 2), False)])
+    assert planner.plan() == []
+
+    planner.update([((0, 1), True), ((0, 2), True), ((0, 3), True)])
+    assert planner.plan() == [(1, 0), (1, 1), (0, 1), (0, 2), (0, 3), (1, 3), (1, 4)]
+
+    planner.update([((1, 2), True)])
+    assert planner.plan() == [(1, 0), (1, 1), (1, 2), (1, 3), (1, 4)]
+
+
+def test_repair_expands_less_than_first_plan():
+    """Test that a small edit off the path needs far fewer expansions"""
+    mask = np.ones((40, 40), dtype=np.bool_)
+    planner = LifelongPlanner(mask, (0, 0), (39, 39), mask=mask)
+    first, repair = {}, {}
+    path = planner.plan(first)
+
+    planner.update([(path[len(path) // 2], False)])
+    planner.plan(repair)
+    assert repair["expanded"] < first["expanded"] / 4
+
+
+def test_random_edit_batches_match_astar():
+    """Test many random edit batches against planning from scratch"""
+    rng = np.random.default_rng(1)
+    mask = random_noise(25, 0.25, seed=2)
+    start, goal = (0, 0), (24, 24)
+    planner = LifelongPlanner(mask, start, goal, mask=mask)
+
+    for _ in range(20):
+        path = planner.plan()
+        expected, _ = best_first_search(planner.mask, start, goal, mask=planner.mask)
+        assert len(path) == len(expected)
+        if path:
+            assert_valid_path(planner.mask, path, start, goal)
+        cells = rng.integers(0, 25, size=(int(rng.integers(1, 30)), 2)).tolist()
+        planner.update([(tuple(cell), bool(rng.random() < 0.5)) for cell in cells])
+
+
+def test_start_on_wall_and_unchanged_edits():
+    """Test a wall start, and that edits which change nothing are ignored"""
+    mask = np.ones((3, 3), dtype=np.bool_)
+    mask[0, 0] = False
+    planner = LifelongPlanner(mask, (0, 0), (2, 2), mask=mask)
+    assert len(planner.plan()) == 5
+
+    planner.update([((1, 1), True)])
+    stats = {}
+    assert len(planner.plan(stats)) == 5
+    assert stats["expanded"] == 0
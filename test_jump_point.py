@@ -0,0 +1,64 @@
+import numpy as np
+from jump_point import *
+from search import best_first_search, manhattan_distance
+
+OPEN = (255, 255, 255)
+WALL = (100, 100, 100)
+
+
+def test_jps_open_grid_expands_few_nodes():
+    """Test that an open grid is crossed with only a handful of jump points"""
+    mask = np.ones((50, 50), dtype=bool)
+    stats = {}
+    path, visited = jump_point_search(mask, (0, 0), (49, 49), stats=stats)
+
+    assert len(path) == 99
+    assert path[0] == (0, 0)
+    assert path[-1] == (49, 49)
+    assert stats["expanded"] <= 5
+
+
+def test_jps_path_around_wall():
+    """Test that the expanded path steps one pixel at a time around a wall"""
+    image = [
+        [OPEN, WALL, OPEN],
+        [OPEN, WALL, OPEN],
+        [OPEN, OPEN, OPEN]
+    ]
+    path, visited = jump_point_search(image, (0, 0), (0, 2))
+
+    assert path == [(0, 0), (1, 0), (2, 0), (2, 1), (2, 2), (1, 2), (0, 2)]
+
+
+def test_jps_no_path():
+    """Test that a walled off goal gives an empty path"""
+    image = [
+        [OPEN, WALL, OPEN],
+        [OPEN, WALL, OPEN]
+    ]
+    path, visited = jump_point_search(image, (0, 0), (1, 2))
+
+    assert path == []
+    assert (1, 2) not in visited
+
+
+def test_jps_start_equals_goal():
+    """Test JPS when start and goal are the same"""
+    path, visited = jump_point_search([[OPEN]], (0, 0), (0, 0))
+    assert path == [(0, 0)]
+
+
+def test_jps_matches_best_first_search():
+    """Test that JPS paths have the same length as best_first_search on random grids"""
+    rng = np.random.default_rng(11)
+    for _ in range(50):
+        mask = rng.random((20, 20)) > rng.uniform(0.0, 0.4)
+        start = tuple(int(x) for x in rng.integers(0, 20, 2))
+        goal = tuple(int(x) for x in rng.integers(0, 20, 2))
+        expected, _ = best_first_search(mask, start, goal)
+        path, _ = jump_point_search(mask, start, goal)
+
+        assert len(path) == len(expected)
+        for a, b in zip(path, path[1:]):
+            assert manhattan_distance(a, b) == 1
+            assert mask[b]
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+from benchmarks.mazes import random_noise, recursive_backtracker
+from distance_field import distance_field
+from landmarks import *
+from search import breath_first_search, manhattan_distance, unified_search
+from search_queue import PriorityQueue
+
+
+def test_landmarks_are_spread_out():
+    """Test farthest-point selection on an open corridor picks its two ends first"""
+    mask = np.ones((1, 9), dtype=bool)
+    alt = select_landmarks(mask, 3, mask=mask, seed=(0, 3))
+
+    assert alt.pixels[:2] == [(0, 8), (0, 0)]
+    assert alt.pixels[2] == (0, 4)
+    assert all(grid.dtype == np.uint16 for grid in alt.grids)
+    assert alt.nbytes == 3 * 9 * 2
+
+
+def test_landmarks_stop_at_component_size():
+    """Test that a component smaller than count gets one landmark per pixel"""
+    mask = np.array([[True, True, False, True]])
+    alt = select_landmarks(mask, 5, mask=mask)
+
+    assert sorted(alt.pixels) == [(0, 0), (0, 1)]
+    assert alt((0, 1), (0, 0)) == 1
+    assert alt((0, 0), (0, 3)) == manhattan_distance((0, 0), (0, 3))
+
+
+def test_compact_grid_widens_for_long_distances():
+    """Test uint16 grids widen to uint32 and mark unreachable pixels"""
+    distance = np.array([[-1, 0, 70000]], dtype=np.int32)
+    grid = compact_grid(distance)
+
+    assert grid.dtype == np.uint32
+    assert grid.tolist() == [unreached(grid), 0, 70000]
+    assert compact_grid(np.array([[-1, 3]], dtype=np.int32)).tolist() == [65535, 3]
+
+
+@pytest.mark.parametrize("mask", [recursive_backtracker(15, seed=2),
+                                  random_noise(30, 0.3, seed=4)])
+def test_alt_is_admissible_and_consistent(mask):
+    """Test the heuristic against true distances, and across every step"""
+    alt = select_landmarks(mask, 4, mask=mask)
+    rng = np.random.default_rng(0)
+    cells = [tuple(cell) for cell in np.argwhere(mask).tolist()]
+
+    for goal in (cells[i] for i in rng.integers(0, len(cells), size=5)):
+        distance = distance_field(mask, goal, mask=mask).distance
+        for row, col in cells:
+            if distance[row, col] < 0:
+                continue
+            estimate = alt((row, col), goal)
+            assert manhattan_distance((row, col), goal) <= estimate <= distance[row, col]
+            for r, c in ((row + 1, col), (row, col + 1)):
+                if r < mask.shape[0] and c < mask.shape[1] and distance[r, c] >= 0:
+                    assert abs(estimate - alt((r, c), goal)) <= 1
+
+
+@pytest.mark.parametrize("engine", ["dict", "array", "flat"])
+def test_alt_search_is_shortest_and_expands_less(engine):
+    """Test that A* with ALT gives BFS-length paths with fewer expansions"""
+    mask = recursive_backtracker(31, seed=1)
+    alt = select_landmarks(mask, 6, mask=mask)
+    cells = np.argwhere(mask).tolist()
+    start, goal = tuple(cells[0]), tuple(cells[-1])
+
+    manhattan_stats, alt_stats = {}, {}
+    unified_search(mask, start, goal, PriorityQueue, manhattan_distance, mask=mask,
+                   engine=engine, stats=manhattan_stats, close_on_pop=True)
+    path, _ = unified_search(mask, start, goal, PriorityQueue, alt, mask=mask, engine=engine,
+                             stats=alt_stats, close_on_pop=True)
+    expected, _ = breath_first_search(mask, start, goal, mask=mask)
+
+    assert len(path) == len(expected)
+    assert alt_stats["expanded"] < manhattan_stats["expanded"]
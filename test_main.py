@@ -0,0 +1,41 @@
+import numpy as np
+from PIL import Image
+from main import *
+
+
+def painted(tmp_path, path, visited, pixels, **options):
+    out = tmp_path / "out.png"
+    create_image(path, visited, pixels, str(out), **options)
+    return np.array(Image.open(out))
+
+
+def test_create_image_dict_visited(tmp_path):
+    """Test that visited pixels are green and path pixels red, original untouched"""
+    pixels = np.full((3, 3, 3), 255, dtype=np.uint8)
+    result = painted(tmp_path, [(0, 0), (0, 1)], {(0, 0): True, (0, 1): True, (1, 1): True},
+                     pixels)
+
+    assert result[0, 0].tolist() == [255, 0, 0]
+    assert result[0, 1].tolist() == [255, 0, 0]
+    assert result[1, 1].tolist() == [0, 255, 0]
+    assert result[2, 2].tolist() == [255, 255, 255]
+    assert (pixels == 255).all()
+
+
+def test_create_image_mask_visited(tmp_path):
+    """Test that an array-backed visited mask paints the same as a dictionary"""
+    pixels = np.full((4, 4, 3), 255, dtype=np.uint8)
+    path, visited = breath_first_search(pixels, (0, 0), (3, 3), engine="array")
+    from_mask = painted(tmp_path, path, visited, pixels)
+    from_dict = painted(tmp_path, path, dict.fromkeys(visited, True), pixels)
+
+    assert (from_mask == from_dict).all()
+
+
+def test_create_image_in_place(tmp_path):
+    """Test that in place painting writes into the given array"""
+    pixels = np.full((2, 2, 3), 255, dtype=np.uint8)
+    painted(tmp_path, [(1, 1)], {}, pixels, in_place=True)
+
+    assert pixels[1, 1].tolist() == [255, 0, 0]
+    assert pixels[0, 0].tolist() == [255, 255, 255]
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+from maze import *
+from search import best_first_search, breath_first_search
+
+OPEN = (255, 255, 255)
+WALL = (100, 100, 100)
+
+IMAGE = np.array([
+    [OPEN, OPEN, OPEN, OPEN],
+    [WALL, WALL, OPEN, WALL],
+    [OPEN, OPEN, OPEN, OPEN]
+], dtype=np.uint8)
+
+
+def test_maze_from_file():
+    """Test loading the sample maze image"""
+    maze = Maze.from_file("maze.bmp")
+
+    assert maze.pixels.shape == (19, 19, 3)
+    assert maze.mask.shape == (19, 19)
+    assert (maze.height, maze.width) == (19, 19)
+
+
+@pytest.mark.parametrize("algorithm, search_func", [("bfs", breath_first_search),
+                                                    ("astar", best_first_search)])
+def test_maze_solve_matches_search(algorithm, search_func):
+    """Test that Maze.solve gives the same result as calling the search directly"""
+    maze = Maze(IMAGE)
+    assert maze.solve((0, 0), (2, 0), algorithm) == search_func(IMAGE, (0, 0), (2, 0))
+
+
+def test_maze_solve_many_streams_in_order():
+    """Test that solve_many yields one result per pair as pairs are consumed"""
+    maze = Maze(IMAGE)
+    consumed = []
+
+    def pairs():
+        for pair in [((0, 0), (2, 0)), ((2, 3), (0, 3)), ((0, 0), (1, 0))]:
+            consumed.append(pair)
+            yield pair
+
+    results = maze.solve_many(pairs(), algorithm="astar")
+    start, goal, path, visited = next(results)
+    assert len(consumed) == 1
+    assert (start, goal, len(path)) == ((0, 0), (2, 0), 7)
+
+    rest = [(start, goal, len(path)) for start, goal, path, _ in results]
+    assert rest == [((2, 3), (0, 3), 5), ((0, 0), (1, 0), 0)]
+
+
+def test_maze_solve_options():
+    """Test that search options are passed through"""
+    maze = Maze(IMAGE)
+    stats = {}
+    path, visited = maze.solve((0, 0), (2, 3), "bfs", engine="frontier")
+    maze.solve((0, 0), (2, 3), "jps", stats=stats)
+
+    assert len(path) == 6
+    assert stats["expanded"] > 0
+
+
+def test_maze_digest_follows_mask_content():
+    """Test that mazes with the same passable pixels share a digest"""
+    maze = Maze(IMAGE)
+
+    assert maze.digest() == Maze(mask=maze.mask.copy()).digest()
+    assert maze.digest() != Maze(mask=maze.mask.T.copy()).digest()
+    assert maze.digest() != Maze(mask=~maze.mask).digest()
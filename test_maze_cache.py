@@ -0,0 +1,129 @@
+import os
+import numpy as np
+import pytest
+import maze_cache
+from PIL import Image
+from maze import Maze
+from maze_cache import cache_path, load_maze_cache, read_cache_header
+from search import passability_mask
+
+OPEN = (255, 255, 255)
+WALL = (100, 100, 100)
+
+IMAGE = np.array([
+    [OPEN, OPEN, OPEN, OPEN, OPEN],
+    [WALL, WALL, OPEN, WALL, WALL],
+    [OPEN, OPEN, OPEN, WALL, OPEN]
+], dtype=np.uint8)
+
+
+def save_image(path, pixels):
+    Image.fromarray(pixels).save(path)
+    return path
+
+
+def test_cache_built_on_first_load(tmp_path):
+    """Test that loading writes a cache next to the image with the right mask"""
+    image_path = save_image(tmp_path / "maze.bmp", IMAGE)
+    grid, labels = load_maze_cache(image_path)
+
+    assert os.path.exists(cache_path(image_path))
+    assert labels is None
+    assert (grid.unpack() == passability_mask(IMAGE)).all()
+
+
+def test_cache_reused_when_image_unchanged(tmp_path):
+    """Test that a second load maps the existing cache instead of rebuilding it"""
+    image_path = save_image(tmp_path / "maze.bmp", IMAGE)
+    load_maze_cache(image_path)
+    before = os.stat(cache_path(image_path)).st_mtime_ns
+
+    load_maze_cache(image_path)
+    assert os.stat(cache_path(image_path)).st_mtime_ns == before
+
+
+def test_cache_rebuilt_when_image_changes(tmp_path):
+    """Test that editing the image invalidates the cache"""
+    image_path = save_image(tmp_path / "maze.bmp", IMAGE)
+    load_maze_cache(image_path)
+
+    changed = IMAGE.copy()
+    changed[1, 0] = OPEN
+    save_image(image_path, changed)
+    grid, _ = load_maze_cache(image_path)
+    assert (grid.unpack() == passability_mask(changed)).all()
+
+
+def test_cache_survives_touch(tmp_path):
+    """Test that a new modification time with the same contents keeps the cache valid"""
+    image_path = save_image(tmp_path / "maze.bmp", IMAGE)
+    load_maze_cache(image_path)
+    os.utime(image_path, ns=(0, 0))
+
+    header = read_cache_header(cache_path(image_path))
+    grid, _ = load_maze_cache(image_path)
+    assert read_cache_header(cache_path(image_path)) == dict(header, mtime=0)
+    assert (grid.unpack() == passability_mask(IMAGE)).all()
+
+
+def test_touch_recorded_so_next_load_skips_hash(tmp_path, monkeypatch):
+    """Test that a digest match stores the new modification time in the header"""
+    image_path = save_image(tmp_path / "maze.bmp", IMAGE)
+    load_maze_cache(image_path)
+    os.utime(image_path, ns=(0, 0))
+    load_maze_cache(image_path)
+
+    def no_hashing(path):
+        raise AssertionError("image hashed again")
+
+    monkeypatch.setattr(maze_cache, "file_digest", no_hashing)
+    grid, _ = load_maze_cache(image_path)
+    assert (grid.unpack() == passability_mask(IMAGE)).all()
+
+
+def test_truncated_cache_rebuilt(tmp_path):
+    """Test that a cache cut short (crash, full disk) is rebuilt instead of mapped"""
+    image_path = save_image(tmp_path / "maze.bmp", IMAGE)
+    load_maze_cache(image_path, labels=True)
+    with open(cache_path(image_path), "r+b") as cache:
+        cache.truncate(os.path.getsize(cache_path(image_path)) - 8)
+
+    assert read_cache_header(cache_path(image_path)) is None
+    grid, labels = load_maze_cache(image_path, labels=True)
+    assert (grid.unpack() == passability_mask(IMAGE)).all()
+    assert labels.tolist() == [[1, 1, 1, 1, 1], [0, 0, 1, 0, 0], [1, 1, 1, 0, 2]]
+
+
+def test_failed_write_leaves_no_temporary_file(tmp_path, monkeypatch):
+    """Test that a failing rebuild removes its uniquely named temporary file"""
+    image_path = save_image(tmp_path / "maze.bmp", IMAGE)
+
+    def failing_pack(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(maze_cache, "pack_image_rows", failing_pack)
+    with pytest.raises(OSError):
+        load_maze_cache(image_path)
+    assert sorted(os.listdir(tmp_path)) == ["maze.bmp"]
+
+
+def test_cache_adds_labels_when_requested(tmp_path):
+    """Test that asking for labels upgrades a cache built without them"""
+    image_path = save_image(tmp_path / "maze.bmp", IMAGE)
+    load_maze_cache(image_path)
+
+    _, labels = load_maze_cache(image_path, labels=True)
+    assert labels.tolist() == [[1, 1, 1, 1, 1], [0, 0, 1, 0, 0], [1, 1, 1, 0, 2]]
+
+
+def test_maze_from_cache_matches_from_file(tmp_path):
+    """Test that a cached maze answers queries like one decoded from the image"""
+    image_path = save_image(tmp_path / "maze.bmp", IMAGE)
+    Maze.from_cache(image_path)
+    cached = Maze.from_cache(image_path)
+    decoded = Maze.from_file(image_path)
+
+    assert cached.pixels is None
+    assert (cached.mask == decoded.mask).all()
+    assert cached.solve((0, 0), (2, 0)) == decoded.solve((0, 0), (2, 0))
+    assert cached.solve((0, 0), (2, 4)) == ([], {})
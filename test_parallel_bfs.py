@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+import parallel_bfs
+from benchmarks.mazes import open_rooms, random_noise, recursive_backtracker
+from distance_field import distance_field
+from parallel_bfs import parallel_distances
+from search import breath_first_search
+
+MAZES = {
+    "noise": random_noise(60, 0.3, seed=2),
+    "backtracker": recursive_backtracker(41, seed=3),
+    "rooms": open_rooms(96, room=16),
+    "open": np.ones((7, 90), dtype=bool),
+}
+
+
+@pytest.mark.parametrize("name", sorted(MAZES))
+@pytest.mark.parametrize("threads, bands", [(1, None), (2, None), (4, 7), (3, 500)])
+def test_parallel_distances_match_distance_field(name, threads, bands, monkeypatch):
+    """Test banded distances against a single flood, with the pool always used"""
+    monkeypatch.setattr(parallel_bfs, "PARALLEL_FRONTIER", 1)
+    mask = MAZES[name]
+    source = tuple(np.argwhere(mask)[len(np.argwhere(mask)) // 2])
+
+    distance = parallel_distances(mask, source, mask=mask, threads=threads, bands=bands)
+    expected = distance_field(mask, source, mask=mask).distance
+    assert distance.dtype == np.int32
+    assert np.array_equal(distance, expected)
+
+
+def test_parallel_distances_match_bfs_path_lengths():
+    """Test that distances equal breath_first_search path lengths"""
+    mask = MAZES["noise"]
+    distance = parallel_distances(mask, (0, 0), mask=mask, threads=2)
+    rng = np.random.default_rng(1)
+
+    for goal in np.argwhere(mask)[rng.integers(0, mask.sum(), size=20)].tolist():
+        path, _ = breath_first_search(mask, (0, 0), tuple(goal), mask=mask)
+        assert distance[tuple(goal)] == len(path) - 1
+
+
+def test_parallel_distances_from_wall():
+    """Test that a wall source reaches nothing"""
+    mask = np.array([[True, False, True]])
+    assert parallel_distances(mask, (0, 1), mask=mask).tolist() == [[-1, -1, -1]]
+    assert parallel_distances(mask, (0, 0), mask=mask).tolist() == [[0, -1, -1]]
@@ -0,0 +1,98 @@
+import numpy as np
+from benchmarks.mazes import random_noise
+from maze import Maze
+from path_cache import PIXEL_BYTES, PathCache
+
+OPEN = (255, 255, 255)
+WALL = (100, 100, 100)
+
+IMAGE = [
+    [OPEN, OPEN, OPEN, OPEN],
+    [WALL, WALL, OPEN, WALL],
+    [OPEN, OPEN, OPEN, WALL],
+    [WALL, WALL, WALL, OPEN]
+]
+
+
+def test_path_cache_repeats_and_reverses():
+    """Test exact, reversed and subpath hits against fresh searches"""
+    maze = Maze(np.array(IMAGE, dtype=np.uint8))
+    cache = PathCache()
+
+    first = cache.path(maze, (0, 0), (2, 0))
+    assert first == maze.solve((0, 0), (2, 0))[0]
+    assert cache.path(maze, (0, 0), (2, 0)) == first
+    assert cache.path(maze, (2, 0), (0, 0)) == first[::-1]
+    assert cache.path(maze, (0, 1), (2, 1)) == first[1:-1]
+    assert cache.path(maze, (2, 2), (0, 2)) == [(2, 2), (1, 2), (0, 2)]
+
+    assert cache.counters == {"hits": 1, "reversed": 2, "subpaths": 1, "misses": 1,
+                              "evictions": 0}
+    assert cache.hit_rate() == 4 / 5
+    assert len(cache) == 1
+
+
+def test_path_cache_never_uses_wall_start_as_goal():
+    """Test that a path starting on a wall is not reversed into a path to the wall"""
+    maze = Maze(np.array(IMAGE, dtype=np.uint8))
+    cache = PathCache()
+
+    assert cache.path(maze, (1, 0), (2, 2)) == maze.solve((1, 0), (2, 2))[0]
+    assert cache.path(maze, (2, 2), (1, 0)) == []
+    assert cache.counters["reversed"] == 0 and cache.counters["misses"] == 2
+    assert cache.path(maze, (2, 2), (1, 0)) == []
+    assert cache.counters["hits"] == 1
+
+
+def test_path_cache_keeps_algorithms_and_mazes_apart():
+    """Test that weighted results are only reused exactly and mazes do not mix"""
+    maze = Maze(np.array(IMAGE, dtype=np.uint8))
+    cache = PathCache()
+
+    cache.path(maze, (0, 0), (2, 0), "astar", weight=2)
+    cache.path(maze, (2, 0), (0, 0), "astar", weight=2)
+    cache.path(maze, (0, 0), (2, 0), "bfs")
+    assert cache.counters["misses"] == 3
+
+    other = Maze(mask=np.ones((4, 4), dtype=bool))
+    assert cache.path(other, (0, 0), (2, 0)) == [(0, 0), (1, 0), (2, 0)]
+    assert cache.counters["misses"] == 4
+
+
+def test_path_cache_evicts_least_recently_used():
+    """Test that the cache stays within its budget and drops the oldest paths"""
+    maze = Maze(mask=np.ones((8, 8), dtype=bool))
+    cache = PathCache(budget=10 * PIXEL_BYTES)
+
+    cache.path(maze, (0, 0), (0, 3))
+    cache.path(maze, (7, 0), (7, 3))
+    cache.path(maze, (0, 0), (0, 3))
+    cache.path(maze, (4, 0), (4, 3))
+
+    digest = maze.digest()
+    assert (digest, "bfs", (), (7, 0), (7, 3)) not in cache
+    assert (digest, "bfs", (), (0, 0), (0, 3)) in cache
+    assert cache.counters["evictions"] == 1
+    assert cache.nbytes == 8 * PIXEL_BYTES
+    assert cache.path(maze, (7, 1), (7, 2)) == [(7, 1), (7, 2)]
+    assert cache.counters["subpaths"] == 0
+
+
+def test_path_cache_matches_search_lengths():
+    """Test that every cached answer on a random maze has the searched length"""
+    mask = random_noise(24, 0.25, seed=3)
+    maze = Maze(mask=mask)
+    cache = PathCache()
+    rng = np.random.default_rng(0)
+    cells = [tuple(cell) for cell in np.argwhere(mask).tolist()]
+
+    for _ in range(200):
+        start, goal = (cells[i] for i in rng.integers(0, len(cells), size=2))
+        path = cache.path(maze, start, goal)
+        expected, _ = maze.solve(start, goal)
+        assert len(path) == len(expected)
+        if path:
+            assert path[0] == start and path[-1] == goal
+            for (r1, c1), (r2, c2) in zip(path, path[1:]):
+                assert abs(r1 - r2) + abs(c1 - c2) == 1 and mask[r2, c2]
+    assert cache.counters["reversed"] + cache.counters["subpaths"] > 0
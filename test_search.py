@@ -1,5 +1,7 @@
+import numpy as np
 import pytest
 from search import *
+from search_queue import BucketQueue
 
 #########################################################
 # Test cases for get_neighbors function
@@ -211,7 +213,12 @@ def test_manhattan_distance_identical_coordinates():
 # Breadth-First Search Tests
 # ============================================================================
 
-def test_bfs_simple_straight_path():
+# every breath_first_search engine; the BFS tests below run against each
+BFS_ENGINES = ["dict", "array", "frontier", "flat"]
+
+
+@pytest.mark.parametrize("engine", BFS_ENGINES)
+def test_bfs_simple_straight_path(engine):
     """Test BFS with a simple straight line path"""
     image = [
         [(255, 255, 255), (255, 255, 255), (255, 255, 255)],
@@ -220,7 +227,7 @@ def test_bfs_simple_straight_path():
     ]
     start = (0, 0)
     goal = (0, 2)
-    path, visited = breath_first_search(image, start, goal)
+    path, visited = breath_first_search(image, start, goal, engine=engine)
     
     assert len(path) == 3
     assert path[0] == start
@@ -228,7 +235,8 @@ def test_bfs_simple_straight_path():
     assert (0, 1) in path  # Should go through middle
 
 
-def test_bfs_path_with_obstacle():
+@pytest.mark.parametrize("engine", BFS_ENGINES)
+def test_bfs_path_with_obstacle(engine):
     """Test BFS pathfinding around an obstacle"""
     image = [
         [(255, 0, 0), (100, 100, 100), (255, 0, 0)],  # obstacle in middle
@@ -237,14 +245,15 @@ def test_bfs_path_with_obstacle():
     ]
     start = (0, 0)
     goal = (0, 2)
-    path, visited = breath_first_search(image, start, goal)
+    path, visited = breath_first_search(image, start, goal, engine=engine)
     
     # Path must go around the obstacle
     assert len(path) > 3  # Longer than direct path
     assert (0, 1) not in path  # Can't go through obstacle
 
 
-def test_bfs_no_path_exists():
+@pytest.mark.parametrize("engine", BFS_ENGINES)
+def test_bfs_no_path_exists(engine):
     """Test BFS when goal is unreachable"""
     image = [
         [(255, 0, 0), (100, 100, 100), (255, 0, 0)],
@@ -253,24 +262,26 @@ def test_bfs_no_path_exists():
     ]
     start = (0, 0)
     goal = (0, 2)
-    path, visited = breath_first_search(image, start, goal)
+    path, visited = breath_first_search(image, start, goal, engine=engine)
     
     assert path == []
     assert goal not in visited
 
 
-def test_bfs_start_equals_goal():
+@pytest.mark.parametrize("engine", BFS_ENGINES)
+def test_bfs_start_equals_goal(engine):
     """Test BFS when start and goal are the same"""
     image = [[(255, 255, 255)]]
     start = (0, 0)
     goal = (0, 0)
-    path, visited = breath_first_search(image, start, goal)
+    path, visited = breath_first_search(image, start, goal, engine=engine)
     
     assert len(path) == 1
     assert path[0] == start
 
 
-def test_bfs_large_maze():
+@pytest.mark.parametrize("engine", BFS_ENGINES)
+def test_bfs_large_maze(engine):
     """Test BFS on a larger grid"""
     image = [
         [(255, 0, 0), (255, 0, 0), (255, 0, 0), (255, 0, 0), (255, 0, 0)],
@@ -281,14 +292,15 @@ def test_bfs_large_maze():
     ]
     start = (0, 0)
     goal = (4, 4)
-    path, visited = breath_first_search(image, start, goal)
+    path, visited = breath_first_search(image, start, goal, engine=engine)
     
     assert len(path) > 0
     assert path[0] == start
     assert path[-1] == goal
 
 
-def test_bfs_visited_dictionary():
+@pytest.mark.parametrize("engine", BFS_ENGINES)
+def test_bfs_visited_dictionary(engine):
     """Test that BFS visited dictionary is correctly populated"""
     image = [
         [(255, 255, 255), (255, 255, 255)],
@@ -296,7 +308,7 @@ def test_bfs_visited_dictionary():
     ]
     start = (0, 0)
     goal = (1, 1)
-    path, visited = breath_first_search(image, start, goal)
+    path, visited = breath_first_search(image, start, goal, engine=engine)
     
     assert start in visited
     assert goal in visited
@@ -304,18 +316,20 @@ def test_bfs_visited_dictionary():
     assert visited[goal] == True
 
 
-def test_bfs_single_pixel_image():
+@pytest.mark.parametrize("engine", BFS_ENGINES)
+def test_bfs_single_pixel_image(engine):
     """Test BFS with a 1x1 image"""
     image = [[(200, 200, 200)]]
     start = (0, 0)
     goal = (0, 0)
-    path, visited = breath_first_search(image, start, goal)
+    path, visited = breath_first_search(image, start, goal, engine=engine)
     
     assert path == [(0, 0)]
     assert visited[(0, 0)] == True
 
 
-def test_bfs_diagonal_path():
+@pytest.mark.parametrize("engine", BFS_ENGINES)
+def test_bfs_diagonal_path(engine):
     """Test BFS diagonal path (requires multiple steps, not direct diagonal)"""
     image = [
         [(255, 0, 0), (255, 0, 0), (255, 0, 0)],
@@ -324,7 +338,7 @@ def test_bfs_diagonal_path():
     ]
     start = (0, 0)
     goal = (2, 2)
-    path, visited = breath_first_search(image, start, goal)
+    path, visited = breath_first_search(image, start, goal, engine=engine)
     
     assert len(path) == 5  # Manhattan distance of 4, plus start
     assert path[0] == start
@@ -567,3 +581,462 @@ def test_narrow_corridor(search_func):
     assert path[-1] == goal
     # Must go through the middle row
     assert any(p[0] == 1 for p in path)
+
+
+# ============================================================================
+# Passability Mask Tests
+# ============================================================================
+
+def test_passability_mask_threshold():
+    """Test that the mask applies the R > 100 or G > 100 or B > 100 rule"""
+    image = [
+        [(101, 0, 0), (0, 101, 0), (0, 0, 101)],
+        [(100, 100, 100), (0, 0, 0), (255, 255, 255)]
+    ]
+    mask = passability_mask(image)
+
+    assert mask.shape == (2, 3)
+    assert mask.tolist() == [[True, True, True], [False, False, True]]
+
+
+def test_passability_mask_passthrough():
+    """Test that an existing boolean mask is returned unchanged"""
+    mask = np.array([[True, False], [False, True]])
+    assert passability_mask(mask) is mask
+
+
+def test_get_mask_neighbors_matches_get_neighbors():
+    """Test that mask lookups give the same neighbors, in order, as pixel checks"""
+    image = [
+        [(255, 255, 255), (50, 50, 50), (255, 0, 0)],
+        [(0, 255, 0), (50, 50, 50), (0, 0, 255)],
+        [(255, 255, 255), (255, 255, 255), (50, 50, 50)]
+    ]
+    passable = flat_passable(passability_mask(image))
+    for row in range(3):
+        for col in range(3):
+            expected = get_neighbors((row, col), image)
+            assert get_mask_neighbors((row, col), passable, 3, 3) == expected
+
+
+@pytest.mark.parametrize("search_func", [breath_first_search, best_first_search])
+def test_search_with_precomputed_mask(search_func):
+    """Test that passing a prebuilt mask gives the same result as the image"""
+    image = [
+        [(255, 0, 0), (100, 100, 100), (255, 0, 0)],
+        [(255, 0, 0), (255, 0, 0), (255, 0, 0)],
+        [(255, 0, 0), (255, 0, 0), (255, 0, 0)]
+    ]
+    mask = passability_mask(image)
+
+    assert search_func(image, (0, 0), (0, 2), mask=mask) == search_func(image, (0, 0), (0, 2))
+
+
+# ============================================================================
+# Search Engine Tests
+# ============================================================================
+
+OPEN = (255, 255, 255)
+WALL = (100, 100, 100)
+
+# (image, start, goal) cases every engine must agree on
+ENGINE_CASES = [
+    ([[OPEN, OPEN, OPEN], [OPEN, OPEN, OPEN], [OPEN, OPEN, OPEN]], (0, 0), (2, 2)),
+    ([[OPEN, WALL, OPEN], [OPEN, OPEN, OPEN], [OPEN, OPEN, OPEN]], (0, 0), (0, 2)),
+    ([[OPEN, WALL, OPEN], [OPEN, WALL, OPEN], [OPEN, WALL, OPEN]], (0, 0), (0, 2)),
+    ([[OPEN]], (0, 0), (0, 0)),
+    ([[OPEN, OPEN, OPEN, OPEN, OPEN],
+      [OPEN, WALL, WALL, WALL, OPEN],
+      [OPEN, OPEN, OPEN, WALL, OPEN],
+      [OPEN, WALL, OPEN, WALL, OPEN],
+      [OPEN, OPEN, OPEN, OPEN, OPEN]], (2, 2), (0, 4)),
+    ([[WALL, OPEN, OPEN], [WALL, WALL, OPEN], [OPEN, OPEN, OPEN]], (0, 0), (2, 0)),
+]
+
+
+# (search function, engine) pairs checked against the default dict engine
+ENGINES = [
+    (breath_first_search, "array"),
+    (best_first_search, "array"),
+    (breath_first_search, "frontier"),
+    (breath_first_search, "flat"),
+    (best_first_search, "flat"),
+]
+
+
+@pytest.mark.parametrize("search_func, engine", ENGINES)
+@pytest.mark.parametrize("image, start, goal", ENGINE_CASES)
+def test_engine_matches_dict_engine(search_func, engine, image, start, goal):
+    """Test that each engine finds paths of the same length as the dict engine"""
+    path, visited = search_func(image, start, goal)
+    engine_path, engine_visited = search_func(image, start, goal, engine=engine)
+
+    assert len(engine_path) == len(path)
+    if path:
+        assert engine_path[0] == start
+        assert engine_path[-1] == goal
+    assert (goal in engine_visited) == (goal in visited)
+
+
+@pytest.mark.parametrize("search_func, engine", ENGINES)
+def test_engine_random_grid(search_func, engine):
+    """Test engines on a random grid big enough for wide BFS levels"""
+    mask = np.random.default_rng(7).random((120, 120)) > 0.25
+    for start, goal in [((0, 0), (119, 119)), ((60, 3), (2, 100)), ((119, 0), (0, 119))]:
+        path, _ = search_func(mask, start, goal)
+        engine_path, _ = search_func(mask, start, goal, engine=engine)
+
+        assert len(engine_path) == len(path)
+        for a, b in zip(engine_path, engine_path[1:]):
+            assert manhattan_distance(a, b) == 1
+            assert mask[b]
+
+
+def test_frontier_engine_stats():
+    """Test that the frontier engine records how many pixels its flood reached"""
+    mask = np.ones((10, 10), dtype=bool)
+    stats = {}
+    path, visited = breath_first_search(mask, (0, 0), (9, 9), engine="frontier", stats=stats)
+
+    assert len(path) == 19
+    assert stats["expanded"] == len(visited) == 100
+
+
+def test_array_engine_visited_mapping():
+    """Test that the array engine's visited behaves like the visited dictionary"""
+    image = [[OPEN, OPEN], [OPEN, WALL]]
+    path, visited = breath_first_search(image, (0, 0), (1, 0), engine="array")
+
+    assert visited[(0, 0)] == True
+    assert (1, 1) not in visited
+    assert (5, 5) not in visited
+    assert sorted(visited) == [(0, 0), (0, 1), (1, 0)]
+    assert len(visited) == 3
+    with pytest.raises(KeyError):
+        visited[(1, 1)]
+
+
+@pytest.mark.parametrize("search_func", [breath_first_search, best_first_search])
+@pytest.mark.parametrize("image, start, goal", ENGINE_CASES)
+def test_flat_engine_identical_to_dict_engine(search_func, image, start, goal):
+    """Test that the flat engine returns the same path, visited set and stats"""
+    stats, flat_stats = {}, {}
+    path, visited = search_func(image, start, goal, stats=stats)
+    flat_path, flat_visited = search_func(image, start, goal, engine="flat", stats=flat_stats)
+
+    assert flat_path == path
+    assert set(flat_visited) == set(visited)
+    assert flat_stats == stats
+
+
+def test_flat_engine_non_inlined_heuristic():
+    """Test the flat heap loop with a heuristic it cannot inline"""
+    mask = np.random.default_rng(3).random((40, 40)) > 0.25
+    start, goal = (0, 0), (39, 39)
+    expected, _ = best_first_search(mask, start, goal)
+    heuristic = lambda v, g: manhattan_distance(v, g)
+
+    path, _ = unified_search(mask, start, goal, PriorityQueue, heuristic, engine="flat",
+                             close_on_pop=True)
+    assert len(path) == len(expected)
+    path, visited = unified_search(mask, start, goal, PriorityQueue, heuristic, engine="flat")
+    assert path == unified_search(mask, start, goal, PriorityQueue, manhattan_distance)[0]
+
+
+def test_flat_engine_rejects_what_it_cannot_run():
+    """Test that the flat engine refuses other queue types and SearchStats tracing"""
+    class LIFOPriorityQueue(PriorityQueue):
+        pass
+
+    for queue_type in (BucketQueue, LIFOPriorityQueue):
+        for close_on_pop in (False, True):
+            with pytest.raises(ValueError):
+                unified_search([[OPEN, OPEN]], (0, 0), (0, 1), queue_type, manhattan_distance,
+                               engine="flat", close_on_pop=close_on_pop)
+    with pytest.raises(TypeError):
+        breath_first_search([[OPEN, OPEN]], (0, 0), (0, 1), engine="flat", stats=SearchStats())
+
+
+def test_unknown_engine():
+    """Test that an unknown engine name is rejected"""
+    with pytest.raises(ValueError):
+        breath_first_search([[OPEN]], (0, 0), (0, 0), engine="bogus")
+
+
+# ============================================================================
+# Bidirectional Search Tests
+# ============================================================================
+
+@pytest.mark.parametrize("search_func", [breath_first_search, best_first_search])
+@pytest.mark.parametrize("image, start, goal", ENGINE_CASES)
+def test_bidirectional_matches_unidirectional(search_func, image, start, goal):
+    """Test that bidirectional search finds a path of the same length"""
+    path, _ = search_func(image, start, goal)
+    bi_path, bi_visited = search_func(image, start, goal, bidirectional=True)
+
+    assert len(bi_path) == len(path)
+    if path:
+        assert bi_path[0] == start
+        assert bi_path[-1] == goal
+        assert goal in bi_visited
+
+
+@pytest.mark.parametrize("search_func", [breath_first_search, best_first_search])
+def test_bidirectional_random_grids(search_func):
+    """Test bidirectional shortest paths on random grids, including wall starts"""
+    rng = np.random.default_rng(3)
+    for _ in range(30):
+        mask = rng.random((15, 15)) > 0.35
+        start = tuple(int(x) for x in rng.integers(0, 15, 2))
+        goal = tuple(int(x) for x in rng.integers(0, 15, 2))
+        path, _ = breath_first_search(mask, start, goal)
+        bi_path, _ = search_func(mask, start, goal, bidirectional=True)
+
+        assert len(bi_path) == len(path)
+        for a, b in zip(bi_path, bi_path[1:]):
+            assert manhattan_distance(a, b) == 1
+            assert mask[b]
+
+
+def test_bidirectional_bfs_expands_fewer_nodes():
+    """Test that meeting in the middle expands fewer nodes than one frontier"""
+    mask = np.ones((40, 40), dtype=bool)
+    stats, bi_stats = {}, {}
+    breath_first_search(mask, (0, 0), (39, 39), stats=stats)
+    breath_first_search(mask, (0, 0), (39, 39), bidirectional=True, stats=bi_stats)
+
+    assert bi_stats["expanded"] == bi_stats["forward_expanded"] + bi_stats["backward_expanded"]
+    assert bi_stats["expanded"] < stats["expanded"]
+
+
+# ============================================================================
+# A* Open/Closed Set Tests
+# ============================================================================
+
+def test_priority_queue_skips_stale_entries():
+    """Test that re-inserting a vertex replaces its old priority"""
+    queue = PriorityQueue()
+    queue.insert((0, 0), 5)
+    queue.insert((1, 1), 3)
+    queue.insert((0, 0), 1)
+
+    assert len(queue) == 2
+    assert queue.min_priority() == 1
+    assert queue.pop() == (0, 0)
+    assert queue.pop() == (1, 1)
+    assert queue.is_empty()
+
+
+def test_priority_queue_empty_with_only_stale_entries():
+    """Test that a queue holding only stale heap entries reports empty"""
+    queue = PriorityQueue()
+    queue.insert((0, 0), 2)
+    queue.insert((0, 0), 1)
+    queue.pop()
+
+    assert queue.is_empty()
+    assert len(queue) == 0
+
+
+def test_astar_stats_open_and_closed():
+    """Test that A* reports open and closed sizes, and visited is the closed set"""
+    mask = np.ones((10, 10), dtype=bool)
+    stats = {}
+    path, visited = best_first_search(mask, (0, 0), (9, 9), stats=stats)
+
+    assert len(path) == 19
+    assert stats["closed"] == len(visited)
+    assert stats["expanded"] == stats["closed"]
+    assert stats["open"] >= 0
+    assert (9, 9) in visited
+
+
+def test_astar_stops_when_goal_popped():
+    """Test that A* stops once the goal is expanded, not when it is first pushed"""
+    image = [
+        [OPEN, OPEN, OPEN],
+        [OPEN, OPEN, OPEN]
+    ]
+    stats = {}
+    path, visited = unified_search(image, (0, 0), (0, 1), PriorityQueue, manhattan_distance,
+                                   stats=stats, close_on_pop=True)
+
+    assert path == [(0, 0), (0, 1)]
+    assert stats["expanded"] == 2
+
+
+@pytest.mark.parametrize("engine", ["dict", "array"])
+def test_astar_inconsistent_heuristic(engine):
+    """Test that reopening closed pixels keeps paths shortest with an inconsistent heuristic"""
+    def patchy(vertex, goal):
+        # admissible, but jumps between 0 and the full distance
+        return manhattan_distance(vertex, goal) if (vertex[0] * 7 + vertex[1]) % 3 else 0
+
+    rng = np.random.default_rng(5)
+    for _ in range(30):
+        mask = rng.random((12, 12)) > 0.3
+        start = tuple(int(x) for x in rng.integers(0, 12, 2))
+        goal = tuple(int(x) for x in rng.integers(0, 12, 2))
+        expected, _ = breath_first_search(mask, start, goal)
+        path, _ = unified_search(mask, start, goal, PriorityQueue, patchy, engine=engine,
+                                 close_on_pop=True)
+
+        assert len(path) == len(expected)
+
+
+# ============================================================================
+# BucketQueue Tests
+# ============================================================================
+
+def test_bucket_queue_order_and_ties():
+    """Test that BucketQueue pops lowest priority first, ties in insertion order"""
+    queue = BucketQueue()
+    queue.insert("a", 3)
+    queue.insert("b", 1)
+    queue.insert("c", 3)
+    queue.insert("d", 1)
+
+    assert [queue.pop() for _ in range(4)] == ["b", "d", "a", "c"]
+    assert queue.is_empty()
+
+
+def test_bucket_queue_insert_below_cursor():
+    """Test that a priority lower than the last pop is still popped next"""
+    queue = BucketQueue()
+    queue.insert("a", 5)
+    queue.insert("b", 6)
+    assert queue.pop() == "a"
+    queue.insert("c", 2)
+
+    assert queue.min_priority() == 2
+    assert queue.pop() == "c"
+    assert queue.pop() == "b"
+
+
+def test_bucket_queue_skips_stale_entries():
+    """Test that re-inserting a vertex replaces its old priority"""
+    queue = BucketQueue()
+    queue.insert("a", 4)
+    queue.insert("b", 3)
+    queue.insert("a", 1)
+
+    assert len(queue) == 2
+    assert queue.pop() == "a"
+    assert queue.pop() == "b"
+    assert queue.is_empty()
+
+
+@pytest.mark.parametrize("priority", [-1, 2.5, 3.0, None])
+def test_bucket_queue_rejects_bad_priority(priority):
+    """Test that BucketQueue only accepts non-negative integer priorities"""
+    queue = BucketQueue()
+    with pytest.raises(ValueError):
+        queue.insert("a", priority)
+    assert queue.is_empty()
+
+
+def test_bucket_queue_empty():
+    """Test that popping or peeking an empty BucketQueue raises IndexError"""
+    queue = BucketQueue()
+    queue.insert("a", 2)
+    queue.insert("a", 1)
+    queue.pop()
+
+    with pytest.raises(IndexError):
+        queue.pop()
+    with pytest.raises(IndexError):
+        queue.min_priority()
+
+
+@pytest.mark.parametrize("engine", ["dict", "array"])
+@pytest.mark.parametrize("image, start, goal", ENGINE_CASES)
+def test_bucket_queue_search(engine, image, start, goal):
+    """Test that unified_search finds shortest paths with BucketQueue as queue_type"""
+    expected, _ = breath_first_search(image, start, goal)
+    path, _ = unified_search(image, start, goal, BucketQueue, manhattan_distance,
+                             engine=engine, close_on_pop=True)
+    bfs_path, _ = unified_search(image, start, goal, BucketQueue, engine=engine)
+
+    assert len(path) == len(expected)
+    assert len(bfs_path) == len(expected)
+
+
+# ============================================================================
+# Weighted A* Tests
+# ============================================================================
+
+@pytest.mark.parametrize("engine", ["dict", "array", "flat"])
+@pytest.mark.parametrize("weight", [1.2, 1.5, 2])
+def test_weighted_astar_within_bound(engine, weight):
+    """Test that weighted A* paths are valid and within the reported bound"""
+    mask = np.random.default_rng(12).random((60, 60)) > 0.2
+    start, goal = (0, 0), (59, 59)
+    shortest = len(best_first_search(mask, start, goal)[0]) - 1
+
+    stats = {}
+    path, _ = best_first_search(mask, start, goal, engine=engine, stats=stats, weight=weight)
+    assert path[0] == start and path[-1] == goal
+    for a, b in zip(path, path[1:]):
+        assert manhattan_distance(a, b) == 1
+        assert mask[b]
+    distance_scale, heuristic_scale = weight_ratio(weight)
+    assert 1 <= stats["bound"] <= heuristic_scale / distance_scale
+    assert len(path) - 1 <= stats["bound"] * shortest + 1e-9
+
+
+@pytest.mark.parametrize("engine", ["dict", "array", "flat"])
+def test_weighted_astar_bound_uses_effective_weight(engine, monkeypatch):
+    """Test that the bound is capped by the a / b the search ran with, not the requested weight"""
+    weights = []
+
+    def recording_bound(cost, weight, open_costs):
+        weights.append(weight)
+        return suboptimality_bound(cost, weight, open_costs)
+
+    monkeypatch.setattr("search.suboptimality_bound", recording_bound)
+    mask = np.ones((8, 8), dtype=np.bool_)
+    best_first_search(mask, (0, 0), (7, 7), engine=engine, stats={}, weight=1.999)
+    assert weight_ratio(1.999) == (1, 2)
+    assert weights == [2]
+
+
+def test_weighted_astar_expands_fewer_nodes():
+    """Test that a larger weight expands fewer nodes on an open grid"""
+    mask = np.ones((60, 60), dtype=np.bool_)
+    mask[10:50, 30] = False
+    plain, weighted = {}, {}
+    best_first_search(mask, (30, 0), (30, 59), stats=plain)
+    best_first_search(mask, (30, 0), (30, 59), stats=weighted, weight=2)
+
+    assert weighted["expanded"] < plain["expanded"]
+
+
+@pytest.mark.parametrize("engine", ["dict", "array", "flat"])
+def test_weighted_engines_agree(engine):
+    """Test that every engine expands the same nodes for the same weight"""
+    mask = np.random.default_rng(5).random((40, 40)) > 0.25
+    stats, engine_stats = {}, {}
+    path, _ = best_first_search(mask, (0, 0), (39, 39), stats=stats, weight=1.5)
+    engine_path, _ = best_first_search(mask, (0, 0), (39, 39), engine=engine,
+                                       stats=engine_stats, weight=1.5)
+
+    assert engine_path == path
+    assert engine_stats["expanded"] == stats["expanded"]
+
+
+def test_weighted_bucket_queue():
+    """Test that weighted priorities stay integers so BucketQueue works"""
+    mask = np.ones((20, 20), dtype=np.bool_)
+    path, _ = unified_search(mask, (0, 0), (19, 19), BucketQueue, manhattan_distance,
+                             close_on_pop=True, weight=1.5)
+    assert len(path) == 39
+
+
+def test_weight_errors():
+    """Test that weights below 1 and weights without close_on_pop are rejected"""
+    with pytest.raises(ValueError):
+        best_first_search([[OPEN]], (0, 0), (0, 0), weight=0.5)
+    with pytest.raises(ValueError):
+        unified_search([[OPEN]], (0, 0), (0, 0), PriorityQueue, manhattan_distance, weight=2)
+    with pytest.raises(ValueError):
+        best_first_search([[OPEN]], (0, 0), (0, 0), bidirectional=True, weight=2)
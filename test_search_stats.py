@@ -0,0 +1,95 @@
+import json
+import numpy as np
+import pytest
+from search import best_first_search, breath_first_search
+from search_stats import SearchStats
+
+MASK = np.ones((6, 6), dtype=np.bool_)
+MASK[1:5, 3] = False
+
+
+@pytest.mark.parametrize("search_func", [breath_first_search, best_first_search])
+def test_traced_search_same_result(search_func):
+    """Test that tracing does not change the path or visited pixels"""
+    traced = search_func(MASK, (0, 0), (5, 5), stats=SearchStats())
+    assert traced == search_func(MASK, (0, 0), (5, 5))
+
+
+def test_bfs_counters():
+    """Test queue and neighbor counters of a traced breadth first search"""
+    stats = SearchStats()
+    path, visited = breath_first_search(MASK, (0, 0), (5, 5), stats=stats)
+
+    assert stats["popped"] == stats["expanded"]
+    assert stats["pushed"] == len(visited)
+    assert stats["heuristic_calls"] == 0
+    assert 0 < stats["peak_queue"] <= stats["pushed"]
+    assert stats["neighbor_checks"] >= stats["expanded"] * 2
+    assert stats["neighbor_time"] > 0 and stats["reconstruct_time"] > 0
+
+
+def test_astar_counters():
+    """Test that A* counts one heuristic call per push after the start"""
+    stats = SearchStats()
+    best_first_search(MASK, (0, 0), (5, 5), stats=stats)
+
+    assert stats["heuristic_calls"] == stats["pushed"]
+    assert stats["popped"] >= stats["closed"]
+
+
+def test_timing_off():
+    """Test that timing=False leaves out the time counters"""
+    stats = SearchStats(timing=False)
+    breath_first_search(MASK, (0, 0), (5, 5), stats=stats)
+
+    assert "queue_time" not in stats
+    assert stats["popped"] > 0
+
+
+def test_on_pop_sampling():
+    """Test that on_pop is called for every sample_every-th popped vertex"""
+    popped = []
+    stats = SearchStats(on_pop=popped.append, sample_every=3)
+    breath_first_search(MASK, (0, 0), (5, 5), stats=stats)
+
+    assert len(popped) == stats["popped"] // 3
+    assert all(MASK[vertex] for vertex in popped)
+
+
+def test_sampling_keeps_exact_counts():
+    """Test that sample_every thins out the timing but not the pushed and popped counts"""
+    every = SearchStats()
+    best_first_search(MASK, (0, 0), (5, 5), stats=every)
+    sampled = SearchStats(sample_every=4)
+    best_first_search(MASK, (0, 0), (5, 5), stats=sampled)
+
+    assert sampled["pushed"] == every["pushed"]
+    assert sampled["popped"] == every["popped"]
+    assert 0 < sampled["peak_queue"] <= every["peak_queue"]
+    assert sampled["queue_time"] > 0
+
+
+def test_to_json():
+    """Test that the counters export as a JSON object"""
+    stats = SearchStats()
+    best_first_search(MASK, (0, 0), (5, 5), stats=stats)
+
+    assert json.loads(stats.to_json()) == dict(stats)
+
+
+@pytest.mark.parametrize("search_func, options", [
+    (breath_first_search, {"engine": "array"}),
+    (best_first_search, {"engine": "array"}),
+    (breath_first_search, {"engine": "flat"}),
+    (best_first_search, {"engine": "flat"}),
+    (breath_first_search, {"engine": "frontier"}),
+    (breath_first_search, {"bidirectional": True}),
+    (best_first_search, {"bidirectional": True}),
+])
+def test_untraceable_searches_reject_search_stats(search_func, options):
+    """Test that searches without tracing raise instead of leaving counters at zero"""
+    with pytest.raises(TypeError):
+        search_func(MASK, (0, 0), (5, 5), stats=SearchStats(), **options)
+    stats = {}
+    search_func(MASK, (0, 0), (5, 5), stats=stats, **options)
+    assert stats["expanded"] > 0
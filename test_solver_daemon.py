@@ -0,0 +1,192 @@
+import asyncio
+import json
+import os
+import shutil
+import numpy as np
+from PIL import Image
+from maze import Maze
+from solver_daemon import *
+
+OPEN = (255, 255, 255)
+WALL = (100, 100, 100)
+
+
+def write_maze(tmp_path):
+    image = np.array([
+        [OPEN, OPEN, OPEN, OPEN, OPEN],
+        [WALL, WALL, OPEN, WALL, OPEN],
+        [OPEN, OPEN, OPEN, WALL, OPEN],
+        [OPEN, WALL, OPEN, OPEN, OPEN]
+    ], dtype=np.uint8)
+    path = str(tmp_path / "small.bmp")
+    Image.fromarray(image).save(path)
+    return path
+
+
+# function: exchange
+# inputs:
+#   daemon: SolverDaemon
+#   socket_path: Unix socket to serve on
+#   lines: request lines, all written before any response is read
+# output:
+#   responses keyed by id
+async def exchange(daemon, socket_path, lines):
+    server = await asyncio.start_unix_server(daemon.serve_stream, path=socket_path)
+    async with server:
+        reader, writer = await asyncio.open_unix_connection(socket_path)
+        writer.write("".join(line + "\n" for line in lines).encode())
+        await writer.drain()
+        writer.write_eof()
+        responses = [json.loads(line) async for line in reader]
+        writer.close()
+    return {response["id"]: response for response in responses}
+
+
+def test_daemon_matches_maze_solve(tmp_path):
+    """Test that socket responses carry the same paths as Maze.solve"""
+    maze_path = write_maze(tmp_path)
+    queries = [
+        {"id": 1, "maze": maze_path, "start": [0, 0], "goal": [3, 0]},
+        {"id": 2, "maze": maze_path, "start": [3, 3], "goal": [0, 0], "algorithm": "astar"},
+        {"id": 3, "maze": maze_path, "start": [0, 0], "goal": [3, 4], "algorithm": "astar",
+         "options": {"engine": "flat"}},
+        {"id": 4, "maze": maze_path, "start": [0, 0], "goal": [1, 0]}
+    ]
+    responses = asyncio.run(exchange(SolverDaemon(), str(tmp_path / "s.sock"),
+                                     [json.dumps(query) for query in queries]))
+
+    maze = Maze.from_cache(maze_path)
+    for query in queries:
+        expected, _ = maze.solve(tuple(query["start"]), tuple(query["goal"]),
+                                 query.get("algorithm", "bfs"), **query.get("options", {}))
+        assert responses[query["id"]]["path"] == [list(pixel) for pixel in expected]
+        assert responses[query["id"]]["length"] == len(expected) - 1
+    assert responses[4]["length"] == -1
+
+
+def test_daemon_batches_pipelined_queries(tmp_path):
+    """Test that queries arriving together are solved as one batch"""
+    maze_path = write_maze(tmp_path)
+    starts = [[0, 0], [0, 4], [2, 0], [3, 4], [3, 2], [0, 0]]
+    lines = [json.dumps({"id": i, "maze": maze_path, "start": start, "goal": [3, 0]})
+             for i, start in enumerate(starts)]
+    daemon = SolverDaemon(batch_window=0.05)
+    responses = asyncio.run(exchange(daemon, str(tmp_path / "s.sock"), lines))
+
+    maze = Maze.from_cache(maze_path)
+    for i, start in enumerate(starts):
+        expected, _ = maze.solve(tuple(start), (3, 0), "bfs")
+        assert responses[i]["length"] == len(expected) - 1
+        assert responses[i]["path"][0] == start and responses[i]["path"][-1] == [3, 0]
+    assert daemon.counters["batches"] == 1
+    assert daemon.counters["queries"] == len(starts)
+    assert daemon.counters["fields"] == 1
+
+
+def test_daemon_reports_errors(tmp_path):
+    """Test that bad queries get error responses without stopping the daemon"""
+    maze_path = write_maze(tmp_path)
+    lines = [
+        "not json",
+        json.dumps({"id": 1, "maze": str(tmp_path / "missing.bmp"), "start": [0, 0],
+                    "goal": [0, 1]}),
+        json.dumps({"id": 2, "maze": maze_path, "start": [0, 9], "goal": [0, 1]}),
+        json.dumps({"id": 3, "maze": maze_path, "start": [0, 0], "goal": [0, 1],
+                    "algorithm": "teleport"}),
+        json.dumps({"id": 4, "maze": maze_path, "start": [0, 0]}),
+        json.dumps({"id": 5, "maze": maze_path, "start": [0, 0], "goal": [0, 1]}),
+        json.dumps({"id": 6, "command": "stats"})
+    ]
+    responses = asyncio.run(exchange(SolverDaemon(), str(tmp_path / "s.sock"), lines))
+
+    assert "error" in responses[None]
+    for i in range(1, 5):
+        assert "error" in responses[i]
+    assert responses[5]["path"] == [[0, 0], [0, 1]]
+    assert "queries" in responses[6]
+
+
+def test_daemon_answers_batch_around_malformed_queries(tmp_path):
+    """Test that unhashable or overflowing fields do not stall the rest of the batch"""
+    maze_path = write_maze(tmp_path)
+    lines = [
+        json.dumps({"id": 1, "maze": maze_path, "start": [0, 0], "goal": [0, 1]}),
+        json.dumps({"id": 2, "maze": maze_path, "start": [0, 0], "goal": [0, 1],
+                    "algorithm": ["bfs"]}),
+        json.dumps({"id": 3, "maze": maze_path, "start": [float("inf"), 0], "goal": [0, 1]}),
+        json.dumps({"id": 4, "maze": maze_path, "start": [0, 0], "goal": [0, 1],
+                    "algorithm": "astar", "options": {"weight": float("inf")}}),
+        json.dumps({"id": 5, "maze": maze_path, "start": [0, 0], "goal": [0, 1],
+                    "options": [1]})
+    ]
+    daemon = SolverDaemon(batch_window=0.05)
+    responses = asyncio.run(asyncio.wait_for(
+        exchange(daemon, str(tmp_path / "s.sock"), lines), 5))
+
+    assert responses[1]["path"] == [[0, 0], [0, 1]]
+    for i in range(2, 6):
+        assert "error" in responses[i]
+    assert daemon.counters["batches"] == 1
+
+
+def test_daemon_resolves_batch_when_solving_fails(tmp_path, monkeypatch):
+    """Test that an unexpected failure answers every query in the batch"""
+    maze_path = write_maze(tmp_path)
+    daemon = SolverDaemon(batch_window=0.05)
+
+    def fail(path, queries):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(daemon, "solve_batch", fail)
+    lines = [json.dumps({"id": i, "maze": maze_path, "start": [0, 0], "goal": [0, 1]})
+             for i in range(3)]
+    responses = asyncio.run(asyncio.wait_for(
+        exchange(daemon, str(tmp_path / "s.sock"), lines), 5))
+
+    assert all("boom" in responses[i]["error"] for i in range(3))
+
+
+def test_daemon_reloads_changed_maze(tmp_path):
+    """Test that a maze whose image changed on disk is reloaded on the next lookup"""
+    maze_path = write_maze(tmp_path)
+    daemon = SolverDaemon()
+    before = daemon.load(maze_path)
+    assert daemon.load(maze_path) is before
+
+    image = np.array(Image.open(maze_path))
+    image[1, 0] = OPEN
+    Image.fromarray(image).save(maze_path)
+    os.utime(maze_path, ns=(0, 0))
+    after = daemon.load(maze_path)
+
+    assert after is not before
+    assert after.mask[1, 0]
+    assert daemon.counters["reloads"] == 1
+
+
+def test_daemon_evicts_least_recently_used_maze(tmp_path):
+    """Test that at most max_mazes mazes stay loaded, dropping the least recently used"""
+    first = write_maze(tmp_path)
+    second, third = str(tmp_path / "second.bmp"), str(tmp_path / "third.bmp")
+    shutil.copy(first, second)
+    shutil.copy(first, third)
+    daemon = SolverDaemon(max_mazes=2)
+    daemon.load(first)
+    daemon.load(second)
+    daemon.load(first)
+    daemon.load(third)
+
+    assert list(daemon.mazes) == [first, third]
+
+
+def test_daemon_cancels_timer_of_full_batch(tmp_path):
+    """Test that flushing a full batch cancels its batch_window timer"""
+    maze_path = write_maze(tmp_path)
+    daemon = SolverDaemon(batch_window=30, max_batch=2)
+    lines = [json.dumps({"id": i, "maze": maze_path, "start": [0, 0], "goal": [0, 1]})
+             for i in range(2)]
+    responses = asyncio.run(asyncio.wait_for(
+        exchange(daemon, str(tmp_path / "s.sock"), lines), 5))
+
+    assert all(responses[i]["path"] == [[0, 0], [0, 1]] for i in range(2))
+    assert daemon.timers == {}
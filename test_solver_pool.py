@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from maze import Maze
+from solver_pool import *
+
+OPEN = (255, 255, 255)
+WALL = (100, 100, 100)
+
+
+def test_solver_pool_matches_maze():
+    """Test that pooled results match Maze.solve_many, in order"""
+    image = np.array([
+        [OPEN, OPEN, OPEN, OPEN],
+        [WALL, WALL, OPEN, WALL],
+        [OPEN, OPEN, OPEN, OPEN]
+    ], dtype=np.uint8)
+    maze = Maze(image)
+    pairs = [((0, 0), (2, 0)), ((2, 3), (0, 3)), ((0, 0), (1, 0)), ((0, 0), (0, 0))]
+
+    with SolverPool(maze, processes=2) as pool:
+        pooled = list(pool.solve_many(pairs, algorithm="bfs"))
+
+    expected = [(start, goal, path) for start, goal, path, _ in maze.solve_many(pairs, "bfs")]
+    assert pooled == expected
+
+
+def test_solver_pool_releases_shared_memory():
+    """Test that closing the pool removes its shared memory block"""
+    pool = SolverPool(np.ones((4, 4), dtype=bool), processes=1)
+    name = pool.block.name
+    pool.close()
+
+    try:
+        shared_memory.SharedMemory(name=name)
+        attached = True
+    except FileNotFoundError:
+        attached = False
+    assert not attached
+
+
+def test_solver_pool_releases_shared_memory_when_start_fails(monkeypatch):
+    """Test that a pool whose workers fail to start still removes its shared memory block"""
+    blocks = []
+    create_block = shared_memory.SharedMemory
+
+    def recording_block(*args, **kwargs):
+        blocks.append(create_block(*args, **kwargs))
+        return blocks[-1]
+
+    def failing_pool(*args, **kwargs):
+        raise OSError("cannot start workers")
+
+    monkeypatch.setattr(shared_memory, "SharedMemory", recording_block)
+    monkeypatch.setattr(multiprocessing, "Pool", failing_pool)
+    with pytest.raises(OSError):
+        SolverPool(np.ones((4, 4), dtype=bool), processes=1)
+
+    with pytest.raises(FileNotFoundError):
+        create_block(name=blocks[0].name)
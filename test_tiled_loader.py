@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+from PIL import Image
+from packed_grid import PackedGrid, open_packed_file, save_packed_file
+from search import best_first_search, breath_first_search, passability_mask
+from tiled_loader import pack_image_file
+
+
+def random_pixels(height, width, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+
+
+def expected_mask(path):
+    with Image.open(path) as image:
+        return passability_mask(np.asarray(image.convert("RGB")))
+
+
+# ===========================================================================
+# PackedGrid
+# ===========================================================================
+
+def test_packed_grid_round_trip():
+    """Test that packing and unpacking a mask gives the same mask"""
+    mask = passability_mask(random_pixels(7, 13))
+    grid = PackedGrid.pack(mask)
+
+    assert grid.shape == (7, 13)
+    assert (grid.unpack() == mask).all()
+    assert (grid.unpack(2, 5) == mask[2:5]).all()
+
+
+def test_packed_grid_flat_lookup():
+    """Test that grid[row * width + col] matches the mask at every pixel"""
+    mask = passability_mask(random_pixels(5, 11))
+    grid = PackedGrid.pack(mask)
+
+    assert [grid[i] for i in range(mask.size)] == [int(v) for v in mask.ravel()]
+
+
+def test_packed_file_round_trip(tmp_path):
+    """Test saving a grid to disk and memory mapping it back"""
+    mask = passability_mask(random_pixels(9, 17))
+    save_packed_file(tmp_path / "grid.bits", mask)
+
+    assert (open_packed_file(tmp_path / "grid.bits").unpack() == mask).all()
+
+
+def test_packed_file_rejects_other_files(tmp_path):
+    """Test that opening a file without the grid header raises ValueError"""
+    (tmp_path / "junk.bits").write_bytes(bytes(64))
+
+    with pytest.raises(ValueError):
+        open_packed_file(tmp_path / "junk.bits")
+
+
+# ===========================================================================
+# pack_image_file
+# ===========================================================================
+
+@pytest.mark.parametrize("mode", ["RGB", "RGBA", "L", "P", "1"])
+def test_pack_bmp_matches_mask(tmp_path, mode):
+    """Test that raw BMP layouts give the same mask as converting with PIL"""
+    path = tmp_path / "maze.bmp"
+    Image.fromarray(random_pixels(23, 29)).convert(mode).save(path)
+
+    grid = pack_image_file(path, tmp_path / "maze.bits", tile_rows=5)
+    assert (grid.unpack() == expected_mask(path)).all()
+
+
+@pytest.mark.parametrize("suffix", [".png", ".tif", ".ppm"])
+def test_pack_other_formats_match_mask(tmp_path, suffix):
+    """Test compressed and top-down formats with strips that do not divide the height"""
+    path = tmp_path / ("maze" + suffix)
+    Image.fromarray(random_pixels(23, 29)).save(path)
+
+    grid = pack_image_file(path, tmp_path / "maze.bits", tile_rows=4)
+    assert (grid.unpack() == expected_mask(path)).all()
+
+
+def test_pack_sample_maze(tmp_path):
+    """Test packing the sample maze, which is stored as a BGRA bitmap"""
+    grid = pack_image_file("maze.bmp", tmp_path / "maze.bits")
+    assert (grid.unpack() == expected_mask("maze.bmp")).all()
+
+
+@pytest.mark.parametrize("search_func, options", [
+    (breath_first_search, {}),
+    (breath_first_search, {"engine": "array"}),
+    (breath_first_search, {"bidirectional": True}),
+    (best_first_search, {}),
+    (best_first_search, {"engine": "array"}),
+])
+def test_search_on_packed_grid(tmp_path, search_func, options):
+    """Test that searching a packed grid gives the same result as the image"""
+    image = np.asarray(Image.open("maze.bmp").convert("RGB"))
+    grid = pack_image_file("maze.bmp", tmp_path / "maze.bits")
+    start, goal = (0, 9), (18, 9)
+
+    path, visited = search_func(grid, start, goal, **options)
+    expected_path, expected_visited = search_func(image, start, goal, **options)
+    assert path and path == expected_path
+    assert set(visited) == set(expected_visited)
@@ -0,0 +1,141 @@
+import numpy as np
+from PIL import Image
+from packed_grid import create_packed_file, open_packed_file
+
+# Converts maze images into bit-packed passability grids on disk one strip of
+# rows at a time, so images larger than RAM can be searched. Uncompressed
+# images (BMP, TIFF, PPM) are read straight from the file through a memory
+# map; anything else (PNG, ...) is decoded by PIL strip by strip, which still
+# needs the decoded image in memory once.
+
+# bytes per pixel for the raw layouts read without PIL
+RAW_CHANNELS = {"RGB": 3, "BGR": 3, "RGBX": 4, "RGBA": 4, "BGRX": 4, "BGRA": 4, "L": 1, "P": 1}
+
+
+# function: pack_image_file
+# inputs:
+#   image_path: maze image filename
+#   out_path: filename for the packed grid
+#   tile_rows: number of image rows converted at once (bounds memory use)
+# output:
+#   grid: PackedGrid memory mapped from out_path
+# relationships:
+#   grid can be passed as image or mask to breath_first_search and
+#   best_first_search, which read it through flat_passable
+# pseudocode:
+#   open image header only, create the packed file
+#   fill it with pack_image_rows
+#   flush and reopen read-only
+def pack_image_file(image_path, out_path, tile_rows=1024):
+    with Image.open(image_path) as image:
+        width, height = image.size
+        bits = create_packed_file(out_path, height, width)
+        pack_image_rows(image, image_path, bits, tile_rows)
+    bits.flush()
+    del bits
+    return open_packed_file(out_path)
+
+
+# function: pack_image_rows
+# inputs:
+#   image: opened PIL image (pixels not loaded)
+#   image_path: filename of image
+#   bits: writable 2D uint8 array (height, ceil(width / 8)) for the packed rows
+#   tile_rows: number of image rows converted at once
+# output: none
+# relationships:
+#   shared by pack_image_file and the maze cache, which write the rows into
+#   their own file layouts
+# pseudocode:
+#   pick a strip reader (raw file map if possible, else PIL)
+#   for each strip of tile_rows rows:
+#       threshold the strip to a boolean mask, pack it into bits
+def pack_image_rows(image, image_path, bits, tile_rows=1024):
+    height = image.size[1]
+    read_strip = raw_strip_reader(image, image_path) or decoded_strip_reader(image)
+    for start in range(0, height, tile_rows):
+        stop = min(start + tile_rows, height)
+        bits[start:stop] = np.packbits(read_strip(start, stop), axis=1)
+
+
+# function: raw_strip_reader
+# inputs:
+#   image: opened PIL image (pixels not loaded)
+#   image_path: filename of image
+# output:
+#   read_strip(start, stop) returning a boolean mask of rows start..stop, or
+#   None if the file is not a single uncompressed tile in a known layout
+# relationships:
+#   used in pack_image_file; gives the same mask as passability_mask on the
+#   image converted to RGB
+# pseudocode:
+#   inspect PIL's tile description: codec, data offset, raw mode, row stride,
+#   row order (-1 means bottom-up as in BMP)
+#   map the pixel data with np.memmap
+#   per strip: slice file rows (reversed if bottom-up), then
+#       '1': unpack bits, set bit is white
+#       'P': look up each index in a palette passability table
+#       else: any of the first three channels > 100 (alpha / pad dropped)
+def raw_strip_reader(image, image_path):
+    if len(image.tile) != 1:
+        return None
+    codec, extents, offset, args = image.tile[0]
+    width, height = image.size
+    if codec != "raw" or tuple(extents) != (0, 0, width, height):
+        return None
+    if isinstance(args, str):
+        args = (args,)
+    rawmode = args[0]
+    stride = args[1] if len(args) > 1 else 0
+    orientation = args[2] if len(args) > 2 else 1
+
+    if rawmode == "1":
+        row_bytes = (width + 7) // 8
+    elif rawmode in RAW_CHANNELS:
+        channels = RAW_CHANNELS[rawmode]
+        row_bytes = width * channels
+    else:
+        return None
+    stride = stride or row_bytes
+    rows = np.memmap(image_path, dtype=np.uint8, mode="r", offset=offset, shape=(height, stride))
+
+    table = None
+    if rawmode == "P":
+        palette = np.zeros(768, dtype=np.uint8)
+        colors = image.getpalette() or []
+        palette[:len(colors)] = colors
+        table = (palette.reshape(256, 3) > 100).any(axis=1)
+
+    def read_strip(start, stop):
+        if orientation < 0:
+            strip = rows[height - stop:height - start][::-1]
+        else:
+            strip = rows[start:stop]
+        strip = np.asarray(strip[:, :row_bytes])
+        if rawmode == "1":
+            return np.unpackbits(strip, axis=1, count=width).astype(np.bool_)
+        if table is not None:
+            return table[strip]
+        pixels = strip.reshape(stop - start, width, channels)[:, :, :3]
+        return (pixels > 100).any(axis=2)
+
+    return read_strip
+
+
+# function: decoded_strip_reader
+# inputs:
+#   image: opened PIL image
+# output:
+#   read_strip(start, stop) returning a boolean mask of rows start..stop
+# relationships:
+#   fallback for compressed formats in pack_image_file
+# pseudocode:
+#   crop rows start..stop, convert to RGB, threshold like passability_mask
+def decoded_strip_reader(image):
+    width = image.size[0]
+
+    def read_strip(start, stop):
+        strip = np.asarray(image.crop((0, start, width, stop)).convert("RGB"))
+        return (strip > 100).any(axis=2)
+
+    return read_strip